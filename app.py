@@ -1,105 +1,124 @@
 import streamlit as st
 import pandas as pd
-from scrapers import (
-    scrape_amazon, 
-    scrape_myntra, 
-    scrape_nykaa, 
-    scrape_flipkart, 
-    scrape_zara, 
-    scrape_hnm, 
-    scrape_levis, 
-    scrape_lifestyle,
-    scrape_ajio,    
-   
-)
-
-from savana import (
-    scrape_westside,
-    scrape_urbanic
-)
-
-from libass import (
-    scrape_libas
-)
-from montecarlo import (
-    scrape_monte_carlo
-)
-from souledstore import (
-    scrape_souled_store
-)
+from site_search import SCRAPER_FUNCTIONS
+from orchestrator import iter_site_results, run_jobs
+from driver_pool import warm_up_pool
+
+
+@st.cache_resource
+def get_warm_driver_pool():
+    """
+    Start the shared driver pool once per server process (not per session or
+    rerun), so a Search click goes straight to driver.get().
+    """
+    return warm_up_pool()
+
+
+def render_products(df, source_fallback):
+    """The product matrix: one card per row of `df`, three per line"""
+    num_columns = 3  # Adjust the number of columns for the matrix
+    cols = st.columns(num_columns)
+
+    for i, (_, row) in enumerate(df.iterrows()):
+        # Place each product in the next available column, wrapping around
+        col = cols[i % num_columns]
+        
+        with col:
+            # Use .get() for safer dictionary access
+            title = row.get('Title', 'No Title Provided')
+            price = row.get('Price', 'N/A')
+            image_url = row.get("Image")
+            product_link = row.get('Link', '#')
+            source_site = row.get('Source', source_fallback)
+
+            st.markdown(f"##### {title}")
+            st.markdown(f"**Sold by:** {source_site}")
+            
+            if image_url and image_url != "No image":
+                st.image(image_url)
+            
+            st.markdown(f"**Price:** ₹{price}")
+            st.markdown(f"[🔗 View Product]({product_link})", unsafe_allow_html=True)
+            st.markdown("---")
+
+
+def stream_all_sites(query, sites):
+    """
+    Scrape every site at once and render each site's products as soon as its
+    scraper finishes, with a live status line per site. Returns the merged
+    DataFrame.
+    """
+    status = {}
+    for name in sites:
+        status[name] = st.empty()
+        status[name].markdown(f"⏳ **{name}** — scraping...")
+    results = st.container()
+
+    frames = []
+    for result in iter_site_results(query, sites):
+        name = result['site']
+        elapsed = result['elapsed']
+        if result['error']:
+            status[name].markdown(f"❌ **{name}** — failed after {elapsed:.1f}s: {result['error']}")
+            continue
+
+        site_df = result['df']
+        # Amazon and Flipkart frames carry no Source column of their own
+        if 'Source' not in site_df:
+            site_df['Source'] = name
+        if result['partial']:
+            status[name].markdown(f"⚠️ **{name}** — {len(site_df)} products in {elapsed:.1f}s (time budget reached, partial results)")
+        else:
+            status[name].markdown(f"✅ **{name}** — {len(site_df)} products in {elapsed:.1f}s")
+        if not site_df.empty:
+            frames.append(site_df)
+            with results:
+                st.subheader(f"{name} ({len(site_df)})")
+                render_products(site_df, name)
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
 # --- Streamlit UI ---
 st.set_page_config(page_title="🛍️ Product Price Comparator", layout="wide")
 st.title("🛍️ Multi-Site Product Price Comparator")
 
+get_warm_driver_pool()
+
 query = st.text_input("Enter product to search:", placeholder="e.g., blue jeans or iphone 15")
 
 # List of all supported sites
 sites_list = ["Amazon", "Flipkart", "Zara", "H&M", "Levi's", "Lifestyle", "Ajio", "Urbanic", "Westside", "Libas", "Monte Carlo", "Souled Store", "Myntra"]
-site = st.selectbox("Choose website to search:", sites_list)
+ALL_SITES = "All sites"
+# "All sites" comes last, so a plain Search click still scrapes just one site
+site = st.selectbox("Choose website to search:", sites_list + [ALL_SITES])
 
 if st.button("Search") and query:
     df = None  # Initialize df to None
-    scraper_functions = {
-        "Amazon": scrape_amazon,
-        "Myntra": scrape_myntra,
-        "Nykaa": scrape_nykaa,
-        "Flipkart": scrape_flipkart,
-        "Zara": scrape_zara,
-        "H&M": scrape_hnm,
-        "Levi's": scrape_levis,
-        "Lifestyle": scrape_lifestyle,
-        "Ajio": scrape_ajio,
-        "Urbanic": scrape_urbanic,
-        "Westside": scrape_westside,
-        "Libas": scrape_libas,
-        "Monte Carlo": scrape_monte_carlo,
-        "Souled Store": scrape_souled_store
-    }
-
-    if site in scraper_functions:
+
+    if site == ALL_SITES:
+        # Each site's products appear as soon as its scraper finishes
+        df = stream_all_sites(query, sites_list)
+    elif site in SCRAPER_FUNCTIONS:
         with st.spinner(f"Scraping {site} for '{query}'... this might take a moment."):
-            try:
-                df = scraper_functions[site](query)
-            except Exception as e:
-                st.error(f"An error occurred while scraping {site}: {e}")
-                print(f"Error scraping {site}: {e}")
+            result = run_jobs([(site, query)])[0]
+        df = result['df']
+        if result['error']:
+            st.error(f"An error occurred while scraping {site}: {result['error']}")
+        elif result['partial']:
+            st.warning(f"{site} hit its time budget after {result['elapsed']:.1f}s; showing the products found so far.")
     # --- Display Results ---
     if df is not None and not df.empty:
         st.success(f"Found a total of {len(df)} products!")
 
-        # The Matrix Display
-        num_columns = 3  # Adjust the number of columns for the matrix
-        cols = st.columns(num_columns)
+        if site != ALL_SITES:
+            render_products(df, site)
 
-        for i, row in df.iterrows():
-            # Place each product in the next available column, wrapping around
-            col = cols[i % num_columns]
-            
-            with col:
-                # Use .get() for safer dictionary access
-                title = row.get('Title', 'No Title Provided')
-                price = row.get('Price', 'N/A')
-                image_url = row.get("Image")
-                product_link = row.get('Link', '#')
-                source_site = row.get('Source', site if site != "All" else "N/A")
-
-                st.markdown(f"##### {title}")
-                st.markdown(f"**Sold by:** {source_site}")
-                
-                if image_url and image_url != "No image":
-                    st.image(image_url)
-                
-                st.markdown(f"**Price:** ₹{price}")
-                st.markdown(f"[🔗 View Product]({product_link})", unsafe_allow_html=True)
-                st.markdown("---")
-        
         # Download button for the combined CSV
         csv = df.to_csv(index=False).encode("utf-8")
         st.download_button(
             "📥 Download Results as CSV", 
             csv, 
-            f"{query.replace(' ','_')}_{site.lower()}.csv", 
+            f"{query.replace(' ','_')}_{site.lower().replace(' ','_')}.csv", 
             "text/csv"
         )
     elif query:
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Seconds one site's scrape may take, not counting time spent queueing for a
+# browser, before it stops and returns what it has
+SITE_TIME_BUDGET = float(os.environ.get("SCRAPER_SITE_BUDGET", "60"))
+
+# Seconds of the budget that waits and the scroll loop leave for parsing and
+# extraction, so a job that runs out of time still returns what it loaded
+EXTRACT_RESERVE = 3
+
+_current = threading.local()
+
+
+class Deadline:
+    """
+    Time budget of one scrape job. Scrapers check it between their phases
+    (navigation, scroll, lazy loading, extraction) through deadline_reached();
+    waits and the scroll loop clamp their timeouts to what is left.
+    """
+
+    def __init__(self, seconds, label="Job"):
+        self.label = label
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self.partial = False
+        self.phase = None
+
+    def extend(self, seconds):
+        """Push the deadline back by `seconds`, e.g. the time spent queueing for a browser"""
+        self.expires_at += seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def mark_partial(self, phase):
+        if not self.partial:
+            print(f"{self.label}: time budget used up at {phase}, returning partial results")
+        self.partial = True
+        self.phase = self.phase or phase
+
+
+@contextmanager
+def deadline_scope(seconds=SITE_TIME_BUDGET, label="Job"):
+    """Run the calling thread's scrape under a Deadline of `seconds` (None or 0: no limit)"""
+    previous = getattr(_current, 'deadline', None)
+    deadline = Deadline(seconds, label) if seconds else None
+    _current.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _current.deadline = previous
+
+
+@contextmanager
+def use_deadline(deadline):
+    """Run the calling thread under an existing Deadline, e.g. a helper thread of the same job"""
+    previous = getattr(_current, 'deadline', None)
+    _current.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _current.deadline = previous
+
+
+def current_deadline():
+    """Deadline of the job running on this thread, or None"""
+    return getattr(_current, 'deadline', None)
+
+
+def extend_deadline(seconds):
+    """Extend the current job's budget by `seconds` (no-op outside a deadline_scope)"""
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.extend(seconds)
+
+
+def time_left(timeout, reserve=0):
+    """`timeout` clamped to the time left in the current deadline, minus `reserve`"""
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    return max(0.0, min(timeout, deadline.remaining() - reserve))
+
+
+def deadline_reached(phase, reserve=0):
+    """
+    True once the current job is out of time (or within `reserve` seconds of
+    it). Scrapers call it inside extraction loops, and with
+    reserve=EXTRACT_RESERVE before optional phases such as forced lazy
+    loading or a second results page, and stop or skip there; the job is
+    then flagged partial.
+    """
+    deadline = current_deadline()
+    if deadline is None or deadline.remaining() > reserve:
+        return False
+    deadline.mark_partial(phase)
+    return True
+
+
+def mark_partial(phase):
+    """Flag the current job partial (e.g. its scroll was cut short by the deadline)"""
+    deadline = current_deadline()
+    if deadline is not None:
+        deadline.mark_partial(phase)
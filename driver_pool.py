@@ -0,0 +1,842 @@
+import atexit
+import os
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import (
+    WebDriverException, NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
+from waits import NETWORK_LOG, get_network_tracker, forget_network_tracker
+from deadlines import EXTRACT_RESERVE, extend_deadline, mark_partial, time_left
+
+
+# Number of Chrome instances the process-wide pool is allowed to keep alive.
+DEFAULT_POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "2"))
+
+# Optional root directory for persistent Chrome profiles. Each pool slot gets
+# its own profile (and HTTP disk cache) under it, so repeat scrapes reuse cached
+# JS bundles and consent cookies. Empty means a throwaway profile per driver.
+PROFILE_ROOT = os.environ.get("SCRAPER_PROFILE_DIR", "")
+
+# Size limit of each profile's HTTP disk cache, in megabytes.
+DISK_CACHE_MB = int(os.environ.get("SCRAPER_DISK_CACHE_MB", "200"))
+
+# Recycling thresholds: a pooled driver past any of these is quit and replaced
+# between jobs instead of being reused (0 disables a check). Infinite-scroll
+# sites leak renderer memory, so long-lived drivers otherwise slow down.
+MAX_NAVIGATIONS = int(os.environ.get("SCRAPER_MAX_NAVIGATIONS", "50"))
+MAX_DRIVER_ERRORS = int(os.environ.get("SCRAPER_MAX_DRIVER_ERRORS", "20"))
+MAX_JS_HEAP_MB = int(os.environ.get("SCRAPER_MAX_JS_HEAP_MB", "768"))
+
+# Seconds between keep-alive checks of idle pooled drivers (0 disables the check).
+KEEP_ALIVE_INTERVAL = float(os.environ.get("SCRAPER_KEEP_ALIVE_INTERVAL", "60"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# "eager" returns from driver.get() at DOMContentLoaded instead of waiting for
+# every ad script; scrapers then wait on their own readiness predicate (waits.py).
+PAGE_LOAD_STRATEGY = os.environ.get("SCRAPER_PAGE_LOAD_STRATEGY", "eager")
+
+# Seconds driver.get() may block (Chrome's own default); inside a job it is
+# clamped to the time left in the job's budget
+PAGE_LOAD_TIMEOUT = 300
+
+# "pool" keeps one Chrome per concurrent scrape; "tabs" runs every scrape in its
+# own window of a single shared Chrome (see TabPool).
+BROWSER_MODE = os.environ.get("SCRAPER_BROWSER_MODE", "pool")
+
+# Upper bound on windows open at once in the shared Chrome when BROWSER_MODE is "tabs".
+DEFAULT_MAX_TABS = int(os.environ.get("SCRAPER_MAX_TABS", "6"))
+
+# Keep background windows rendering at full speed; otherwise Chrome throttles
+# timers and lazy-loading in every window except the focused one.
+MULTIPLEX_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+# Drop image/font/media/analytics requests through CDP. The extractors only read
+# src/data-src/srcset strings, so the bytes themselves are never needed.
+BLOCK_RESOURCES = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+
+# URL patterns passed to Network.setBlockedURLs, grouped by category so a site
+# can allow a whole category back in. '*' is the only wildcard CDP understands.
+BLOCKED_RESOURCE_PATTERNS = {
+    'image': [
+        "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.png", "*.png?*",
+        "*.gif", "*.gif?*", "*.webp", "*.webp?*", "*.avif", "*.avif?*",
+        "*.svg", "*.svg?*", "*.ico", "*.bmp"
+    ],
+    'font': [
+        "*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*",
+        "*.otf", "*.otf?*", "*.eot", "*.eot?*"
+    ],
+    'media': [
+        "*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.m3u8", "*.m3u8?*",
+        "*.mp3", "*.ogg", "*.mov"
+    ],
+    'analytics': [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googleadservices.com*", "*connect.facebook.net*", "*facebook.com/tr*",
+        "*hotjar.com*", "*clarity.ms*", "*criteo.com*", "*criteo.net*",
+        "*moengage.com*", "*webengage.com*", "*branch.io*", "*nr-data.net*",
+        "*newrelic.com*", "*segment.io*", "*mixpanel.com*", "*amplitude.com*",
+        "*clevertap*", "*appsflyer.com*", "*bat.bing.com*", "*snap.licdn.com*"
+    ]
+}
+
+# Per-site allow-list: categories (keys of BLOCKED_RESOURCE_PATTERNS) or exact
+# patterns that must keep loading for that site even with blocking enabled.
+SITE_RESOURCE_ALLOWLIST = {
+    # Urbanic's image component only swaps the placeholder for the real URL
+    # once the image has actually loaded
+    "Urbanic": ['image'],
+}
+
+
+def blocked_patterns_for_site(site=None):
+    """Return the URL patterns to block for `site`, minus its allow-list"""
+    allowed = SITE_RESOURCE_ALLOWLIST.get(site, [])
+    patterns = []
+    for category, category_patterns in BLOCKED_RESOURCE_PATTERNS.items():
+        if category in allowed:
+            continue
+        patterns.extend(p for p in category_patterns if p not in allowed)
+    return patterns
+
+
+def apply_resource_blocking(driver, site=None, enabled=True):
+    """
+    Block images, fonts, media and trackers for the current tab through the
+    Chrome DevTools Network domain, honouring the site's allow-list.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        urls = blocked_patterns_for_site(site) if enabled else []
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+    except Exception as e:
+        print(f"Could not configure resource blocking: {e}")
+
+
+def hide_webdriver_flag(driver):
+    """Hide navigator.webdriver on every page the current window opens, not just the current one"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    })
+
+
+def profile_arguments(profile_dir, cache_mb=DISK_CACHE_MB):
+    """
+    Chrome arguments for a persistent profile in `profile_dir`.
+    A profile directory must only ever be used by one Chrome at a time, which
+    the pools guarantee by giving each slot its own directory.
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    # Lock files left behind by a Chrome that was killed would make the next
+    # launch refuse the profile; a live owner's lock is Chrome's guard against
+    # two browsers sharing it (e.g. two processes on one SCRAPER_PROFILE_DIR)
+    if profile_lock_is_stale(profile_dir):
+        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+            path = os.path.join(profile_dir, name)
+            if os.path.lexists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    return [
+        f"--user-data-dir={profile_dir}",
+        f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}",
+        f"--disk-cache-size={cache_mb * 1024 * 1024}",
+    ]
+
+
+def profile_lock_is_stale(profile_dir):
+    """
+    True when `profile_dir` has a SingletonLock whose Chrome is gone. The lock
+    is a symlink to "<host>-<pid>"; a lock from another host name (e.g. a
+    restarted container) counts as stale too, since its owner can't be checked.
+    """
+    try:
+        target = os.readlink(os.path.join(profile_dir, "SingletonLock"))
+    except OSError:
+        return False
+    host, _, pid = target.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    print(f"Profile {profile_dir} is in use by Chrome (pid {pid}), leaving its lock in place")
+    return False
+
+
+def build_chrome_options(page_load_strategy=PAGE_LOAD_STRATEGY, extra_arguments=None):
+    """Chrome options shared by every scraper"""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--log-level=3")
+    for argument in extra_arguments or []:
+        options.add_argument(argument)
+    if NETWORK_LOG:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    options.page_load_strategy = page_load_strategy
+    return options
+
+
+class PooledChrome(webdriver.Chrome):
+    """
+    Chrome driver that keeps the counters the pool's health check uses:
+    navigations served and WebDriver errors. Lookups that simply find nothing
+    (NoSuchElement, stale elements) are normal scraper control flow and are
+    not counted, and neither is the about:blank load of reset_driver_state()
+    or a page load cut off by the job's time budget.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.navigations = 0
+        self.errors = 0
+        super().__init__(*args, **kwargs)
+
+    def execute(self, driver_command, params=None):
+        if driver_command == Command.GET and (params or {}).get("url") != "about:blank":
+            self.navigations += 1
+        try:
+            return super().execute(driver_command, params)
+        except (NoSuchElementException, StaleElementReferenceException):
+            raise
+        except TimeoutException:
+            if driver_command != Command.GET:
+                self.errors += 1
+            raise
+        except WebDriverException:
+            self.errors += 1
+            raise
+
+    def get(self, url):
+        """
+        Navigate within the job's time budget: the page-load timeout is set to
+        what is left of it (minus EXTRACT_RESERVE), and a load cut off by it is
+        stopped and flags the job partial instead of raising, so the scraper
+        still extracts whatever the page rendered by then.
+        """
+        if url == "about:blank":
+            return super().get(url)
+        timeout = time_left(PAGE_LOAD_TIMEOUT, EXTRACT_RESERVE)
+        if timeout <= 0:
+            print(f"No time left to load {url}")
+            mark_partial('navigation')
+            return
+        self.set_page_load_timeout(timeout)
+        try:
+            super().get(url)
+        except TimeoutException:
+            print(f"Page load timed out after {timeout:.1f}s: {url}")
+            mark_partial('navigation')
+            try:
+                self.execute_script("window.stop();")
+            except WebDriverException:
+                pass
+
+
+def js_heap_mb(driver):
+    """JS heap of the current page in MB (Performance.getMetrics), or None if unavailable"""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        sizes = {m["name"]: m["value"] for m in metrics}
+        return sizes.get("JSHeapTotalSize", 0) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def recycle_reason(driver, check_heap=True):
+    """
+    Why `driver` should be replaced rather than reused, or None if it's healthy.
+    Drivers that don't keep counters (not PooledChrome) only get the heap check.
+    """
+    navigations = getattr(driver, 'navigations', 0)
+    errors = getattr(driver, 'errors', 0)
+    if MAX_NAVIGATIONS and navigations >= MAX_NAVIGATIONS:
+        return f"served {navigations} navigations"
+    if MAX_DRIVER_ERRORS and errors >= MAX_DRIVER_ERRORS:
+        return f"hit {errors} WebDriver errors"
+    if check_heap and MAX_JS_HEAP_MB:
+        heap = js_heap_mb(driver)
+        if heap is not None and heap >= MAX_JS_HEAP_MB:
+            return f"JS heap at {heap:.0f} MB"
+    return None
+
+
+def get_driver(block_resources=BLOCK_RESOURCES, page_load_strategy=PAGE_LOAD_STRATEGY, profile_dir=None):
+    """
+    Set up and return a fresh headless Chrome WebDriver instance, using the
+    persistent profile in `profile_dir` if given.
+    Scrapers should normally borrow a driver from the pool with checkout_driver()
+    instead of calling this directly.
+    """
+    extra_arguments = profile_arguments(profile_dir) if profile_dir else None
+    driver = PooledChrome(options=build_chrome_options(page_load_strategy, extra_arguments))
+    hide_webdriver_flag(driver)
+
+    if block_resources:
+        apply_resource_blocking(driver)
+    return driver
+
+
+def reset_driver_state(driver, keep_site_data=False):
+    """
+    Clear everything a previous scrape left behind so the next job starts clean:
+    extra tabs, cookies, local/session storage, and the current page.
+    With `keep_site_data` (persistent profiles) cookies and local storage are
+    kept, so consent banners and the like stay dismissed.
+    """
+    # Close any extra tabs opened during the previous job
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    clear_origin_storage(driver, keep_site_data)
+
+    # Cookies for every domain, not only the current one
+    if not keep_site_data:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.get("about:blank")
+
+
+def clear_origin_storage(driver, keep_site_data=False):
+    """Wipe storage for the origin the current window is on"""
+    storage_types = "session_storage" if keep_site_data else \
+        "local_storage,session_storage,indexeddb,websql,service_workers,cache_storage"
+    try:
+        origin = driver.execute_script("return window.location.origin")
+        if origin and origin.startswith('http'):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": origin,
+                "storageTypes": storage_types
+            })
+    except Exception as e:
+        print(f"Could not clear origin storage: {e}")
+
+
+def is_driver_alive(driver):
+    """Cheap round-trip to the browser; False if the session or Chrome is gone"""
+    try:
+        driver.execute_script("return 1")
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """
+    Thread-safe pool of Chrome WebDrivers with checkout/checkin.
+    Drivers are created lazily up to `size` and reused between scrapes, so the
+    Chrome cold start is paid once per slot instead of once per query.
+    With a `profile_root`, slot N always launches with the profile in
+    <profile_root>/slot-N, so two live drivers never share a profile.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, factory=get_driver, block_resources=BLOCK_RESOURCES,
+                 profile_root=PROFILE_ROOT):
+        self.size = max(1, size)
+        self.factory = factory
+        self.block_resources = block_resources
+        self.profile_root = profile_root
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # Signalled whenever a driver goes idle or a slot frees up
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._free_slots = list(range(self.size))
+        self._slot_of = {}
+        self._closed = False
+
+    def checkout(self, site=None, timeout=None):
+        """
+        Borrow a driver configured for `site`. Reuses an idle one, creates a new
+        one while under `size`, otherwise blocks until another job checks one back in
+        or a broken one is discarded and its slot frees up.
+        """
+        driver = self._acquire(timeout)
+        if self.block_resources:
+            apply_resource_blocking(driver, site)
+        return driver
+
+    def _acquire(self, timeout=None):
+        # Waits on the condition rather than the idle queue, so a waiter also
+        # wakes when a broken driver is discarded and its slot can be refilled
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool has been closed")
+                try:
+                    return self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No driver became available within {timeout} seconds")
+                self._available.wait(remaining)
+
+        return self._create()
+
+    def _put_idle(self, driver):
+        with self._available:
+            self._idle.put(driver)
+            self._available.notify()
+
+    def _create(self):
+        # Caller has already reserved the slot in self._created
+        with self._lock:
+            slot = self._free_slots.pop(0)
+        try:
+            if self.profile_root:
+                driver = self.factory(profile_dir=os.path.join(self.profile_root, f"slot-{slot}"))
+            else:
+                driver = self.factory()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._free_slots.append(slot)
+                self._available.notify()
+            raise
+        with self._lock:
+            self._slot_of[id(driver)] = slot
+        return driver
+
+    def prewarm(self, count=None):
+        """
+        Start drivers up front (up to `count`, default the pool size) so the
+        first scrape doesn't pay for Chrome's cold start.
+        """
+        target = self.size if count is None else min(count, self.size)
+        while not self._closed:
+            with self._lock:
+                if self._created >= target:
+                    break
+                self._created += 1
+            try:
+                self._put_idle(self._create())
+            except Exception as e:
+                print(f"Could not pre-warm driver: {e}")
+                break
+
+    def keep_alive(self):
+        """
+        Ping every idle driver and replace the ones that stopped responding,
+        so a checkout never hands out a dead browser.
+        """
+        with self._lock:
+            warm = self._created
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        for driver in idle:
+            if is_driver_alive(driver):
+                self._put_idle(driver)
+            else:
+                print("Idle driver stopped responding, replacing it")
+                self.discard(driver)
+        if not self._closed:
+            self.prewarm(warm)
+
+    def checkin(self, driver):
+        """
+        Return a driver to the pool after resetting its state.
+        Drivers that fail to reset are assumed broken and replaced.
+        """
+        if driver is None:
+            return
+        if self._closed:
+            self.discard(driver)
+            return
+
+        # Measured before the reset, while the scraped page is still loaded
+        reason = recycle_reason(driver)
+        if reason:
+            print(f"Recycling driver that {reason}")
+            self.replace(driver)
+            return
+
+        try:
+            reset_driver_state(driver, keep_site_data=bool(self.profile_root))
+        except Exception as e:
+            print(f"Driver failed to reset, discarding it: {e}")
+            self.discard(driver)
+            return
+
+        # Drain the previous job's network events so they don't leak into the next one
+        if NETWORK_LOG:
+            tracker = get_network_tracker(driver)
+            tracker.poll(driver)
+            tracker.reset()
+
+        self._put_idle(driver)
+
+    def replace(self, driver):
+        """Quit `driver` and start a fresh one for the idle queue in the background"""
+        with self._lock:
+            warm = self._created
+        self.discard(driver)
+        threading.Thread(target=self.prewarm, args=(warm,), daemon=True).start()
+
+    def discard(self, driver):
+        """Quit a driver and free its slot"""
+        forget_network_tracker(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._available:
+            self._created = max(0, self._created - 1)
+            slot = self._slot_of.pop(id(driver), None)
+            if slot is not None:
+                self._free_slots.append(slot)
+            self._available.notify()
+
+    @contextmanager
+    def driver(self, site=None, timeout=None):
+        """Context manager form of checkout/checkin"""
+        driver = self.checkout(site=site, timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def close(self):
+        """Quit every idle driver and refuse further checkouts"""
+        with self._available:
+            self._closed = True
+            self._available.notify_all()
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
+
+
+
+class MultiplexedChrome(PooledChrome):
+    """
+    Chrome driver that several threads can share, each driving its own window.
+    A thread binds a window handle with bind_window(); every command it sends
+    afterwards (including ones issued through WebElements and execute_cdp_cmd)
+    first switches the session to that window. Commands are serialised by a
+    lock, but page loads, lazy-loading and sleeps in one window overlap with
+    work in the others.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Must exist before super().__init__ sends the newSession command
+        self._window_lock = threading.RLock()
+        self._window_local = threading.local()
+        self._active_handle = None
+        super().__init__(*args, **kwargs)
+
+    def bind_window(self, handle):
+        """Route this thread's commands to `handle` (None to unbind)"""
+        self._window_local.handle = handle
+
+    def bound_window(self):
+        """Window handle the calling thread is bound to, if any"""
+        return getattr(self._window_local, 'handle', None)
+
+    def execute(self, driver_command, params=None):
+        handle = self.bound_window()
+        with self._window_lock:
+            if (handle and handle != self._active_handle
+                    and driver_command not in (Command.SWITCH_TO_WINDOW, Command.NEW_WINDOW, Command.QUIT)):
+                super().execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                self._active_handle = handle
+
+            response = super().execute(driver_command, params)
+
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                self._active_handle = params["handle"]
+                if handle:
+                    self.bind_window(params["handle"])
+            elif driver_command == Command.CLOSE:
+                self._active_handle = None
+            return response
+
+
+def get_multiplexed_driver(page_load_strategy="none", profile_dir=None):
+    """
+    Set up the single Chrome a TabPool hands out windows of.
+    Uses the "none" page-load strategy so driver.get() in one window doesn't
+    hold the session while the page loads; scrapers wait on their own
+    readiness predicate right after navigating anyway.
+    """
+    extra_arguments = list(MULTIPLEX_ARGUMENTS)
+    if profile_dir:
+        extra_arguments += profile_arguments(profile_dir)
+    options = build_chrome_options(page_load_strategy, extra_arguments)
+    return MultiplexedChrome(options=options)
+
+
+class TabPool:
+    """
+    Runs scrapes in separate windows of one headless Chrome instead of one
+    Chrome per scrape. Has the same checkout/checkin interface as DriverPool,
+    so scrapers don't know which one they are using; a multi-site search costs
+    one browser's startup and memory.
+    Each thread may hold at most one window at a time.
+    With a `profile_root`, the browser uses the profile in <profile_root>/tabs.
+    """
+
+    def __init__(self, max_tabs=DEFAULT_MAX_TABS, factory=get_multiplexed_driver, block_resources=BLOCK_RESOURCES,
+                 profile_root=PROFILE_ROOT):
+        self.max_tabs = max(1, max_tabs)
+        self.factory = factory
+        self.block_resources = block_resources
+        self.profile_root = profile_root
+        self._slots = threading.BoundedSemaphore(self.max_tabs)
+        self._lock = threading.Lock()
+        self._browser = None
+        self._open = 0
+        self._closed = False
+
+    def _get_browser(self):
+        with self._lock:
+            if self._browser is None:
+                if self.profile_root:
+                    self._browser = self.factory(profile_dir=os.path.join(self.profile_root, "tabs"))
+                else:
+                    self._browser = self.factory()
+            return self._browser
+
+    def prewarm(self, count=None):
+        """Start the shared browser up front; `count` is ignored (there is only one)"""
+        if not self._closed:
+            try:
+                self._get_browser()
+            except Exception as e:
+                print(f"Could not pre-warm browser: {e}")
+
+    def keep_alive(self):
+        """Restart the shared browser if it stopped responding while no window was open"""
+        with self._lock:
+            browser = self._browser if self._open == 0 else None
+        if browser is not None and not is_driver_alive(browser):
+            print("Shared browser stopped responding, restarting it")
+            self._restart_browser(browser)
+
+    def checkout(self, site=None, timeout=None):
+        """
+        Open a new window for `site` and bind it to the calling thread.
+        Blocks while `max_tabs` windows are already in use.
+        """
+        if self._closed:
+            raise RuntimeError("Tab pool has been closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No tab became available within {timeout} seconds")
+
+        try:
+            browser = self._get_browser()
+            with browser._window_lock:
+                browser.bind_window(None)
+                browser.switch_to.new_window('window')
+                browser.bind_window(browser.current_window_handle)
+            with self._lock:
+                self._open += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        # Both of these are per-window CDP settings
+        hide_webdriver_flag(browser)
+        if self.block_resources:
+            apply_resource_blocking(browser, site)
+        return browser
+
+    def checkin(self, driver):
+        """Close the calling thread's window and free its slot"""
+        if driver is None or driver.bound_window() is None:
+            return
+
+        clear_origin_storage(driver, keep_site_data=bool(self.profile_root))
+        get_network_tracker(driver).reset(driver.bound_window())
+        self.discard(driver)
+
+    def discard(self, driver):
+        """Close the calling thread's window without cleaning up after it"""
+        if driver is None or driver.bound_window() is None:
+            return
+        try:
+            driver.close()
+        except Exception as e:
+            print(f"Could not close tab: {e}")
+        finally:
+            driver.bind_window(None)
+            with self._lock:
+                self._open -= 1
+                idle = self._open == 0
+            self._slots.release()
+
+        # Cookies are shared by every window, so only clear them once none are open
+        if idle:
+            self._reset_browser()
+
+    def _reset_browser(self):
+        with self._lock:
+            browser = self._browser
+        if browser is None:
+            return
+
+        # The heap check would only see the blank base window, so skip it here
+        reason = recycle_reason(browser, check_heap=False)
+        if reason:
+            print(f"Recycling shared browser that {reason}")
+            self._restart_browser(browser)
+            return
+
+        try:
+            browser.switch_to.window(browser.window_handles[0])
+            if not self.profile_root:
+                browser.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception as e:
+            print(f"Shared browser failed to reset, restarting it: {e}")
+            self._restart_browser(browser)
+
+    def _restart_browser(self, browser):
+        with self._lock:
+            if self._browser is browser:
+                self._browser = None
+        forget_network_tracker(browser)
+        try:
+            browser.quit()
+        except Exception:
+            pass
+        if not self._closed:
+            threading.Thread(target=self.prewarm, daemon=True).start()
+
+    @contextmanager
+    def driver(self, site=None, timeout=None):
+        """Context manager form of checkout/checkin"""
+        driver = self.checkout(site=site, timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def close(self):
+        """Quit the shared browser and refuse further checkouts"""
+        self._closed = True
+        with self._lock:
+            browser, self._browser = self._browser, None
+        if browser is not None:
+            forget_network_tracker(browser)
+            try:
+                browser.quit()
+            except Exception:
+                pass
+
+_pool = None
+_pool_lock = threading.Lock()
+_routing = threading.local()
+
+
+def get_pool():
+    """
+    Return the process-wide pool, creating it on first use.
+    SCRAPER_BROWSER_MODE picks between a DriverPool and a TabPool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = TabPool() if BROWSER_MODE == "tabs" else DriverPool()
+        return _pool
+
+
+def current_pool():
+    """Pool the calling thread is routed to by use_pool(), else the process-wide one"""
+    return getattr(_routing, 'pool', None) or get_pool()
+
+
+@contextmanager
+def use_pool(pool):
+    """Route checkout_driver()/checkin_driver() on this thread to `pool`"""
+    previous = getattr(_routing, 'pool', None)
+    _routing.pool = pool
+    try:
+        yield pool
+    finally:
+        _routing.pool = previous
+
+
+def warm_up_pool(count=None, keep_alive_interval=KEEP_ALIVE_INTERVAL):
+    """
+    Pre-warm the process-wide pool in the background and keep its idle
+    drivers healthy every `keep_alive_interval` seconds. Returns the pool.
+    Meant to be called once per process, e.g. from a Streamlit cached resource.
+    """
+    pool = get_pool()
+
+    def run():
+        pool.prewarm(count)
+        while keep_alive_interval > 0 and not pool._closed:
+            time.sleep(keep_alive_interval)
+            try:
+                pool.keep_alive()
+            except Exception as e:
+                print(f"Driver keep-alive failed: {e}")
+
+    threading.Thread(target=run, name="driver-keep-alive", daemon=True).start()
+    return pool
+
+
+def checkout_driver(site=None, timeout=None):
+    """
+    Borrow a driver for `site` from the current pool. Time spent queueing for
+    the driver doesn't count against the job's budget (deadlines.py); work
+    done before, such as an HTTP attempt, does.
+    """
+    started = time.monotonic()
+    driver = current_pool().checkout(site=site, timeout=timeout)
+    extend_deadline(time.monotonic() - started)
+    return driver
+
+
+def checkin_driver(driver):
+    """Give a driver back to the current pool"""
+    current_pool().checkin(driver)
+
+
+def shutdown_pool():
+    """Quit all pooled drivers (registered to run at interpreter exit)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+atexit.register(shutdown_pool)
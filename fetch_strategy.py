@@ -0,0 +1,116 @@
+import re
+import threading
+import time
+from collections import deque
+
+from http_fetch import HTTP_ENABLED, HTTP_SITES, fetch_html
+from parse_pool import parse_and_extract
+
+
+# Outcomes of the last HTTP attempts kept per site
+HISTORY_SIZE = 20
+
+# Attempts before a site's hit rate is trusted
+MIN_ATTEMPTS = 4
+
+# Below this share of usable HTTP responses a site goes straight to Chrome...
+MIN_HIT_RATE = 0.3
+
+# ...except every Nth search, which probes HTTP again in case the site changed
+PROBE_EVERY = 10
+
+# Text of captcha pages and bot walls served instead of search results
+BOT_WALL_PATTERNS = re.compile(
+    r"captcha|are you a (human|robot)|robot check|access denied|unusual traffic|"
+    r"request blocked|verify you are human|cf-chl-|px-captcha|/errors/validatecaptcha",
+    re.IGNORECASE,
+)
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class HttpPathFailed(Exception):
+    """The HTTP response was unusable (error, bot wall or no products)"""
+
+
+def looks_blocked(html):
+    """True when `html` is a captcha or bot-wall page rather than the real one"""
+    # Walls are small pages; a full results page may mention "captcha" in its scripts
+    return len(html) < 200000 and bool(BOT_WALL_PATTERNS.search(html))
+
+
+def _site_stats(site):
+    # Caller holds _stats_lock
+    if site not in _stats:
+        _stats[site] = {'outcomes': deque(maxlen=HISTORY_SIZE), 'searches': 0}
+    return _stats[site]
+
+
+def should_try_http(site):
+    """
+    Whether `site`'s next search should start with the HTTP path: it must be
+    in HTTP_SITES and, once MIN_ATTEMPTS are recorded, keep a hit rate of
+    MIN_HIT_RATE, apart from a probe every PROBE_EVERY searches.
+    """
+    if not HTTP_ENABLED or site not in HTTP_SITES:
+        return False
+    with _stats_lock:
+        stats = _site_stats(site)
+        stats['searches'] += 1
+        outcomes = stats['outcomes']
+        if len(outcomes) < MIN_ATTEMPTS or sum(outcomes) / len(outcomes) >= MIN_HIT_RATE:
+            return True
+        if stats['searches'] % PROBE_EVERY == 0:
+            print(f"{site}: probing the HTTP path again")
+            return True
+        return False
+
+
+def record_http_result(site, ok, reason=None):
+    """Record whether an HTTP attempt for `site` produced products, and log its hit rate"""
+    with _stats_lock:
+        outcomes = _site_stats(site)['outcomes']
+        outcomes.append(1 if ok else 0)
+        hit_rate = sum(outcomes) / len(outcomes)
+        attempts = len(outcomes)
+    if not ok:
+        print(f"{site}: HTTP path failed ({reason}), falling back to Chrome")
+    print(f"{site}: HTTP hit rate {hit_rate:.0%} over the last {attempts} attempts")
+
+
+def fetch_unblocked_html(url, site):
+    """The page at `url` over HTTP; raises HttpPathFailed on errors and bot walls"""
+    try:
+        html = fetch_html(url, site=site)
+    except Exception as e:
+        raise HttpPathFailed(f"request failed: {e}")
+    if looks_blocked(html):
+        raise HttpPathFailed("bot wall or captcha")
+    return html
+
+
+def try_http(site, url, *extractors):
+    """
+    Cheap path of a hybrid scraper: fetch `site`'s page at `url` over HTTP
+    and run `extractors` on it (as parse_and_extract() does). Returns the
+    extractor results when at least one of them found products, or None
+    when the scraper should render the page in Chrome instead: HTTP is off
+    or keeps failing for the site, the request failed, or the response was
+    a bot wall or an empty grid. Every attempt updates the site's hit rate.
+    """
+    if not should_try_http(site):
+        return None
+    started = time.time()
+    try:
+        results = parse_and_extract(fetch_unblocked_html(url, site), *extractors)
+    except HttpPathFailed as e:
+        record_http_result(site, False, str(e))
+        return None
+    if not any(results):
+        record_http_result(site, False, "no products in the server response")
+        return None
+    record_http_result(site, True)
+    print(f"{site}: served over HTTP in {time.time() - started:.2f}s, skipping Chrome")
+    return results
+
@@ -0,0 +1,87 @@
+import importlib.util
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from driver_pool import USER_AGENT
+from deadlines import EXTRACT_RESERVE, time_left
+
+# urllib3 decodes "br" responses only when a brotli module is installed
+if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+    ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+# Set to 0 to send every scraper straight to Chrome
+HTTP_ENABLED = os.environ.get("SCRAPER_HTTP", "1") != "0"
+
+# Keep-alive connections open at once to one host; further requests wait for one
+HOST_CONNECTIONS = int(os.environ.get("SCRAPER_HTTP_CONNECTIONS", "4"))
+
+# Seconds to wait for a response, clamped to the job's time budget
+HTTP_TIMEOUT = 10
+
+# Sites whose scrapers first try their search page over plain HTTP and only
+# render it in Chrome when that returns no products (fetch_strategy.py)
+HTTP_SITES = {"Flipkart", "Libas", "Westside", "Monte Carlo", "Souled Store", "Lifestyle", "Nykaa", "Ajio"}
+
+# What a desktop Chrome sends on a top-level navigation
+BROWSER_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return the process-wide requests Session, creating it on first use. Its
+    connection pools keep connections alive between scrapes, at most
+    HOST_CONNECTIONS per host, and retry connection errors and 5xx once.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(BROWSER_HEADERS)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=HOST_CONNECTIONS, pool_block=True,
+                                  max_retries=Retry(total=1, backoff_factor=0.3,
+                                                    status_forcelist=(500, 502, 503, 504)))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def fetch(url, site=None, timeout=HTTP_TIMEOUT, headers=None):
+    """
+    GET `url` on the shared session and return the response; raises on
+    connection errors and non-2xx statuses. The timeout is clamped to the
+    current job's deadline, leaving time to extract.
+    """
+    timeout = time_left(timeout, EXTRACT_RESERVE)
+    if timeout <= 0:
+        raise TimeoutError(f"{site or url}: no time left for an HTTP request")
+    response = get_session().get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    print(f"{site or 'HTTP'}: fetched {url} ({response.status_code}, {len(response.content)} bytes, "
+          f"{response.elapsed.total_seconds():.2f}s)")
+    return response
+
+
+def fetch_html(url, site=None, timeout=HTTP_TIMEOUT):
+    """The page at `url` as text, decoded the way the server declared it"""
+    return fetch(url, site=site, timeout=timeout).text
+
@@ -0,0 +1,121 @@
+import re
+
+
+# Attributes lazy loaders keep the real image URL in, checked in this order.
+# `src` comes after the lazy attributes because until the loader runs it
+# usually holds a placeholder or a tiny blurred preview.
+LAZY_IMAGE_ATTRS = (
+    'data-src', 'data-original', 'data-lazy-src', 'data-srcset', 'srcset',
+    'src', 'data-bg', 'data-background', 'data-bg-src'
+)
+
+# Elements inside a product card that can carry an image URL
+IMAGE_ELEMENT_SELECTOR = 'img, source, [data-bg], [data-background], [data-bg-src], [style*="background-image"]'
+
+PLACEHOLDER_HINTS = ('placeholder', 'blank', 'spacer', 'loader', 'loading', 'spinner')
+
+# Width substituted into Shopify-style templated URLs ("..._{width}x.jpg")
+DEFAULT_TEMPLATE_WIDTH = 800
+
+_BACKGROUND_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)')
+
+
+def is_placeholder_url(url):
+    """True for empty, inline (data:) and placeholder/spinner image URLs"""
+    if not url:
+        return True
+    lowered = url.strip().lower()
+    return lowered.startswith('data:') or any(hint in lowered for hint in PLACEHOLDER_HINTS)
+
+
+def pick_srcset_url(srcset):
+    """Largest candidate of a srcset ("a.jpg 360w, b.jpg 720w" -> "b.jpg")"""
+    best_url, best_width = None, -1
+    for candidate in srcset.split(','):
+        parts = candidate.strip().split()
+        if not parts:
+            continue
+        width = 0
+        if len(parts) > 1:
+            match = re.match(r'(\d+(?:\.\d+)?)[wx]$', parts[1])
+            if match:
+                width = float(match.group(1))
+        if width > best_width:
+            best_url, best_width = parts[0], width
+    return best_url
+
+
+def _attribute_url(attr, value, widths=None):
+    if not value:
+        return None
+    value = value.strip()
+    if attr.endswith('srcset'):
+        value = pick_srcset_url(value)
+    if value and '{width}' in value:
+        value = value.replace('{width}', str(max(widths or [DEFAULT_TEMPLATE_WIDTH])))
+    return None if is_placeholder_url(value) else value
+
+
+def _template_widths(get):
+    raw = get('data-widths') or ''
+    return [int(width) for width in re.findall(r'\d+', raw)]
+
+
+def resolve_image_url(item):
+    """
+    Real image URL of a BeautifulSoup product card (or a single img/source
+    tag), read straight from the lazy-loading attributes in one pass.
+    Nothing is scrolled into view or loaded. Returns None if the card only
+    has placeholders.
+    """
+    candidates = [item] if item.name in ('img', 'source') else item.select(IMAGE_ELEMENT_SELECTOR)
+    for element in candidates:
+        widths = _template_widths(element.get)
+        for attr in LAZY_IMAGE_ATTRS:
+            url = _attribute_url(attr, element.get(attr), widths)
+            if url:
+                return url
+        match = _BACKGROUND_URL.search(element.get('style') or '')
+        if match and not is_placeholder_url(match.group(1)):
+            return match.group(1)
+    return None
+
+
+# Same lookup as a JavaScript function, for scripts that resolve the images
+# of many elements in one execute_script (see image_resolver_arguments())
+RESOLVE_IMAGE_FUNCTION = """
+function resolveImage(root, attrs, hints, selector, defaultWidth) {
+    const isPlaceholder = url => !url || url.startsWith('data:')
+        || hints.some(hint => url.toLowerCase().includes(hint));
+    const largest = srcset => {
+        let best = null, bestWidth = -1;
+        for (const candidate of srcset.split(',')) {
+            const parts = candidate.trim().split(/\\s+/);
+            if (!parts[0]) continue;
+            const width = parts[1] ? parseFloat(parts[1]) || 0 : 0;
+            if (width > bestWidth) { best = parts[0]; bestWidth = width; }
+        }
+        return best;
+    };
+    const candidates = root.matches('img, source') ? [root] : root.querySelectorAll(selector);
+    for (const el of candidates) {
+        const widths = (el.getAttribute('data-widths') || '').match(/\\d+/g);
+        for (const attr of attrs) {
+            let value = (el.getAttribute(attr) || '').trim();
+            if (attr.endsWith('srcset') && value) value = largest(value);
+            if (value && value.includes('{width}')) {
+                value = value.replace('{width}', widths ? Math.max(...widths) : defaultWidth);
+            }
+            if (!isPlaceholder(value)) return value;
+        }
+        const match = /url\\(\\s*['"]?([^'")]+)['"]?\\s*\\)/.exec(el.getAttribute('style') || '');
+        if (match && !isPlaceholder(match[1])) return match[1];
+    }
+    return null;
+}
+"""
+
+
+def image_resolver_arguments():
+    """The attrs, hints, selector and defaultWidth arguments resolveImage() takes"""
+    return [list(LAZY_IMAGE_ATTRS), list(PLACEHOLDER_HINTS), IMAGE_ELEMENT_SELECTOR, DEFAULT_TEMPLATE_WIDTH]
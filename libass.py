@@ -1,80 +1,54 @@
 import pandas as pd
-import time
 import re
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import quote
 import json
+from driver_pool import checkout_driver, checkin_driver
+from scroll_engine import scroll_page, site_card_selector
+from deadlines import deadline_reached
+from parse_pool import DEBUG_STRUCTURE, parse_and_extract
+from fetch_strategy import HttpPathFailed, fetch_unblocked_html, record_http_result, should_try_http
+from pagination import SITE_PAGINATION, fetch_pages, merge_pages, page_urls, product_key
+from waits import wait_until_ready, wait_for_site_settled
+from lazy_images import resolve_image_url
 
 
-def get_driver():
+def scrape_libas(query, max_results=60):
     """
-    Set up and return a WebDriver instance
-    You need to implement this based on your Selenium setup
+    Enhanced Libas scraper that scrapes its result pages concurrently.
     """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-
-def scrape_libas(query):
-    """
-    Enhanced Libas scraper that scrapes the first two pages of results.
-    """
-    driver = get_driver()
     encoded_query = quote(query)
     base_url = f"https://www.libas.in/search?q={encoded_query}"
     
-    all_products = []
+    urls = page_urls('Libas', base_url, max_results)
+    pages = []
 
-    try:
-        for page_num in range(1, 3): # Scrape pages 1 and 2
-            if page_num == 1:
-                url = base_url
-            else:
-                url = f"{base_url}&p={page_num}"
+    # Cheap path first: the result pages over plain HTTP, when they carry the products
+    if should_try_http('Libas'):
+        try:
+            pages = fetch_pages('Libas', urls, scrape_libas_page, None, query, max_results)
+            record_http_result('Libas', bool(pages[0]), "no products in the server response")
+        except HttpPathFailed as e:
+            record_http_result('Libas', False, str(e))
 
-            print(f"\n--- Scraping Libas Page {page_num}: {url} ---")
-            
+    if not pages or not pages[0]:
+        driver = checkout_driver('Libas')
+        try:
+            pages = fetch_pages('Libas', urls, scrape_libas_page, driver, query, max_results)
+        except Exception as e:
+            print(f"A critical error occurred during Libas scraping: {e}")
             try:
-                driver.get(url)
-                wait = WebDriverWait(driver, 25)
-                # Check for a specific element that indicates products are present
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-v-74577c89], .product-card, .st-product')))
-                time.sleep(5)
+                driver.save_screenshot("libas_error.png")
             except:
-                print(f"No products found on page {page_num}, or page failed to load. Stopping.")
-                break
-
-            enhanced_libas_scroll(driver, max_scrolls=20, scroll_pause=3)
-            force_libas_lazy_loading(driver)
-            time.sleep(7)
+                pass
+        finally:
+            checkin_driver(driver)
 
-            print(f"\n=== DEBUGGING LIBAS STRUCTURE (Page {page_num}) ===")
-            debug_libas_structure(driver)
-            
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            html_products = extract_libas_html_products(soup)
-            print(f"Found {len(html_products)} products from HTML parsing on page {page_num}")
-            all_products.extend(html_products)
-
-    except Exception as e:
-        print(f"A critical error occurred during Libas scraping: {e}")
-        try:
-            driver.save_screenshot("libas_error.png")
-        except:
-            pass
-    finally:
-        driver.quit()
+    all_products = merge_pages(pages, max_results,
+                               key=lambda product: product_key(product, 'title', 'price', 'link'))
 
     # Create DataFrame from all collected products
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
@@ -112,158 +86,58 @@ def scrape_libas(query):
     df['Source'] = 'Libas'
     return df
 
-def enhanced_libas_scroll(driver, max_scrolls=20, scroll_pause=3):
+def scrape_libas_page(driver, url, page_num, query, max_results=60):
+    """One Libas results page as a list of product records (fetched over HTTP when `driver` is None)"""
+    print(f"\n--- Scraping Libas Page {page_num}: {url} ---")
+    
+    if driver is None:
+        return parse_and_extract(fetch_unblocked_html(url, 'Libas'), (extract_libas_html_products, max_results))[0]
+    
+    try:
+        driver.get(url)
+        # Check for a specific element that indicates products are present
+        if not wait_until_ready(driver, 'Libas', timeout=25):
+            print(f"No products found on page {page_num}, or page failed to load. Stopping.")
+            return []
+    except:
+        print(f"No products found on page {page_num}, or page failed to load. Stopping.")
+        return []
+
+    # One page holds at most a page's worth of products; aiming for the whole
+    # job's max_results would scroll each page until its budget ran out
+    page_target = min(max_results, SITE_PAGINATION['Libas'][1])
+    enhanced_libas_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=page_target, query=query)
+    wait_for_site_settled(driver, 'Libas', timeout=7)
+
+    if DEBUG_STRUCTURE:
+        print(f"\n=== DEBUGGING LIBAS STRUCTURE (Page {page_num}) ===")
+        debug_libas_structure(driver)
+    
+    html_products = parse_and_extract(driver.page_source, (extract_libas_html_products, max_results))[0]
+    print(f"Found {len(html_products)} products from HTML parsing on page {page_num}")
+    return html_products
+
+def enhanced_libas_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=None, query=None):
     """
     Enhanced scrolling function specifically designed for Libas's lazy loading.
     """
     print("Starting enhanced Libas lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
+    # Check for Libas-specific product containers
+    product_selector = (
+        'div[data-v-74577c89], .st-product, .product-card, .product-item, ' +
+        '.product-tile, .card, [class*="product"], [class*="item"], ' +
+        '[class*="card"], [class*="st-"], article, .grid-item'
+    )
     
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        time.sleep(scroll_pause)
-        
-        # Check for Libas-specific product containers
-        js_script = """
-            return document.querySelectorAll(
-                'div[data-v-74577c89], .st-product, .product-card, .product-item, ' +
-                '.product-tile, .card, [class*="product"], [class*="item"], ' +
-                '[class*="card"], [class*="st-"], article, .grid-item'
-            ).length;
-        """
-        products_loaded = driver.execute_script(js_script)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} product elements detected")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
-    
-    # Final scroll patterns to ensure everything loads
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(3)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(3)
+    scroll_page(
+        driver, card_selector=product_selector, max_steps=max_scrolls,
+        step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('Libas'), label="Libas", site='Libas', query=query
+    )
     
     print("Enhanced Libas scrolling complete")
 
-def force_libas_lazy_loading(driver):
-    """
-    Force load lazy images and content specific to Libas with multiple strategies
-    """
-    try:
-        print("Forcing Libas lazy loading...")
-        
-        # Strategy 1: Handle standard lazy loading patterns
-        js_strategy_1 = """
-            console.log('Starting Libas image lazy loading...');
-            const lazyImages = document.querySelectorAll(
-                'img[data-v-74577c89], img[data-src], img[data-original], ' +
-                'img[data-lazy-src], img[data-srcset], img[loading="lazy"], ' +
-                'img[class*="lazy"], img[class*="lazyload"]'
-            );
-            console.log('Found', lazyImages.length, 'lazy images');
-            lazyImages.forEach((img, index) => {
-                const dataSrc = img.dataset.src || img.dataset.original || 
-                               img.dataset.lazySrc || img.dataset.srcset;
-                if (dataSrc && !img.src.includes(dataSrc)) {
-                    console.log('Loading Libas image', index, ':', dataSrc);
-                    img.src = dataSrc;
-                    img.removeAttribute('loading');
-                }
-            });
-            return lazyImages.length;
-        """
-        driver.execute_script(js_strategy_1)
-        time.sleep(3)
-        
-        # Strategy 2: Trigger scroll and visibility events
-        js_strategy_2 = """
-            console.log('Triggering Libas scroll and resize events...');
-            const allImages = document.querySelectorAll('img[data-v-74577c89], img');
-            allImages.forEach((img, index) => {
-                try {
-                    img.scrollIntoView({ behavior: 'auto', block: 'center' });
-                    img.dispatchEvent(new Event('load'));
-                    img.dispatchEvent(new Event('appear'));
-                    img.dispatchEvent(new Event('inview'));
-                    img.dispatchEvent(new Event('scroll'));
-                } catch(e) {
-                    console.log('Error with Libas image', index, ':', e);
-                }
-            });
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-            window.dispatchEvent(new Event('load'));
-            return allImages.length;
-        """
-        driver.execute_script(js_strategy_2)
-        time.sleep(3)
-        
-        # Strategy 3: Handle Libas-specific Vue.js data attributes
-        js_strategy_3 = """
-            console.log('Handling Libas Vue.js specific lazy loading...');
-            const libasImages = document.querySelectorAll(
-                'img[data-v-74577c89], div[data-v-74577c89] img, ' +
-                '.st-product img, [class*="st-"] img, .slideshow-container img'
-            );
-            libasImages.forEach((img, index) => {
-                const possibleSrcs = [
-                    img.dataset.src, img.dataset.original, img.dataset.lazySrc, 
-                    img.dataset.srcset, img.getAttribute('src')
-                ];
-                for (let src of possibleSrcs) {
-                    if (src && src.includes('http') && !img.src.includes(src)) {
-                        console.log('Loading Libas Vue image', index, ':', src);
-                        img.src = src;
-                        break;
-                    }
-                }
-                // Remove lazy loading classes
-                img.classList.remove('lazyload', 'lazy');
-            });
-            return libasImages.length;
-        """
-        driver.execute_script(js_strategy_3)
-        time.sleep(3)
-        
-        # Strategy 4: Handle background images and slideshow
-        js_strategy_4 = """
-            console.log('Handling Libas background images and slideshow...');
-            const bgElements = document.querySelectorAll(
-                '[data-bg], [data-background], [data-bg-src], ' +
-                '.slideshow-container [data-v-74577c89]'
-            );
-            bgElements.forEach((el, index) => {
-                const bgSrc = el.dataset.bg || el.dataset.background || el.dataset.bgSrc;
-                if (bgSrc) {
-                    el.style.backgroundImage = `url("${bgSrc}")`;
-                    console.log('Set Libas background image', index, ':', bgSrc);
-                }
-            });
-            return bgElements.length;
-        """
-        driver.execute_script(js_strategy_4)
-        
-        print("Libas lazy loading strategies completed")
-        
-    except Exception as e:
-        print(f"Error in Libas forced lazy loading: {e}")
 
 def debug_libas_structure(driver):
     """
@@ -346,7 +220,7 @@ def debug_libas_structure(driver):
     except Exception as e:
         print(f"Error in Libas debug function: {e}")
 
-def extract_libas_html_products(soup):
+def extract_libas_html_products(soup, max_results=60):
     """
     Enhanced HTML parsing for Libas products with better filtering
     Based on the provided HTML structure with data-v-74577c89 attributes
@@ -408,7 +282,9 @@ def extract_libas_html_products(soup):
     print(f"Libas: Found {len(items)} items using selector: {selector_used}")
     
     # Process items with duplicate detection
-    for idx, item in enumerate(items[:60]):
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
         try:
             # Extract product data
             title = extract_libas_title_improved(item)
@@ -546,47 +422,23 @@ def extract_libas_image_improved(item):
         libas_imgs = item.find_all('img', attrs={'data-v-74577c89': True})
         
         for img in libas_imgs:
-            # Check primary src first
-            src = img.get('src', '')
+            # Real URL from src or the lazy-loading attributes
+            src = resolve_image_url(img)
             
-            # Skip logo and placeholder images
-            if any(skip in src.lower() for skip in [
-                'logo', 'placeholder', 'blank', 'loading', 'spinner'
-            ]):
-                continue
-            
-            # Look for product images
-            if (src and len(src) > 15 and 
+            # Skip logos; keep product images
+            if (src and len(src) > 15 and 'logo' not in src.lower() and
                 any(indicator in src.lower() for indicator in [
                     'product', '.jpg', '.jpeg', '.png', '.webp', 'cdn', 'shopify'
                 ])):
-                
                 return format_libas_image_url(src)
-            
-            # Check data attributes for lazy loading
-            for attr in ['data-src', 'data-original', 'srcset']:
-                data_src = img.get(attr)
-                if data_src:
-                    # For srcset, take the first URL
-                    if attr == 'srcset':
-                        data_src = data_src.split(' ')[0]
-                    
-                    if (len(data_src) > 15 and 
-                        any(indicator in data_src.lower() for indicator in [
-                            'product', '.jpg', '.jpeg', '.png', '.webp'
-                        ])):
-                        return format_libas_image_url(data_src)
         
         # Fallback to any img in the item
-        all_imgs = item.find_all('img')
+        all_imgs = item.find_all(['img', 'source'])
         for img in all_imgs:
-            src = img.get('src', '')
-            if (src and len(src) > 15 and 
+            src = resolve_image_url(img)
+            if (src and len(src) > 15 and 'logo' not in src.lower() and
                 any(indicator in src.lower() for indicator in [
                     'product', '.jpg', '.jpeg', '.png', '.webp'
-                ]) and
-                not any(skip in src.lower() for skip in [
-                    'logo', 'placeholder', 'blank'
                 ])):
                 return format_libas_image_url(src)
     
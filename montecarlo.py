@@ -1,64 +1,55 @@
 import pandas as pd
-import time
 import re
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import quote
 import json
+from driver_pool import checkout_driver, checkin_driver
+from scroll_engine import scroll_page, site_card_selector
+from deadlines import deadline_reached
+from parse_pool import DEBUG_STRUCTURE, parse_and_extract
+from fetch_strategy import try_http
+from waits import wait_until_ready, wait_for_site_settled
+from lazy_images import resolve_image_url
 
 
-def get_driver():
-    """
-    Set up and return a WebDriver instance
-    """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-
-def scrape_monte_carlo(query):
+def scrape_monte_carlo(query, max_results=60):
     """
     Monte Carlo scraper that scrapes one page of results with lazy loading support.
     """
-    driver = get_driver()
     encoded_query = quote(query.replace(' ', '+'))
     url = f"https://www.montecarlo.in/search?type=product&q={encoded_query}"
     
     all_products = []
 
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Monte Carlo', url, (extract_monte_carlo_html_products, max_results))
+    driver = None if http_results is not None else checkout_driver('Monte Carlo')
+    
     try:
         print(f"\n--- Scraping Monte Carlo: {url} ---")
         
-        driver.get(url)
-        wait = WebDriverWait(driver, 25)
-        
-        # Wait for the product list to load
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '.product-list__inner, .product-item')))
-            time.sleep(5)
-        except:
-            print("No products found or page failed to load.")
-            return pd.DataFrame({"Title": [], "Price": [], "Image": [], "Link": [], "Source": []})
-
-        # Enhanced scrolling for lazy loading
-        enhanced_monte_carlo_scroll(driver, max_scrolls=15, scroll_pause=3)
-        force_monte_carlo_lazy_loading(driver)
-        time.sleep(7)
-
-        print(f"\n=== DEBUGGING MONTE CARLO STRUCTURE ===")
-        debug_monte_carlo_structure(driver)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        html_products = extract_monte_carlo_html_products(soup)
+        if http_results is not None:
+            html_products = http_results[0]
+        else:
+            driver.get(url)
+            
+            # Wait for the product list to load
+            if not wait_until_ready(driver, 'Monte Carlo', timeout=25):
+                print("No products found or page failed to load.")
+                return pd.DataFrame({"Title": [], "Price": [], "Image": [], "Link": [], "Source": []})
+
+            # Enhanced scrolling for lazy loading
+            enhanced_monte_carlo_scroll(driver, max_scrolls=15, scroll_pause=3, target_count=max_results, query=query)
+            wait_for_site_settled(driver, 'Monte Carlo', timeout=7)
+
+            if DEBUG_STRUCTURE:
+                print(f"\n=== DEBUGGING MONTE CARLO STRUCTURE ===")
+                debug_monte_carlo_structure(driver)
+            
+            html_products = parse_and_extract(driver.page_source, (extract_monte_carlo_html_products, max_results))[0]
         print(f"Found {len(html_products)} products from HTML parsing")
         all_products.extend(html_products)
 
@@ -69,7 +60,8 @@ def scrape_monte_carlo(query):
         except:
             pass
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
 
     # Create DataFrame from all collected products
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
@@ -108,144 +100,28 @@ def scrape_monte_carlo(query):
     return df
 
 
-def enhanced_monte_carlo_scroll(driver, max_scrolls=15, scroll_pause=3):
+def enhanced_monte_carlo_scroll(driver, max_scrolls=15, scroll_pause=3, target_count=None, query=None):
     """
     Enhanced scrolling function specifically designed for Monte Carlo's lazy loading.
     """
     print("Starting enhanced Monte Carlo lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        time.sleep(scroll_pause)
-        
-        # Check for Monte Carlo specific product containers
-        js_script = """
-            return document.querySelectorAll(
-                '.product-item, .product-list__inner .product-item, ' +
-                '.product-item.full_var, .product-item.var-5'
-            ).length;
-        """
-        products_loaded = driver.execute_script(js_script)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} product elements detected")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 3:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
+    # Check for Monte Carlo specific product containers
+    product_selector = (
+        '.product-item, .product-list__inner .product-item, ' +
+        '.product-item.full_var, .product-item.var-5'
+    )
     
-    # Final scroll patterns to ensure everything loads
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(3)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(3)
+    scroll_page(
+        driver, card_selector=product_selector, max_steps=max_scrolls,
+        step_timeout=scroll_pause, patience=3, target_count=target_count,
+        target_selector=site_card_selector('Monte Carlo'), label="Monte Carlo",
+        site='Monte Carlo', query=query
+    )
     
     print("Enhanced Monte Carlo scrolling complete")
 
 
-def force_monte_carlo_lazy_loading(driver):
-    """
-    Force load lazy images and content specific to Monte Carlo
-    """
-    try:
-        print("Forcing Monte Carlo lazy loading...")
-        
-        # Strategy 1: Handle standard lazy loading patterns
-        js_strategy_1 = """
-            console.log('Starting Monte Carlo image lazy loading...');
-            const lazyImages = document.querySelectorAll(
-                'img[data-src], img[data-original], img[data-lazy-src], ' +
-                'img[data-srcset], img[loading="lazy"], img[class*="lazy"], ' +
-                'img[class*="lazyload"], .product-item__image-wrapper img'
-            );
-            console.log('Found', lazyImages.length, 'lazy images');
-            lazyImages.forEach((img, index) => {
-                const dataSrc = img.dataset.src || img.dataset.original || 
-                               img.dataset.lazySrc || img.dataset.srcset;
-                if (dataSrc && !img.src.includes(dataSrc)) {
-                    console.log('Loading Monte Carlo image', index, ':', dataSrc);
-                    img.src = dataSrc;
-                    img.removeAttribute('loading');
-                }
-            });
-            return lazyImages.length;
-        """
-        driver.execute_script(js_strategy_1)
-        time.sleep(3)
-        
-        # Strategy 2: Trigger scroll and visibility events specifically for product items
-        js_strategy_2 = """
-            console.log('Triggering Monte Carlo scroll and resize events...');
-            const productItems = document.querySelectorAll('.product-item');
-            productItems.forEach((item, index) => {
-                try {
-                    item.scrollIntoView({ behavior: 'auto', block: 'center' });
-                    const images = item.querySelectorAll('img');
-                    images.forEach(img => {
-                        img.dispatchEvent(new Event('load'));
-                        img.dispatchEvent(new Event('appear'));
-                        img.dispatchEvent(new Event('inview'));
-                        img.dispatchEvent(new Event('scroll'));
-                    });
-                } catch(e) {
-                    console.log('Error with Monte Carlo product item', index, ':', e);
-                }
-            });
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-            window.dispatchEvent(new Event('load'));
-            return productItems.length;
-        """
-        driver.execute_script(js_strategy_2)
-        time.sleep(3)
-        
-        # Strategy 3: Handle Monte Carlo specific image containers
-        js_strategy_3 = """
-            console.log('Handling Monte Carlo specific lazy loading...');
-            const imageWrappers = document.querySelectorAll(
-                '.product-item__image-wrapper img, .product-item__image-wrapper--multiple img'
-            );
-            imageWrappers.forEach((img, index) => {
-                const possibleSrcs = [
-                    img.dataset.src, img.dataset.original, img.dataset.lazySrc, 
-                    img.dataset.srcset, img.getAttribute('src')
-                ];
-                for (let src of possibleSrcs) {
-                    if (src && src.includes('http') && !img.src.includes(src)) {
-                        console.log('Loading Monte Carlo wrapper image', index, ':', src);
-                        img.src = src;
-                        break;
-                    }
-                }
-                // Remove lazy loading classes
-                img.classList.remove('lazyload', 'lazy');
-            });
-            return imageWrappers.length;
-        """
-        driver.execute_script(js_strategy_3)
-        time.sleep(3)
-        
-        print("Monte Carlo lazy loading strategies completed")
-        
-    except Exception as e:
-        print(f"Error in Monte Carlo forced lazy loading: {e}")
-
-
 def debug_monte_carlo_structure(driver):
     """
     Debug function to inspect Monte Carlo's HTML structure
@@ -307,7 +183,7 @@ def debug_monte_carlo_structure(driver):
         print(f"Error in Monte Carlo debug function: {e}")
 
 
-def extract_monte_carlo_html_products(soup):
+def extract_monte_carlo_html_products(soup, max_results=60):
     """
     HTML parsing for Monte Carlo products based on the specified structure
     """
@@ -326,7 +202,9 @@ def extract_monte_carlo_html_products(soup):
     product_items = product_list.select('.product-item')
     print(f"Found {len(product_items)} product items")
     
-    for idx, item in enumerate(product_items[:60]):  # Limit to avoid too many products
+    for idx, item in enumerate(product_items[:max_results]):  # Limit to avoid too many products
+        if deadline_reached('extract'):
+            break
         try:
             # Extract product data using the specified structure
             title = extract_monte_carlo_title(item)
@@ -464,26 +342,12 @@ def extract_monte_carlo_image(item):
             img_elem = item.select_one('img')
         
         if img_elem:
-            # Check primary src first
-            src = img_elem.get('src', '')
-            
-            # Skip logo and placeholder images
-            if src and not any(skip in src.lower() for skip in [
-                'logo', 'placeholder', 'blank', 'loading', 'spinner'
-            ]):
-                if len(src) > 15:
-                    return format_monte_carlo_image_url(src)
+            # Real URL from src or the lazy-loading attributes
+            src = resolve_image_url(img_elem)
             
-            # Check data attributes for lazy loading
-            for attr in ['data-src', 'data-original', 'srcset', 'data-srcset']:
-                data_src = img_elem.get(attr)
-                if data_src:
-                    # For srcset, take the first URL
-                    if 'srcset' in attr:
-                        data_src = data_src.split(' ')[0]
-                    
-                    if len(data_src) > 15:
-                        return format_monte_carlo_image_url(data_src)
+            # Skip logo images
+            if src and len(src) > 15 and 'logo' not in src.lower():
+                return format_monte_carlo_image_url(src)
         
     except Exception as e:
         print(f"Error extracting Monte Carlo image: {e}")
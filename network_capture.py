@@ -0,0 +1,102 @@
+import base64
+import json
+
+from waits import start_response_capture, take_captured_responses
+
+
+# Site name -> regex of the JSON API calls its search page loads the product
+# grid (and every page scrolled in after it) from
+SITE_API_PATTERNS = {
+    "Ajio": r"ajio\.com/api/(search|category)",
+    "Nykaa": r"nykaa\.com/(app-api|gateway-api)/.*(search|listing)",
+    "Lifestyle": r"lifestylestores\.com/.*(landmarkshopscommercews|/api/).*(search|products)",
+}
+
+# Keys that mark a JSON object as a product: a name and a price
+TITLE_KEYS = ('name', 'title', 'productName', 'displayName')
+PRICE_KEYS = ('price', 'mrp', 'sellingPrice', 'offerPrice', 'priceValue', 'currentPrice',
+              'finalPrice', 'salePrice', 'displayPrice', 'wasPriceData')
+
+
+def start_capture(driver, site):
+    """
+    Start collecting `site`'s API responses in the driver's current window.
+    Call it right before driver.get(); returns False when the site has no
+    API pattern or Chrome's performance log is off, so nothing is captured.
+    """
+    pattern = SITE_API_PATTERNS.get(site)
+    if pattern is None:
+        return False
+    return start_response_capture(driver, pattern)
+
+
+def stop_capture(driver):
+    start_response_capture(driver, None)
+
+
+def captured_payloads(driver):
+    """Decoded JSON bodies of the captured responses that finished since the last call"""
+    payloads = []
+    for request_id, url in take_captured_responses(driver):
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            text = body.get('body', '')
+            if body.get('base64Encoded'):
+                text = base64.b64decode(text).decode('utf-8', 'replace')
+            payloads.append(json.loads(text))
+        except Exception as e:
+            # Evicted from Chrome's buffer, or not JSON after all
+            print(f"Could not read captured response {url}: {e}")
+    return payloads
+
+
+def is_product(item):
+    return isinstance(item, dict) and any(key in item for key in TITLE_KEYS) and any(key in item for key in PRICE_KEYS)
+
+
+def find_product_lists(payload, depth=0):
+    """Every list of product objects anywhere in a JSON payload"""
+    found = []
+    if depth > 8:
+        return found
+    if isinstance(payload, list):
+        if payload and sum(1 for item in payload if is_product(item)) * 2 > len(payload):
+            return [payload]
+        for item in payload:
+            found.extend(find_product_lists(item, depth + 1))
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            if isinstance(value, (list, dict)):
+                found.extend(find_product_lists(value, depth + 1))
+    return found
+
+
+def captured_products(driver, site, to_record, max_results=None):
+    """
+    Product records from the API responses captured since start_capture(),
+    in the order they arrived, with repeats (same link) dropped.
+    `to_record(product)` turns one JSON product object into a record, or
+    None to skip it. Stops the capture.
+    """
+    records = []
+    seen = set()
+    try:
+        for payload in captured_payloads(driver):
+            for products in find_product_lists(payload):
+                for product in products:
+                    if not is_product(product):
+                        continue
+                    try:
+                        record = to_record(product)
+                    except Exception:
+                        continue
+                    if not record or (record['link'] != '#' and record['link'] in seen):
+                        continue
+                    seen.add(record['link'])
+                    records.append(record)
+    finally:
+        stop_capture(driver)
+
+    if records:
+        print(f"{site}: {len(records)} products read from captured API responses")
+    return records[:max_results] if max_results else records
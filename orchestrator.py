@@ -0,0 +1,142 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from driver_pool import BROWSER_MODE, DEFAULT_MAX_TABS, DEFAULT_POOL_SIZE
+from deadlines import SITE_TIME_BUDGET
+from site_search import SITE_DOMAINS, run_site
+
+
+# Scrapes running at once across the whole process, whichever session started
+# them. Each one holds a browser (or a tab in SCRAPER_BROWSER_MODE=tabs).
+BROWSER_SLOTS = int(os.environ.get(
+    "SCRAPER_BROWSER_SLOTS", DEFAULT_MAX_TABS if BROWSER_MODE == "tabs" else DEFAULT_POOL_SIZE
+))
+
+# Scrapes running at once against one domain, e.g. at most 2 amazon.in jobs
+DOMAIN_CONCURRENCY = int(os.environ.get("SCRAPER_DOMAIN_CONCURRENCY", "2"))
+
+
+class Orchestrator:
+    """
+    Process-wide asyncio scheduler for scrape jobs. Its event loop runs on a
+    background thread, so any thread (e.g. each Streamlit session) can submit
+    jobs and all of them share the same limits: a job first takes its
+    domain's semaphore, then a browser slot, and only then runs the blocking
+    scraper on a worker thread. Identical jobs submitted while one is
+    already running (same site, same normalized query) attach to it instead
+    of scraping again.
+    """
+
+    def __init__(self, browser_slots=BROWSER_SLOTS, domain_limit=DOMAIN_CONCURRENCY):
+        self.browser_slots = browser_slots
+        self.domain_limit = domain_limit
+        self.loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=browser_slots, thread_name_prefix="scrape")
+        self._slots = None
+        self._domains = {}
+        self._inflight = {}
+        self._thread = threading.Thread(target=self.loop.run_forever, name="scrape-orchestrator", daemon=True)
+        self._thread.start()
+
+    # Semaphores are created (and only touched) on the event loop thread, so
+    # they bind to that loop and need no lock
+    def _slot_semaphore(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.browser_slots)
+        return self._slots
+
+    def _domain_semaphore(self, domain):
+        if domain not in self._domains:
+            self._domains[domain] = asyncio.Semaphore(self.domain_limit)
+        return self._domains[domain]
+
+    async def run_job(self, site, query, budget=SITE_TIME_BUDGET):
+        """
+        Run one site scrape within the domain and browser-slot limits, or
+        share the result of the identical scrape already in flight.
+        Returns run_site()'s result plus 'domain', 'queued' (seconds spent
+        waiting for the limits) and 'shared' (True when this caller attached
+        to another caller's scrape).
+        """
+        # Only touched on the event loop thread, like the semaphores
+        key = (site, normalize_query(query))
+        task = self._inflight.get(key)
+        shared = task is not None
+        if not shared:
+            task = self.loop.create_task(self._run_job(site, query, budget))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: a caller that gives up must not cancel the others' scrape
+        result = dict(await asyncio.shield(task))
+        if result['df'] is not None:
+            result['df'] = result['df'].copy()
+        result['query'] = query
+        result['shared'] = shared
+        return result
+
+    async def _run_job(self, site, query, budget):
+        domain = SITE_DOMAINS.get(site, site)
+        submitted = time.time()
+        async with self._domain_semaphore(domain):
+            async with self._slot_semaphore():
+                queued = time.time() - submitted
+                result = await self.loop.run_in_executor(self._executor, run_site, site, query, budget)
+        result['domain'] = domain
+        result['queued'] = queued
+        return result
+
+    async def run_jobs(self, jobs, budget=SITE_TIME_BUDGET):
+        """Run (site, query) jobs as asyncio tasks; results in job order"""
+        return await asyncio.gather(*(self.run_job(site, query, budget) for site, query in jobs))
+
+    def submit(self, site, query, budget=SITE_TIME_BUDGET):
+        """Schedule run_job() from any thread; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(self.run_job(site, query, budget), self.loop)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a query, for matching identical searches"""
+    return " ".join(query.lower().split())
+
+
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator():
+    """Return the process-wide Orchestrator, creating it on first use"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            _orchestrator = Orchestrator()
+        return _orchestrator
+
+
+def run_jobs(jobs, budget=SITE_TIME_BUDGET):
+    """Blocking wrapper around Orchestrator.run_jobs() for (site, query) jobs"""
+    orchestrator = get_orchestrator()
+    return asyncio.run_coroutine_threadsafe(orchestrator.run_jobs(jobs, budget), orchestrator.loop).result()
+
+
+def iter_site_results(query, sites, budget=SITE_TIME_BUDGET):
+    """
+    Scrape `sites` for `query` through the orchestrator and yield each
+    site's result as soon as it finishes (fastest first).
+    """
+    orchestrator = get_orchestrator()
+    futures = [orchestrator.submit(site, query, budget) for site in sites]
+    for future in as_completed(futures):
+        result = future.result()
+        if result['df'] is not None:
+            print(f"{result['site']}: {len(result['df'])} products after {result['elapsed']:.1f}s "
+                  f"(queued {result['queued']:.1f}s){' (partial)' if result['partial'] else ''}"
+                  f"{' (shared with an identical search)' if result['shared'] else ''}")
+        yield result
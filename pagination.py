@@ -0,0 +1,116 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from driver_pool import checkin_driver, checkout_driver, current_pool, use_pool
+from deadlines import EXTRACT_RESERVE, current_deadline, deadline_reached, use_deadline
+
+
+# Most result pages one scrape loads, including the first
+MAX_PAGES = int(os.environ.get("SCRAPER_MAX_PAGES", "3"))
+
+# Site name -> (query parameter holding the page number, products per page)
+SITE_PAGINATION = {
+    "Amazon": ("page", 16),
+    "Flipkart": ("page", 24),
+    "Libas": ("p", 30),
+}
+
+
+def page_urls(site, first_url, max_results):
+    """
+    URLs of the result pages `site` needs for `max_results` products, page 1
+    being `first_url` itself. Sites without a SITE_PAGINATION entry get one page.
+    """
+    if site not in SITE_PAGINATION:
+        return [first_url]
+    param, per_page = SITE_PAGINATION[site]
+    pages = max(1, min(MAX_PAGES, math.ceil(max_results / per_page)))
+    separator = '&' if '?' in first_url else '?'
+    return [first_url] + [f"{first_url}{separator}{param}={n}" for n in range(2, pages + 1)]
+
+
+def fetch_pages(site, urls, fetch_page, driver, *args):
+    """
+    Load result pages concurrently and return each page's records, in page
+    order. `fetch_page(driver, url, page_num, *args)` loads one page and
+    returns a list of product records. Page 1 runs on `driver` (the caller's own);
+    every other page runs on a driver of its own when the pool has one free
+    right away, otherwise on `driver` once page 1 is done, so extra pages
+    never wait on (or starve) other jobs. With `driver` None (scrapers that
+    fetch over HTTP) every page simply gets its own thread. The job's
+    deadline covers all pages. Page 1 errors propagate; a later page that
+    fails just adds nothing.
+    """
+    pool = current_pool()
+    deadline = current_deadline()
+    pages = [None] * len(urls)
+    leftover = []
+
+    def run_extra(index):
+        if driver is None:
+            with use_deadline(deadline):
+                pages[index] = load(None, index)
+            return
+        # Checked out before the deadline is joined: a borrowed driver must
+        # not extend the job's clock
+        with use_pool(pool):
+            try:
+                extra_driver = checkout_driver(site, timeout=0)
+            except TimeoutError:
+                leftover.append(index)
+                return
+            try:
+                with use_deadline(deadline):
+                    pages[index] = load(extra_driver, index)
+            finally:
+                checkin_driver(extra_driver)
+
+    def load(page_driver, index):
+        if index == 0:
+            return fetch_page(page_driver, urls[0], 1, *args)
+        if deadline_reached('navigation', reserve=EXTRACT_RESERVE):
+            return []
+        try:
+            return fetch_page(page_driver, urls[index], index + 1, *args)
+        except Exception as e:
+            print(f"{site}: page {index + 1} failed: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=max(1, len(urls) - 1), thread_name_prefix=f"{site}-page") as executor:
+        futures = [executor.submit(run_extra, index) for index in range(1, len(urls))]
+        pages[0] = load(driver, 0)
+        for future in futures:
+            future.result()
+
+    for index in sorted(leftover):
+        pages[index] = load(driver, index)
+    return pages
+
+
+def merge_pages(pages, max_results=None, key=None):
+    """
+    Flatten per-page records in page order, dropping products already seen on
+    an earlier page (sites repeat sponsored items). `key(record)` identifies a
+    product; records it maps to None are always kept.
+    """
+    merged = []
+    seen = set()
+    for records in pages:
+        for record in records or []:
+            product_key = key(record) if key else None
+            if product_key is not None:
+                if product_key in seen:
+                    continue
+                seen.add(product_key)
+            merged.append(record)
+            if max_results is not None and len(merged) >= max_results:
+                return merged
+    return merged
+
+
+def product_key(record, title='Title', price='Price', link='Link'):
+    """Dedup key for a record: its link, or title and price when it has none"""
+    if record.get(link) and record[link] != '#':
+        return record[link]
+    return (record.get(title), record.get(price))
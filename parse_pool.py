@@ -0,0 +1,88 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from bs4 import BeautifulSoup
+
+from deadlines import current_deadline, deadline_scope, mark_partial
+
+
+# Worker processes for the parse-and-extract stage. BeautifulSoup work is
+# CPU-bound and holds the GIL, so sites finishing together would otherwise
+# parse one after another. 0 parses in the calling thread.
+PARSE_WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# Set to 1 to print each site's page structure before extracting. The dumps
+# parse the whole page again in the scraper thread, so they are off by default.
+DEBUG_STRUCTURE = os.environ.get("SCRAPER_DEBUG_STRUCTURE", "0") == "1"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _run_extractors(html, extractors, seconds):
+    """Worker side: parse once, run every extractor on the same soup"""
+    soup = BeautifulSoup(html, "html.parser")
+    # The job's remaining time budget travels with the HTML, so the
+    # extraction loops still stop on time in the worker process
+    with deadline_scope(seconds, label="Parse") as deadline:
+        results = [extract(soup, *args) for extract, *args in extractors]
+    return results, bool(deadline and deadline.partial)
+
+
+def get_parse_pool():
+    """Return the process-wide parse pool, creating it on first use (None when disabled)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None and PARSE_WORKERS > 0:
+            # spawn: the scraper threads of this process must not be forked
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def parse_and_extract(html, *extractors):
+    """
+    Parse `html` once in a worker process and run each extractor on it.
+    `extractors` are (function, *args) tuples; each function is called as
+    function(soup, *args) and must be a module-level function returning plain
+    product records (lists/dicts of strings), since arguments and results
+    cross the process boundary. Returns one result per extractor, in order.
+    Falls back to parsing in this thread if the pool is disabled or broken.
+    """
+    deadline = current_deadline()
+    # At least a sliver, so an exhausted budget doesn't read as "no limit"
+    seconds = max(deadline.remaining(), 0.001) if deadline is not None else None
+
+    pool = get_parse_pool()
+    if pool is not None:
+        try:
+            results, partial = pool.submit(_run_extractors, html, extractors, seconds).result()
+            if partial:
+                mark_partial('extract')
+            return results
+        except BrokenProcessPool as e:
+            print(f"Parse pool failed, parsing in-process: {e}")
+            _reset_pool()
+
+    soup = BeautifulSoup(html, "html.parser")
+    return [extract(soup, *args) for extract, *args in extractors]
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+
+def shutdown_parse_pool():
+    """Stop the worker processes (registered to run at interpreter exit)"""
+    _reset_pool()
+
+
+atexit.register(shutdown_parse_pool)
@@ -1,37 +1,24 @@
 import pandas as pd
-import time
 import re
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import quote
 import json
+from driver_pool import checkout_driver, checkin_driver
+from scroll_engine import scroll_page, site_card_selector
+from deadlines import deadline_reached
+from parse_pool import DEBUG_STRUCTURE, parse_and_extract
+from fetch_strategy import try_http
+from waits import wait_until_ready, wait_for_site_settled
+from lazy_images import RESOLVE_IMAGE_FUNCTION, image_resolver_arguments, resolve_image_url
 
 
-def get_driver():
-    """
-    Set up and return a WebDriver instance
-    You need to implement this based on your Selenium setup
-    """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-
-def scrape_westside(query):
+def scrape_westside(query, max_results=30):
     """
     Enhanced Westside scraper with comprehensive image detection and data extraction
     """
-    driver = get_driver()
-    
     # Westside search URL structure
     encoded_query = quote(query)
     url = f"https://www.westside.com/search?q={encoded_query}"
@@ -39,30 +26,32 @@ def scrape_westside(query):
     
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
     
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Westside', url, (extract_westside_html_products, max_results))
+    driver = None if http_results is not None else checkout_driver('Westside')
+    
     try:
-        driver.get(url)
-        
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 25)
-        time.sleep(5)
-        
-        # Enhanced lazy loading scroll for Westside
-        enhanced_westside_scroll(driver, max_scrolls=20, scroll_pause=3)
-        
-        # Force load any remaining lazy images with multiple strategies
-        force_westside_lazy_loading(driver)
-        
-        # Additional wait to ensure all content is loaded
-        time.sleep(7)
-        
-        # Debug the structure to understand Westside's HTML
-        print("\n=== DEBUGGING WESTSIDE STRUCTURE ===")
-        debug_westside_structure(driver)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Extract products using enhanced HTML parsing
-        html_products = extract_westside_html_products(soup)
+        if http_results is not None:
+            html_products = http_results[0]
+        else:
+            driver.get(url)
+            
+            # Wait for the product grid instead of a fixed delay
+            wait_until_ready(driver, 'Westside', timeout=25)
+            
+            # Enhanced lazy loading scroll for Westside
+            enhanced_westside_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=max_results, query=query)
+            
+            # Wait until the product count stops changing
+            wait_for_site_settled(driver, 'Westside', timeout=7)
+            
+            # Debug the structure to understand Westside's HTML
+            if DEBUG_STRUCTURE:
+                print("\n=== DEBUGGING WESTSIDE STRUCTURE ===")
+                debug_westside_structure(driver)
+            
+            # Extract products using enhanced HTML parsing
+            html_products = parse_and_extract(driver.page_source, (extract_westside_html_products, max_results))[0]
         
         print(f"Found {len(html_products)} products from HTML parsing")
         
@@ -106,157 +95,34 @@ def scrape_westside(query):
             pass
     
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'Westside'
     return df
 
-def enhanced_westside_scroll(driver, max_scrolls=20, scroll_pause=3):
+def enhanced_westside_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=None, query=None):
     """
     Enhanced scrolling function specifically designed for Westside's lazy loading.
     """
     print("Starting enhanced Westside lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        time.sleep(scroll_pause)
-        
-        # **CORRECTED JAVASCRIPT** - The selector string is now valid JavaScript.
-        js_script = """
-            return document.querySelectorAll(
-                '.product-card, .product-item, .product-tile, .card, ' +
-                '[class*="product"], [class*="item"], [class*="card"], ' +
-                'article, .grid-item, .collection-item'
-            ).length;
-        """
-        products_loaded = driver.execute_script(js_script)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} product elements detected")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
+    # Check for Westside product containers
+    product_selector = (
+        '.product-card, .product-item, .product-tile, .card, ' +
+        '[class*="product"], [class*="item"], [class*="card"], ' +
+        'article, .grid-item, .collection-item'
+    )
     
-    # Final scroll patterns to ensure everything loads
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(3)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(3)
+    scroll_page(
+        driver, card_selector=product_selector, max_steps=max_scrolls,
+        step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('Westside'), label="Westside", site='Westside', query=query
+    )
     
     print("Enhanced Westside scrolling complete")
 
-def force_westside_lazy_loading(driver):
-    """
-    Force load lazy images and content specific to Westside with multiple strategies
-    """
-    try:
-        print("Forcing Westside lazy loading...")
-        
-        # **CORRECTED JAVASCRIPT** - Strategy 1
-        js_strategy_1 = """
-            console.log('Starting image lazy loading...');
-            const lazyImages = document.querySelectorAll(
-                'img[data-src], img[data-original], img[data-lazy-src], ' +
-                'img[data-srcset], img[loading="lazy"], img[class*="lazy"], img[class*="lazyload"]'
-            );
-            console.log('Found', lazyImages.length, 'lazy images');
-            lazyImages.forEach((img, index) => {
-                const dataSrc = img.dataset.src || img.dataset.original || img.dataset.lazySrc || img.dataset.srcset;
-                if (dataSrc && !img.src.includes(dataSrc)) {
-                    console.log('Loading image', index, ':', dataSrc);
-                    img.src = dataSrc;
-                    img.removeAttribute('loading');
-                }
-            });
-            return lazyImages.length;
-        """
-        driver.execute_script(js_strategy_1)
-        time.sleep(3)
-        
-        # Strategy 2
-        js_strategy_2 = """
-            console.log('Triggering scroll and resize events...');
-            const allImages = document.querySelectorAll('img');
-            allImages.forEach((img, index) => {
-                try {
-                    img.scrollIntoView({ behavior: 'auto', block: 'center' });
-                    img.dispatchEvent(new Event('load'));
-                    img.dispatchEvent(new Event('appear'));
-                    img.dispatchEvent(new Event('inview'));
-                } catch(e) {
-                    console.log('Error with image', index, ':', e);
-                }
-            });
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-            window.dispatchEvent(new Event('load'));
-            return allImages.length;
-        """
-        driver.execute_script(js_strategy_2)
-        time.sleep(3)
-        
-        # **CORRECTED JAVASCRIPT** - Strategy 3
-        js_strategy_3 = """
-            console.log('Handling Shopify-specific lazy loading...');
-            const shopifyImages = document.querySelectorAll(
-                'img[class*="Image--lazyLoad"], img[class*="lazyload"], img[data-widths], ' +
-                'img[data-sizes], .product-single__photo img, .product-photo-container img, .grid-product__image img'
-            );
-            shopifyImages.forEach((img, index) => {
-                const possibleSrcs = [
-                    img.dataset.src, img.dataset.original, img.dataset.lazySrc, img.dataset.srcset
-                ];
-                for (let src of possibleSrcs) {
-                    if (src && !img.src.includes(src)) {
-                        console.log('Loading Shopify image', index, ':', src);
-                        img.src = src;
-                        break;
-                    }
-                }
-                img.classList.remove('lazyload', 'Image--lazyLoad');
-            });
-            return shopifyImages.length;
-        """
-        driver.execute_script(js_strategy_3)
-        time.sleep(3)
-        
-        # Strategy 4
-        js_strategy_4 = """
-            console.log('Handling background images...');
-            const bgElements = document.querySelectorAll('[data-bg], [data-background], [data-bg-src]');
-            bgElements.forEach((el, index) => {
-                const bgSrc = el.dataset.bg || el.dataset.background || el.dataset.bgSrc;
-                if (bgSrc) {
-                    el.style.backgroundImage = `url("${bgSrc}")`;
-                    console.log('Set background image', index, ':', bgSrc);
-                }
-            });
-            return bgElements.length;
-        """
-        driver.execute_script(js_strategy_4)
-        
-        print("Westside lazy loading strategies completed")
-        
-    except Exception as e:
-        print(f"Error in Westside forced lazy loading: {e}")
-
 def debug_westside_structure(driver):
     """
     Debug function to inspect Westside's HTML structure
@@ -319,7 +185,7 @@ def debug_westside_structure(driver):
     except Exception as e:
         print(f"Error in Westside debug function: {e}")
 
-def extract_westside_html_products(soup):
+def extract_westside_html_products(soup, max_results=30):
     """
     Enhanced HTML parsing for Westside products with better filtering
     """
@@ -375,7 +241,9 @@ def extract_westside_html_products(soup):
     print(f"Westside: Found {len(items)} items using selector: {selector_used}")
     
     # Process items with duplicate detection
-    for idx, item in enumerate(items[:30]):
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
         try:
             # Extract product data
             title = extract_westside_title_improved(item)
@@ -494,38 +362,16 @@ def extract_westside_image_improved(item):
     """Improved image extraction for Westside"""
     
     try:
-        imgs = item.find_all('img')
-        for img in imgs:
-            # Check primary src first
-            src = img.get('src', '')
-            
-            # Skip logo and placeholder images
-            if any(skip in src.lower() for skip in [
-                'logo', 'placeholder', 'blank', 'loading', 'spinner'
-            ]):
-                continue
+        for img in item.find_all(['img', 'source']):
+            # Real URL from src or the lazy-loading attributes
+            src = resolve_image_url(img)
             
-            # Look for product images
-            if (src and len(src) > 15 and 
+            # Skip logos; keep product images
+            if (src and len(src) > 15 and 'logo' not in src.lower() and
                 any(indicator in src.lower() for indicator in [
                     'product', '.jpg', '.jpeg', '.png', '.webp', 'cdn'
                 ])):
-                
                 return format_westside_image_url(src)
-            
-            # Check data attributes for lazy loading
-            for attr in ['data-src', 'data-original', 'srcset']:
-                data_src = img.get(attr)
-                if data_src:
-                    # For srcset, take the first URL
-                    if attr == 'srcset':
-                        data_src = data_src.split(' ')[0]
-                    
-                    if (len(data_src) > 15 and 
-                        any(indicator in data_src.lower() for indicator in [
-                            'product', '.jpg', '.jpeg', '.png', '.webp'
-                        ])):
-                        return format_westside_image_url(data_src)
     
     except Exception as e:
         print(f"Error extracting image: {e}")
@@ -641,12 +487,12 @@ def format_westside_image_url(url):
 
 
 
-def scrape_levis(query):
+def scrape_levis(query, max_results=25):
     """
     Enhanced Levi's India scraper - levi.in is Shopify-based
     Different from H&M structure, uses Shopify's search system
     """
-    driver = get_driver()
+    driver = checkout_driver("Levi's")
     
     # Levi's India search URL structure (Shopify-based)
     encoded_query = quote(query)
@@ -658,11 +504,11 @@ def scrape_levis(query):
     try:
         driver.get(url)
         
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 15)
+        # Wait for the product grid to render
+        wait_until_ready(driver, "Levi's", timeout=15)
         
         # Shopify lazy loading scroll (different approach than H&M)
-        shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2)
+        shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2, target_count=max_results, query=query)
         
         soup = BeautifulSoup(driver.page_source, "html.parser")
         
@@ -769,7 +615,9 @@ def scrape_levis(query):
         
         print(f"Processing {min(len(items), 25)} products...")
         
-        for idx, item in enumerate(items[:25]):
+        for idx, item in enumerate(items[:max_results]):
+            if deadline_reached('extract'):
+                break
             try:
                 title = extract_levis_title(item, idx)
                 
@@ -845,7 +693,7 @@ def scrape_levis(query):
             pass
     
     finally:
-        driver.quit()
+        checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = "Levi's"
@@ -872,31 +720,18 @@ def extract_levis_title(item, item_index):
     print(f"Could not find title for item {item_index + 1}, generating placeholder.")
     return f"Levi's Product {item_index + 1}"
 
-def shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2):
+def shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2, target_count=None, query=None):
     """
     Shopify-specific scrolling function
     Shopify sites often load content differently than other platforms
     """
     print("Starting Shopify lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    
-    for i in range(max_scrolls):
-        scroll_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-        time.sleep(scroll_pause)
-        
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height and i > max_scrolls - 3:
-            print("No new content loading, finishing scroll...")
-            break
-        else:
-            last_height = new_height
-        
-        print(f"Shopify scroll {i+1}/{max_scrolls}")
-    
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
+    scroll_page(
+        driver, max_steps=max_scrolls, step_timeout=scroll_pause, patience=3,
+        final_passes=('bottom',), target_count=target_count,
+        target_selector=site_card_selector("Levi's"), label="Shopify", site="Levi's", query=query
+    )
     
     print("Shopify scrolling complete")
 
@@ -998,11 +833,11 @@ def debug_levis_structure(driver, item_index=0):
         
 
 
-def scrape_urbanic(query):
+def scrape_urbanic(query, max_results=15):
     """
     Enhanced Urbanic scraper targeting specific class structure
     """
-    driver = get_driver()
+    driver = checkout_driver('Urbanic')
     
     # Urbanic India search URL structure
     clean_query = query.replace(' ', '').lower()
@@ -1014,34 +849,22 @@ def scrape_urbanic(query):
     try:
         driver.get(url)
         
-        # Wait for React app to load
-        wait = WebDriverWait(driver, 30)
+        # Wait for the React app to render product cards
         print("Waiting for Urbanic React app to load...")
-        time.sleep(10)
-        
-        # Wait specifically for product cards
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 
-                "a[class*='index-module_verticalCard'], a[class*='verticalCard']")))
-            print("Product cards found!")
-        except:
-            print("Product cards not found, continuing anyway...")
+        wait_until_ready(driver, 'Urbanic', timeout=30)
         
         # Enhanced scrolling to load more products
-        enhanced_urbanic_targeted_scroll(driver, max_scrolls=25, scroll_pause=3)
+        enhanced_urbanic_targeted_scroll(driver, max_scrolls=25, scroll_pause=3, target_count=max_results, query=query)
         
-        # Force load all images
-        force_urbanic_targeted_loading(driver)
+        # Wait until the product count stops changing
+        wait_for_site_settled(driver, 'Urbanic', timeout=8)
         
-        # Additional wait
-        time.sleep(8)
-        
-        # Debug and extract products
-        print("\n=== DEBUGGING URBANIC TARGETED STRUCTURE ===")
-        debug_urbanic_targeted_structure(driver)
+        if DEBUG_STRUCTURE:
+            print("\n=== DEBUGGING URBANIC TARGETED STRUCTURE ===")
+            debug_urbanic_targeted_structure(driver)
         
         # Extract products using targeted approach
-        html_products = extract_urbanic_targeted_products(driver)
+        html_products = extract_urbanic_targeted_products(driver, max_results)
         
         print(f"Found {len(html_products)} products from targeted extraction")
         
@@ -1087,112 +910,27 @@ def scrape_urbanic(query):
             pass
     
     finally:
-        driver.quit()
+        checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'Urbanic'
     return df
 
 
-def enhanced_urbanic_targeted_scroll(driver, max_scrolls=25, scroll_pause=3):
+def enhanced_urbanic_targeted_scroll(driver, max_scrolls=25, scroll_pause=3, target_count=None, query=None):
     """
     Targeted scrolling for Urbanic to load product cards
     """
     print("Starting targeted Urbanic scrolling...")
     
-    last_product_count = 0
-    no_change_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll to bottom
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(scroll_pause)
-        
-        # Count product cards specifically
-        js_count_script = """
-            const productCards = document.querySelectorAll(
-                'a[class*="index-module_verticalCard"], a[class*="verticalCard"]'
-            );
-            return productCards.length;
-        """
-        
-        current_product_count = driver.execute_script(js_count_script)
-        
-        if current_product_count > last_product_count:
-            last_product_count = current_product_count
-            no_change_count = 0
-            print(f"Scroll {i+1}/{max_scrolls}: {current_product_count} product cards found")
-        else:
-            no_change_count += 1
-            print(f"Scroll {i+1}/{max_scrolls}: No new products ({no_change_count}/5)")
-        
-        # Stop if no new products for 5 consecutive scrolls
-        if no_change_count >= 5:
-            print("No new products detected, stopping scroll...")
-            break
+    # Jump to the bottom each step; stop after 5 steps without new product cards
+    summary = scroll_page(
+        driver, card_selector='a[class*="index-module_verticalCard"], a[class*="verticalCard"]',
+        max_steps=max_scrolls, step_timeout=scroll_pause, mode='bottom', stop='cards',
+        final_passes=(), target_count=target_count, label="Urbanic", site='Urbanic', query=query
+    )
     
-    print(f"Targeted scrolling complete. Total products found: {last_product_count}")
-
-
-def force_urbanic_targeted_loading(driver):
-    """
-    Force load images in product cards
-    """
-    try:
-        print("Forcing targeted image loading...")
-        
-        js_image_loading = """
-            console.log('Starting targeted image loading...');
-            
-            // Find all product cards
-            const productCards = document.querySelectorAll(
-                'a[class*="index-module_verticalCard"], a[class*="verticalCard"]'
-            );
-            
-            console.log('Found', productCards.length, 'product cards');
-            
-            let processedImages = 0;
-            productCards.forEach((card, cardIndex) => {
-                try {
-                    // Find image container within the card
-                    const imageContainer = card.querySelector('div[class*="ub-image"], div[class*="index-module_image"]');
-                    if (imageContainer) {
-                        const images = imageContainer.querySelectorAll('img');
-                        images.forEach((img) => {
-                            try {
-                                // Scroll image into view
-                                img.scrollIntoView({behavior: 'auto', block: 'nearest'});
-                                
-                                // Trigger loading events
-                                img.dispatchEvent(new Event('load'));
-                                img.dispatchEvent(new Event('appear'));
-                                
-                                // Handle lazy loading attributes
-                                if (img.dataset.src && !img.src.includes(img.dataset.src)) {
-                                    img.src = img.dataset.src;
-                                }
-                                
-                                processedImages++;
-                            } catch(e) {
-                                console.log('Error processing image:', e);
-                            }
-                        });
-                    }
-                } catch(e) {
-                    console.log('Error processing card', cardIndex, ':', e);
-                }
-            });
-            
-            console.log('Processed', processedImages, 'images in product cards');
-            return processedImages;
-        """
-        
-        processed_images = driver.execute_script(js_image_loading)
-        print(f"Processed {processed_images} images in product cards")
-        time.sleep(3)
-        
-    except Exception as e:
-        print(f"Error in targeted image loading: {e}")
+    print(f"Targeted scrolling complete. Total products found: {summary['cards']}")
 
 
 def debug_urbanic_targeted_structure(driver):
@@ -1272,54 +1010,83 @@ def debug_urbanic_targeted_structure(driver):
         print(f"Error in targeted debug: {e}")
 
 
-def extract_urbanic_targeted_products(driver):
+# Every Urbanic product card in one execute_script: the selector matching the
+# most cards wins, and each card comes back as {href, text, image}
+URBANIC_CARDS_SCRIPT = RESOLVE_IMAGE_FUNCTION + """
+    const [cardSelectors, containerSelectors, maxResults, resolverArgs] = arguments;
+    let cards = [], usedSelector = null;
+    for (const selector of cardSelectors) {
+        const found = document.querySelectorAll(selector);
+        if (found.length > cards.length) { cards = found; usedSelector = selector; }
+    }
+    const cardImage = card => {
+        // The first container of each kind, then any image in the card
+        for (const selector of containerSelectors) {
+            const container = card.querySelector(selector);
+            const src = container && resolveImage(container, ...resolverArgs);
+            if (src && src.length > 10) return src;
+        }
+        const src = resolveImage(card, ...resolverArgs);
+        return src && src.length > 10 ? src : null;
+    };
+    return {
+        selector: usedSelector,
+        total: cards.length,
+        cards: Array.from(cards).slice(0, maxResults).map(card => ({
+            href: card.href || card.getAttribute('href'),
+            text: card.innerText,
+            image: cardImage(card)
+        }))
+    };
+"""
+
+URBANIC_CARD_SELECTORS = [
+    'a[class*="index-module_verticalCard"]',
+    'a[class*="verticalCard"]',
+    'a.index-module_verticalCard__zl8sA'
+]
+
+URBANIC_IMAGE_CONTAINER_SELECTORS = [
+    'div[class*="ub-image"]',
+    'div[class*="index-module_image"]',
+    'div.ub-image.index-module_image__7icpD',
+    'div[class*="image"]'
+]
+
+
+def extract_urbanic_targeted_products(driver, max_results=15):
     """
-    Extract products using the exact class structure identified
+    Extract products using the exact class structure identified. The cards'
+    links, text and images are read in one round trip; titles and prices are
+    then parsed from the text here.
     """
     products = []
     print("\n=== STARTING TARGETED PRODUCT EXTRACTION ===")
     
     try:
-        # Target the specific product card classes
-        product_card_selectors = [
-            'a[class*="index-module_verticalCard"]',
-            'a[class*="verticalCard"]',
-            'a.index-module_verticalCard__zl8sA'
-        ]
-        
-        product_cards = []
-        used_selector = None
-        
-        # Find the selector that works
-        for selector in product_card_selectors:
-            try:
-                cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                if len(cards) > len(product_cards):
-                    product_cards = cards
-                    used_selector = selector
-            except:
-                continue
+        result = driver.execute_script(URBANIC_CARDS_SCRIPT, URBANIC_CARD_SELECTORS,
+                                       URBANIC_IMAGE_CONTAINER_SELECTORS, max_results,
+                                       image_resolver_arguments())
         
-        print(f"Using selector: {used_selector}")
-        print(f"Found {len(product_cards)} product cards")
+        print(f"Using selector: {result['selector']}")
+        print(f"Found {result['total']} product cards")
         
         # Extract data from each product card
-        for i, card in enumerate(product_cards[:15]):  # Limit to first 20
+        for i, card in enumerate(result['cards']):
+            if deadline_reached('extract'):
+                break
             try:
-                print(f"Processing product card {i+1}...")
-                
                 # Extract link (href of the card)
-                link = card.get_attribute('href') or "#"
+                link = card['href'] or "#"
                 if link.startswith('/'):
                     link = 'https://in.urbanic.com' + link
                 
                 # Extract title and price from card text
-                card_text = card.text.strip()
+                card_text = (card['text'] or '').strip()
                 title = extract_title_from_text(card_text)
                 price = extract_price_from_text(card_text)
                 
-                # Extract image from image container
-                image = extract_image_from_card(card)
+                image = format_urbanic_image_url(card['image']) if card['image'] else "No image"
                 
                 # Create product data
                 product_data = {
@@ -1415,55 +1182,6 @@ def extract_price_from_text(text):
     return "No price"
 
 
-def extract_image_from_card(card_element):
-    """Extract image from product card"""
-    try:
-        # Look for image container with specific classes
-        image_container_selectors = [
-            'div[class*="ub-image"]',
-            'div[class*="index-module_image"]',
-            'div.ub-image.index-module_image__7icpD',
-            'div[class*="image"]'
-        ]
-        
-        for selector in image_container_selectors:
-            try:
-                image_containers = card_element.find_elements(By.CSS_SELECTOR, selector)
-                if image_containers:
-                    container = image_containers[0]
-                    
-                    # Find images within the container
-                    images = container.find_elements(By.TAG_NAME, 'img')
-                    for img in images:
-                        src = img.get_attribute('src')
-                        if src and len(src) > 10:
-                            # Skip placeholder images
-                            if any(skip in src.lower() for skip in ['placeholder', 'blank', 'loading']):
-                                continue
-                            
-                            return format_urbanic_image_url(src)
-                        
-                        # Check data attributes for lazy loading
-                        for attr in ['data-src', 'data-original']:
-                            data_src = img.get_attribute(attr)
-                            if data_src and len(data_src) > 10:
-                                return format_urbanic_image_url(data_src)
-            except:
-                continue
-        
-        # Fallback: look for any image in the card
-        all_images = card_element.find_elements(By.TAG_NAME, 'img')
-        for img in all_images:
-            src = img.get_attribute('src')
-            if src and len(src) > 10:
-                return format_urbanic_image_url(src)
-    
-    except Exception as e:
-        print(f"Error extracting image: {e}")
-    
-    return "No image"
-
-
 def format_urbanic_image_url(url):
     """Format image URL to ensure it's complete"""
     if not url:
@@ -1,27 +1,20 @@
 import pandas as pd
-import time
 import re
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import re
-
-def get_driver():
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--log-level=3")
-    return webdriver.Chrome(options=options)
+from driver_pool import checkout_driver, checkin_driver
+from scroll_engine import scroll_page, site_card_selector
+from deadlines import deadline_reached
+from parse_pool import DEBUG_STRUCTURE, parse_and_extract
+from network_capture import captured_products, start_capture
+from pagination import fetch_pages, merge_pages, page_urls, product_key
+from fetch_strategy import HttpPathFailed, fetch_unblocked_html, record_http_result, should_try_http, try_http
+from waits import wait_until_ready, wait_for_site_settled
+from lazy_images import resolve_image_url
 
 def clean_price(price_text):
     """Extracts numeric value from price string, returns 'No price' if not found."""
@@ -30,30 +23,37 @@ def clean_price(price_text):
     cleaned = re.sub(r'[^\d.]', '', price_text.replace(',', ''))
     return cleaned if cleaned else "No price"
 
-def scroll_page_fully(driver, scroll_times=8, wait_sec=2.5):
+def scroll_page_fully(driver, scroll_times=8, wait_sec=2.5, target_count=None, target_selector=None,
+                      site=None, query=None):
     """Scroll down to bottom to let JS/Lazy load finish."""
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    for _ in range(scroll_times):   
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        # time.sleep(wait_sec)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            print("Reached bottom of the page.")
-            break
-        last_height = new_height
+    # Jump to the bottom each step and stop as soon as the height stops growing
+    scroll_page(driver, max_steps=scroll_times, step_timeout=wait_sec, mode='bottom',
+                patience=scroll_times + 1, final_passes=(), target_count=target_count,
+                target_selector=target_selector, label=site or "Page", site=site, query=query)
     print("Scrolling complete.")
 
 
-def scrape_amazon(query):
+def scrape_amazon(query, max_results=20):
     """Scrapes product data from Amazon - keeping your working version."""
-    driver = get_driver()
+    driver = checkout_driver('Amazon')
     url = f"https://www.amazon.in/s?k={query.replace(' ', '+')}"
     print(f"Scraping Amazon URL: {url}")
-    driver.get(url) 
-    # time.sleep(3)
+    try:
+        pages = fetch_pages('Amazon', page_urls('Amazon', url, max_results), scrape_amazon_page, driver, max_results)
+    finally:
+        checkin_driver(driver)
+    products = merge_pages(pages, max_results, key=product_key)
+    return pd.DataFrame(products, columns=["Title", "Price", "Image", "Link"])
+
+def scrape_amazon_page(driver, url, page_num, max_results=20):
+    """One Amazon results page as a list of product records"""
+    records = []
+    driver.get(url)
+    wait_until_ready(driver, 'Amazon')
     products = driver.find_elements(By.XPATH, "//div[@data-component-type='s-search-result']")
-    data = {"Title": [], "Price": [], "Image": [], "Link": []}
-    for p in products[:20]:
+    for p in products[:max_results]:
+        if deadline_reached('extract'):
+            break
         try:
             # Multiple title selectors for Amazon
             title_selectors = [
@@ -72,7 +72,7 @@ def scrape_amazon(query):
                     continue
         except:
             title = "No title"
-            
+        
         try:
             price = p.find_element(By.CLASS_NAME, "a-price-whole").text
         except:
@@ -80,220 +80,247 @@ def scrape_amazon(query):
                 price = p.find_element(By.CLASS_NAME, "a-price-range").text
             except:
                 price = "No price"
-                
+            
         try:
             image = p.find_element(By.TAG_NAME, "img").get_attribute("src")
         except:
             image = "No image"
-            
+        
         try:
             link = p.find_element(By.CLASS_NAME, "a-link-normal").get_attribute("href")
         except:
             link = "#"
-            
-        data["Title"].append(title)
-        data["Price"].append(clean_price(price))
-        data["Image"].append(image)
-        data["Link"].append(link)
-    driver.quit()
-    return pd.DataFrame(data)
+        
+        records.append({"Title": title, "Price": clean_price(price), "Image": image, "Link": link})
+    return records
 
-def scrape_flipkart(query):
+def scrape_flipkart(query, max_results=40):
     """Improved Flipkart scraper with better selectors and longer wait times."""
-    driver = get_driver()
     url = f"https://www.flipkart.com/search?q={query.replace(' ', '+')}"
     print(f"Scraping Flipkart URL: {url}")
-    driver.get(url)
-    data = {"Title": [], "Price": [], "Image": [], "Link": []}
+    urls = page_urls('Flipkart', url, max_results)
+    pages = []
     
-    try:
-        # Longer wait time for Flipkart
-        wait = WebDriverWait(driver, 20)
-        # time.sleep(5)
+    # Flipkart usually renders its results server-side: try plain HTTP first
+    if should_try_http('Flipkart'):
+        try:
+            pages = fetch_pages('Flipkart', urls, scrape_flipkart_page, None, max_results)
+            record_http_result('Flipkart', bool(pages[0]), "no products in the server response")
+        except HttpPathFailed as e:
+            record_http_result('Flipkart', False, str(e))
+    
+    if not pages or not pages[0]:
+        driver = checkout_driver('Flipkart')
+        try:
+            pages = fetch_pages('Flipkart', urls, scrape_flipkart_page, driver, max_results)
+        except Exception as e:
+            print(f"Error scraping Flipkart: {e}")
+        finally:
+            checkin_driver(driver)
+        
+    products = merge_pages(pages, max_results, key=product_key)
+    return pd.DataFrame(products, columns=["Title", "Price", "Image", "Link"])
+
+def scrape_flipkart_page(driver, url, page_num, max_results=40):
+    """One Flipkart results page as a list of product records (fetched over HTTP when `driver` is None)"""
+    if driver is None:
+        html = fetch_unblocked_html(url, 'Flipkart')
+    else:
+        driver.get(url)
+        # Wait for the product grid instead of the full page load
+        wait_until_ready(driver, 'Flipkart')
         
         # Scroll to load more products
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
         # time.sleep(3)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Updated selectors for Flipkart 2024
-        product_selectors = [
-            "div[data-id]",  # Main product containers
-            "div._1AtVbE",
-            "div._13oc-S", 
+        html = driver.page_source
+    
+    return parse_and_extract(html, (extract_flipkart_products, max_results))[0]
+
+def extract_flipkart_products(soup, max_results=40):
+    """Product records from a parsed Flipkart results page"""
+    records = []
+    
+    # Updated selectors for Flipkart 2024
+    product_selectors = [
+        "div[data-id]",  # Main product containers
+        "div._1AtVbE",
+        "div._13oc-S", 
+        "div.s1Q9rs",
+        "div._4ddWXP",
+        "div.cPuFtr"  # Another common selector
+    ]
+    
+    items = []
+    for selector in product_selectors:
+        items = soup.select(selector)
+        if len(items) > 5:  # Only use if we find a reasonable number of items
+            print(f"Flipkart: Found {len(items)} items using: {selector}")
+            break
+    
+    for item in items[:max_results]:
+        if deadline_reached('extract'):
+            break
+        # Title extraction with updated selectors
+        title = "No title"
+        title_selectors = [
+            "div._4rR01T",
+            "a._1fQZEK", 
             "div.s1Q9rs",
-            "div._4ddWXP",
-            "div.cPuFtr"  # Another common selector
+            "a.s1Q9rs",
+            "div._2WkVRV",
+            "a[title]",
+            "h2 a",
+            "div.KzDlHZ"  # Updated selector
         ]
         
-        items = []
-        for selector in product_selectors:
-            items = soup.select(selector)
-            if len(items) > 5:  # Only use if we find a reasonable number of items
-                print(f"Flipkart: Found {len(items)} items using: {selector}")
-                break
-        
-        for item in items[:40]:
-            # Title extraction with updated selectors
-            title = "No title"
-            title_selectors = [
-                "div._4rR01T",
-                "a._1fQZEK", 
-                "div.s1Q9rs",
-                "a.s1Q9rs",
-                "div._2WkVRV",
-                "a[title]",
-                "h2 a",
-                "div.KzDlHZ"  # Updated selector
-            ]
-            
-            for t_sel in title_selectors:
-                try:
-                    title_elem = item.select_one(t_sel)
-                    if title_elem:
-                        title = title_elem.get_text(strip=True) or title_elem.get('title', '')
-                        if title and len(title) > 3:  # Ensure it's a meaningful title
-                            break
-                except:
-                    continue
-            
-            # Price extraction with updated selectors
-            price = "No price"
-            price_selectors = [
-                "div._30jeq3",
-                "div._25b18c", 
-                "span._30jeq3",
-                "div._1_WHN1",
-                "div.Nx9bqj",  # Updated selector
-                "div._3I9_wc",  # Another price selector
-                "span._2_R_DZ"  # Current price selector
-            ]
-            
-            for p_sel in price_selectors:
-                try:
-                    price_elem = item.select_one(p_sel)
-                    if price_elem:
-                        price_text = price_elem.get_text(strip=True)
-                        if price_text and '₹' in price_text:
-                            price = clean_price(price_text)
-                            break
-                except:
-                    continue
-            
-            # Image extraction
-            image = "No image"
+        for t_sel in title_selectors:
             try:
-                img_elem = item.select_one("img")
-                if img_elem:
-                    image = img_elem.get('src') or img_elem.get('data-src', 'No image')
+                title_elem = item.select_one(t_sel)
+                if title_elem:
+                    title = title_elem.get_text(strip=True) or title_elem.get('title', '')
+                    if title and len(title) > 3:  # Ensure it's a meaningful title
+                        break
             except:
-                pass
-            
-            # Link extraction
-            link = "#"
+                continue
+        
+        # Price extraction with updated selectors
+        price = "No price"
+        price_selectors = [
+            "div._30jeq3",
+            "div._25b18c", 
+            "span._30jeq3",
+            "div._1_WHN1",
+            "div.Nx9bqj",  # Updated selector
+            "div._3I9_wc",  # Another price selector
+            "span._2_R_DZ"  # Current price selector
+        ]
+        
+        for p_sel in price_selectors:
             try:
-                link_elem = item.select_one('a[href*="/p/"]')
-                if not link_elem:
-                    link_elem = item.select_one('a._1fQZEK')
-                if not link_elem:
-                    link_elem = item.select_one('a[href]')
-                    
-                if link_elem and link_elem.get('href'):
-                    href = link_elem['href']
-                    if href.startswith('/'):
-                        link = "https://www.flipkart.com" + href
-                    else:
-                        link = href
+                price_elem = item.select_one(p_sel)
+                if price_elem:
+                    price_text = price_elem.get_text(strip=True)
+                    if price_text and '₹' in price_text:
+                        price = clean_price(price_text)
+                        break
             except:
-                pass
-                
-            data["Title"].append(title)
-            data["Price"].append(price)
-            data["Image"].append(image)
-            data["Link"].append(link)
-
-    except Exception as e:
-        print(f"Error scraping Flipkart: {e}")
-    finally:
-        driver.quit()
+                continue
         
-    return pd.DataFrame(data)
+        # Image extraction
+        image = "No image"
+        try:
+            img_elem = item.select_one("img")
+            if img_elem:
+                image = img_elem.get('src') or img_elem.get('data-src', 'No image')
+        except:
+            pass
+        
+        # Link extraction
+        link = "#"
+        try:
+            link_elem = item.select_one('a[href*="/p/"]')
+            if not link_elem:
+                link_elem = item.select_one('a._1fQZEK')
+            if not link_elem:
+                link_elem = item.select_one('a[href]')
+                
+            if link_elem and link_elem.get('href'):
+                href = link_elem['href']
+                if href.startswith('/'):
+                    link = "https://www.flipkart.com" + href
+                else:
+                    link = href
+        except:
+            pass
+            
+        records.append({"Title": title, "Price": price, "Image": image, "Link": link})
+    return records
 
-def scrape_myntra(query):
-    driver = get_driver()
+def scrape_myntra(query, max_results=20):
+    driver = checkout_driver('Myntra')
     url = f"https://www.myntra.com/{query.replace(' ', '-')}"
     print(f"Scraping Myntra URL: {url}")
     data = {"Title": [], "Price": [], "Image": [], "Rating": [], "Link": []}
     try:
         driver.get(url)
-        scroll_page_fully(driver)
+        wait_until_ready(driver, 'Myntra')
+        scroll_page_fully(driver, target_count=max_results, target_selector="li.product-base",
+                          site='Myntra', query=query)
         
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        items = soup.find_all("li", {"class": "product-base"})
-        print(f"Found {len(items)} items on Myntra.")
-        
-        for item in items[:20]:
-            title = item.find("h4", {"class": "product-product"}).text if item.find("h4", {"class": "product-product"}) else "No title"
-            price_element = item.find("span", {"class": "product-discountedPrice"})
-            price = price_element.text.replace("Rs. ", "") if price_element else (item.find("div", {"class": "product-price"}).text.replace("Rs. ", "") if item.find("div", {"class": "product-price"}) else "No price")
-            image = item.find("img").get("src") if item.find("img") else "No image"
-            rating_element = item.find("div", {"class": "product-ratingsContainer"})
-            rating = float(rating_element.find("strong").text) if rating_element and rating_element.find("strong") else 0.0
-            link_tag = item.find("a")
-            link = f"https://www.myntra.com/{link_tag.get('href')}" if link_tag else "#"
-            
-            data["Title"].append(title)
-            data["Price"].append(price)
-            data["Image"].append(image)
-            data["Rating"].append(rating)
-            data["Link"].append(link)
+        data = parse_and_extract(driver.page_source, (extract_myntra_products, max_results))[0]
     except Exception as e:
         print(f"An error occurred while scraping Myntra: {e}")
         driver.save_screenshot("myntra_error.png")
     finally:
-        driver.quit()
+        checkin_driver(driver)
     df = pd.DataFrame(data)
     df['Source'] = 'Myntra'
     return df
 
+def extract_myntra_products(soup, max_results=20):
+    """Product data from a parsed Myntra results page"""
+    data = {"Title": [], "Price": [], "Image": [], "Rating": [], "Link": []}
+    
+    items = soup.find_all("li", {"class": "product-base"})
+    print(f"Found {len(items)} items on Myntra.")
+        
+    for item in items[:max_results]:
+        if deadline_reached('extract'):
+            break
+        title = item.find("h4", {"class": "product-product"}).text if item.find("h4", {"class": "product-product"}) else "No title"
+        price_element = item.find("span", {"class": "product-discountedPrice"})
+        price = price_element.text.replace("Rs. ", "") if price_element else (item.find("div", {"class": "product-price"}).text.replace("Rs. ", "") if item.find("div", {"class": "product-price"}) else "No price")
+        image = item.find("img").get("src") if item.find("img") else "No image"
+        rating_element = item.find("div", {"class": "product-ratingsContainer"})
+        rating = float(rating_element.find("strong").text) if rating_element and rating_element.find("strong") else 0.0
+        link_tag = item.find("a")
+        link = f"https://www.myntra.com/{link_tag.get('href')}" if link_tag else "#"
+            
+        data["Title"].append(title)
+        data["Price"].append(price)
+        data["Image"].append(image)
+        data["Rating"].append(rating)
+        data["Link"].append(link)
+    
+    return data
 
 
 
-def get_driverY():
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    return webdriver.Chrome(options=options)
 
 def clean_priceY(text):
     import re
     num = re.sub(r'[^\d.]', '', text)
     return num if num else "No price"
 
-def scrape_bewakoof(query):
-    driver = get_driverY()
+def scrape_bewakoof(query, max_results=20):
+    driver = checkout_driver('Bewakoof')
     url = f"https://www.bewakoof.com/search?q={query.replace(' ', '%20')}"
-    driver.get(url)
-    # time.sleep(5)
-
-    # Scroll to load lazy content
-    for _ in range(6):
-        driver.execute_script("window.scrollBy(0, document.body.scrollHeight);")
-        # time.sleep(2)
+    try:
+        driver.get(url)
+        wait_until_ready(driver, 'Bewakoof')
 
-    page_html = driver.page_source   # get HTML before quitting
-    driver.quit()
+        # Scroll to load lazy content
+        scroll_page(driver, card_selector='a[data-testid="product-card-link"]', max_steps=6,
+                    step_timeout=2, mode='bottom', stop='cards', patience=2,
+                    final_passes=(), target_count=max_results, label="Bewakoof",
+                    site='Bewakoof', query=query)
 
-    soup = BeautifulSoup(page_html, "html.parser")
+        page_html = driver.page_source   # get HTML before returning the driver
+    finally:
+        checkin_driver(driver)
 
+    data = parse_and_extract(page_html, (extract_bewakoof_products, max_results))[0]
+    return pd.DataFrame(data)
 
+def extract_bewakoof_products(soup, max_results=20):
+    """Product data from a parsed Bewakoof search page"""
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
-    cards = soup.select('a[data-testid="product-card-link"]')[:20]
+    cards = soup.select('a[data-testid="product-card-link"]')[:max_results]
 
     for card in cards:
+        if deadline_reached('extract'):
+            break
         # Updated selectors for Levi's Shopify theme
         title_selectors = [
             'a.product-item__title',
@@ -318,11 +345,11 @@ def scrape_bewakoof(query):
         data["Image"].append(image)
         data["Link"].append(link)
 
-    return pd.DataFrame(data)
+    return data
 
-def scrape_zara(query):
+def scrape_zara(query, max_results=20):
     """Improved Zara scraper with better image extraction for all products."""
-    driver = get_driver()
+    driver = checkout_driver('Zara')
     
     # Zara search URL format
     url = f"https://www.zara.com/in/en/search?searchTerm={query.replace(' ', '+')}"
@@ -333,272 +360,22 @@ def scrape_zara(query):
     try:
         driver.get(url)
         
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 20)
-        # time.sleep(5)
+        # Wait for the product grid instead of the full page load
+        wait_until_ready(driver, 'Zara')
         
         # More aggressive scrolling to ensure ALL images load
         print("Starting enhanced scrolling for image loading...")
         
-        # Scroll in smaller increments to trigger lazy loading
-        for i in range(15):
-            scroll_position = (i + 1) * (driver.execute_script("return document.body.scrollHeight") / 15)
-            driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-            # time.sleep(2)  # Wait for images to load
-            
-            # Check if new images are loading
-            if i % 3 == 0:
-                print(f"Scroll iteration {i+1}/15 - Loading images...")
-        
-        # Final scroll to bottom
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        # time.sleep(5)
-        
-        # Scroll back to top to ensure all content is processed
-        driver.execute_script("window.scrollTo(0, 0);")
-        # time.sleep(3)
-        
-        # Scroll down again slowly to trigger any remaining lazy loads
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        # time.sleep(3)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        # time.sleep(5)
+        # Scroll in smaller increments to trigger lazy loading, then bottom,
+        # top and back down to catch any remaining lazy loads
+        scroll_page(driver, card_selector='img[src]:not([src=""])', max_steps=15, step_timeout=2,
+                    final_passes=('bottom', 'top', 'middle', 'bottom'), target_count=max_results,
+                    target_selector=site_card_selector('Zara'), label="Zara",
+                    site='Zara', query=query)
         
         print("Enhanced scrolling complete. Extracting data...")
         
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Enhanced product selectors for Zara
-        product_selectors = [
-            "li.product-item",
-            "div.product-item", 
-            "article.product-item",
-            "div[data-productid]",
-            "li[data-productid]",
-            "div.product-grid-product",
-            "li.layout-product",
-            "div._productContainer",
-            "li._product",
-            "div.product-card",
-            "li.product-card",
-            "article[data-productid]",
-            "div.zds-item",
-            "li.zds-item"
-        ]
-        
-        items = []
-        for selector in product_selectors:
-            items = soup.select(selector)
-            if len(items) > 3:
-                print(f"Zara: Found {len(items)} items using selector: {selector}")
-                break
-        
-        # If still no items, try a more general approach
-        if not items:
-            # Look for any container that has both an image and some product-like attributes
-            all_divs = soup.find_all(['div', 'li', 'article'])
-            items = []
-            for div in all_divs:
-                if (div.find('img') and 
-                    (any(keyword in str(div.get('class', [])).lower() for keyword in ['product', 'item', 'card']) or
-                     div.get('data-productid') or
-                     (div.find('a') and div.find(['h1', 'h2', 'h3', 'h4', 'p'])))):
-                    items.append(div)
-            print(f"Zara: Found {len(items)} items using fallback method")
-        
-        print(f"Processing {min(len(items), 20)} products...")
-        
-        for idx, item in enumerate(items[:20]):
-            print(f"Processing product {idx + 1}/20...")
-            
-            # Enhanced title extraction
-            title = "No title"
-            title_selectors = [
-                "p.product-name",
-                "h2.product-name", 
-                "h3.product-name",
-                "div.product-name",
-                "span.product-name",
-                "a.product-link",
-                "h2 a",
-                "h3 a", 
-                "h4 a",
-                ".product-title",
-                "p._productName",
-                "h2._productName",
-                "a[aria-label]",
-                ".zds-product-name",
-                "[data-testid*='product-name']"
-            ]
-            
-            for t_sel in title_selectors:
-                try:
-                    title_elem = item.select_one(t_sel)
-                    if title_elem:
-                        title_text = title_elem.get_text(strip=True) or title_elem.get('aria-label', '')
-                        if title_text and len(title_text) > 3:
-                            title = title_text
-                            break
-                except:
-                    continue
-            
-            # More aggressive fallback for title
-            if title == "No title":
-                for tag in ['a', 'h1', 'h2', 'h3', 'h4', 'p', 'span']:
-                    try:
-                        elem = item.find(tag)
-                        if elem and elem.get_text(strip=True):
-                            potential_title = elem.get_text(strip=True)
-                            if 10 <= len(potential_title) <= 100 and not any(skip in potential_title.lower() 
-                                for skip in ['price', 'add to', 'size', 'color']):
-                                title = potential_title
-                                break
-                    except:
-                        continue
-            
-            # Enhanced price extraction
-            price = "No price"
-            price_selectors = [
-                "span.price",
-                "div.price",
-                "p.price",
-                "span.product-price",
-                "div.product-price",
-                "span._price",
-                "div._price",
-                "span[data-price]",
-                "div[data-price]",
-                ".price-current",
-                ".current-price",
-                ".zds-price",
-                "[data-testid*='price']",
-                ".price-sale",
-                ".money"
-            ]
-            
-            for p_sel in price_selectors:
-                try:
-                    price_elem = item.select_one(p_sel)
-                    if price_elem:
-                        price_text = price_elem.get_text(strip=True)
-                        if price_text and ('₹' in price_text or '$' in price_text or '€' in price_text or 
-                                         any(c.isdigit() for c in price_text)):
-                            price = clean_price(price_text)
-                            break
-                except:
-                    continue
-            
-            # Enhanced image extraction with multiple fallback strategies
-            image = "No image"
-            
-            # Strategy 1: Look for main product images with common patterns
-            img_selectors = [
-                "img.product-image",
-                "img.media-image",
-                "img[data-src]",
-                "img[src*='product']",
-                "img[alt*='product']", 
-                "picture img",
-                ".product-media img",
-                ".media-wrapper img",
-                "img[data-testid*='product']",
-                "img.zds-image"
-            ]
-            
-            for img_sel in img_selectors:
-                try:
-                    img_elem = item.select_one(img_sel)
-                    if img_elem:
-                        # Try multiple image source attributes
-                        img_src = (img_elem.get('data-src') or 
-                                 img_elem.get('src') or 
-                                 img_elem.get('data-original') or
-                                 img_elem.get('data-lazy-src') or
-                                 img_elem.get('data-srcset', '').split()[0] if img_elem.get('data-srcset') else None)
-                        
-                        if img_src and img_src != "No image" and len(img_src) > 10:
-                            image = img_src
-                            break
-                except:
-                    continue
-            
-            # Strategy 2: If no image found, get the first image in the item
-            if image == "No image":
-                try:
-                    all_imgs = item.find_all('img')
-                    for img in all_imgs:
-                        img_src = (img.get('data-src') or 
-                                 img.get('src') or 
-                                 img.get('data-original') or
-                                 img.get('data-lazy-src'))
-                        
-                        if (img_src and 
-                            len(img_src) > 10 and 
-                            not any(skip in img_src.lower() for skip in ['icon', 'logo', 'sprite']) and
-                            any(ext in img_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
-                            image = img_src
-                            break
-                except:
-                    pass
-            
-            # Strategy 3: Look in srcset attribute
-            if image == "No image":
-                try:
-                    img_elem = item.find('img')
-                    if img_elem and img_elem.get('srcset'):
-                        srcset = img_elem.get('srcset')
-                        # Get the first URL from srcset
-                        first_src = srcset.split(',')[0].strip().split()[0]
-                        if first_src and len(first_src) > 10:
-                            image = first_src
-                except:
-                    pass
-            
-            # Fix relative URLs
-            if image and image != "No image" and not image.startswith('http'):
-                if image.startswith('//'):
-                    image = 'https:' + image
-                elif image.startswith('/'):
-                    image = 'https://www.zara.com' + image
-                else:
-                    image = 'https://www.zara.com/' + image
-            
-            # Enhanced link extraction
-            link = "#"
-            link_selectors = [
-                'a[href*="/product/"]',
-                'a.product-link',
-                'a[data-productid]',
-                'a[href*="/p/"]',
-                'a[href]'
-            ]
-            
-            for link_sel in link_selectors:
-                try:
-                    link_elem = item.select_one(link_sel)
-                    if link_elem and link_elem.get('href'):
-                        href = link_elem['href']
-                        if href.startswith('/'):
-                            link = "https://www.zara.com" + href
-                        elif href.startswith('http'):
-                            link = href
-                        else:
-                            link = "https://www.zara.com/" + href
-                        break
-                except:
-                    continue
-            
-            # Only add if we have some meaningful data
-            if title != "No title" or price != "No price" or image != "No image":
-                data["Title"].append(title)
-                data["Price"].append(price)
-                data["Image"].append(image)
-                data["Link"].append(link)
-                
-                print(f"Product {idx + 1}: Title={title[:30]}{'...' if len(title) > 30 else ''}, "
-                      f"Price={price}, Image={'Found' if image != 'No image' else 'Not found'}")
-            else:
-                print(f"Product {idx + 1}: Skipped - insufficient data")
+        data = parse_and_extract(driver.page_source, (extract_zara_products, max_results))[0]
     
     except Exception as e:
         print(f"Error scraping Zara: {e}")
@@ -608,7 +385,7 @@ def scrape_zara(query):
             pass
     
     finally:
-        driver.quit()
+        checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'Zara'
@@ -621,15 +398,255 @@ def scrape_zara(query):
     return df
     
 
-import json
-from urllib.parse import quote
-
-def clean_price(price_text):
-    """Enhanced price cleaning function"""
-    if not price_text:
-        return "No price"
+def extract_zara_products(soup, max_results=20):
+    """Product data from a parsed Zara search page"""
+    data = {"Title": [], "Price": [], "Image": [], "Link": []}
     
-    # Remove extra whitespace and newlines
+    # Enhanced product selectors for Zara
+    product_selectors = [
+        "li.product-item",
+        "div.product-item", 
+        "article.product-item",
+        "div[data-productid]",
+        "li[data-productid]",
+        "div.product-grid-product",
+        "li.layout-product",
+        "div._productContainer",
+        "li._product",
+        "div.product-card",
+        "li.product-card",
+        "article[data-productid]",
+        "div.zds-item",
+        "li.zds-item"
+    ]
+        
+    items = []
+    for selector in product_selectors:
+        items = soup.select(selector)
+        if len(items) > 3:
+            print(f"Zara: Found {len(items)} items using selector: {selector}")
+            break
+        
+    # If still no items, try a more general approach
+    if not items:
+        # Look for any container that has both an image and some product-like attributes
+        all_divs = soup.find_all(['div', 'li', 'article'])
+        items = []
+        for div in all_divs:
+            if (div.find('img') and 
+                (any(keyword in str(div.get('class', [])).lower() for keyword in ['product', 'item', 'card']) or
+                 div.get('data-productid') or
+                 (div.find('a') and div.find(['h1', 'h2', 'h3', 'h4', 'p'])))):
+                items.append(div)
+        print(f"Zara: Found {len(items)} items using fallback method")
+        
+    print(f"Processing {min(len(items), 20)} products...")
+        
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
+        print(f"Processing product {idx + 1}/20...")
+            
+        # Enhanced title extraction
+        title = "No title"
+        title_selectors = [
+            "p.product-name",
+            "h2.product-name", 
+            "h3.product-name",
+            "div.product-name",
+            "span.product-name",
+            "a.product-link",
+            "h2 a",
+            "h3 a", 
+            "h4 a",
+            ".product-title",
+            "p._productName",
+            "h2._productName",
+            "a[aria-label]",
+            ".zds-product-name",
+            "[data-testid*='product-name']"
+        ]
+            
+        for t_sel in title_selectors:
+            try:
+                title_elem = item.select_one(t_sel)
+                if title_elem:
+                    title_text = title_elem.get_text(strip=True) or title_elem.get('aria-label', '')
+                    if title_text and len(title_text) > 3:
+                        title = title_text
+                        break
+            except:
+                continue
+            
+        # More aggressive fallback for title
+        if title == "No title":
+            for tag in ['a', 'h1', 'h2', 'h3', 'h4', 'p', 'span']:
+                try:
+                    elem = item.find(tag)
+                    if elem and elem.get_text(strip=True):
+                        potential_title = elem.get_text(strip=True)
+                        if 10 <= len(potential_title) <= 100 and not any(skip in potential_title.lower() 
+                            for skip in ['price', 'add to', 'size', 'color']):
+                            title = potential_title
+                            break
+                except:
+                    continue
+            
+        # Enhanced price extraction
+        price = "No price"
+        price_selectors = [
+            "span.price",
+            "div.price",
+            "p.price",
+            "span.product-price",
+            "div.product-price",
+            "span._price",
+            "div._price",
+            "span[data-price]",
+            "div[data-price]",
+            ".price-current",
+            ".current-price",
+            ".zds-price",
+            "[data-testid*='price']",
+            ".price-sale",
+            ".money"
+        ]
+            
+        for p_sel in price_selectors:
+            try:
+                price_elem = item.select_one(p_sel)
+                if price_elem:
+                    price_text = price_elem.get_text(strip=True)
+                    if price_text and ('₹' in price_text or '$' in price_text or '€' in price_text or 
+                                     any(c.isdigit() for c in price_text)):
+                        price = clean_price(price_text)
+                        break
+            except:
+                continue
+            
+        # Enhanced image extraction with multiple fallback strategies
+        image = "No image"
+            
+        # Strategy 1: Look for main product images with common patterns
+        img_selectors = [
+            "img.product-image",
+            "img.media-image",
+            "img[data-src]",
+            "img[src*='product']",
+            "img[alt*='product']", 
+            "picture img",
+            ".product-media img",
+            ".media-wrapper img",
+            "img[data-testid*='product']",
+            "img.zds-image"
+        ]
+            
+        for img_sel in img_selectors:
+            try:
+                img_elem = item.select_one(img_sel)
+                if img_elem:
+                    # Try multiple image source attributes
+                    img_src = (img_elem.get('data-src') or 
+                             img_elem.get('src') or 
+                             img_elem.get('data-original') or
+                             img_elem.get('data-lazy-src') or
+                             img_elem.get('data-srcset', '').split()[0] if img_elem.get('data-srcset') else None)
+                        
+                    if img_src and img_src != "No image" and len(img_src) > 10:
+                        image = img_src
+                        break
+            except:
+                continue
+            
+        # Strategy 2: If no image found, get the first image in the item
+        if image == "No image":
+            try:
+                all_imgs = item.find_all('img')
+                for img in all_imgs:
+                    img_src = (img.get('data-src') or 
+                             img.get('src') or 
+                             img.get('data-original') or
+                             img.get('data-lazy-src'))
+                        
+                    if (img_src and 
+                        len(img_src) > 10 and 
+                        not any(skip in img_src.lower() for skip in ['icon', 'logo', 'sprite']) and
+                        any(ext in img_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
+                        image = img_src
+                        break
+            except:
+                pass
+            
+        # Strategy 3: Look in srcset attribute
+        if image == "No image":
+            try:
+                img_elem = item.find('img')
+                if img_elem and img_elem.get('srcset'):
+                    srcset = img_elem.get('srcset')
+                    # Get the first URL from srcset
+                    first_src = srcset.split(',')[0].strip().split()[0]
+                    if first_src and len(first_src) > 10:
+                        image = first_src
+            except:
+                pass
+            
+        # Fix relative URLs
+        if image and image != "No image" and not image.startswith('http'):
+            if image.startswith('//'):
+                image = 'https:' + image
+            elif image.startswith('/'):
+                image = 'https://www.zara.com' + image
+            else:
+                image = 'https://www.zara.com/' + image
+            
+        # Enhanced link extraction
+        link = "#"
+        link_selectors = [
+            'a[href*="/product/"]',
+            'a.product-link',
+            'a[data-productid]',
+            'a[href*="/p/"]',
+            'a[href]'
+        ]
+            
+        for link_sel in link_selectors:
+            try:
+                link_elem = item.select_one(link_sel)
+                if link_elem and link_elem.get('href'):
+                    href = link_elem['href']
+                    if href.startswith('/'):
+                        link = "https://www.zara.com" + href
+                    elif href.startswith('http'):
+                        link = href
+                    else:
+                        link = "https://www.zara.com/" + href
+                    break
+            except:
+                continue
+            
+        # Only add if we have some meaningful data
+        if title != "No title" or price != "No price" or image != "No image":
+            data["Title"].append(title)
+            data["Price"].append(price)
+            data["Image"].append(image)
+            data["Link"].append(link)
+                
+            print(f"Product {idx + 1}: Title={title[:30]}{'...' if len(title) > 30 else ''}, "
+                  f"Price={price}, Image={'Found' if image != 'No image' else 'Not found'}")
+        else:
+            print(f"Product {idx + 1}: Skipped - insufficient data")
+    
+    return data
+
+import json
+from urllib.parse import quote
+
+def clean_price(price_text):
+    """Enhanced price cleaning function"""
+    if not price_text:
+        return "No price"
+    
+    # Remove extra whitespace and newlines
     price_text = re.sub(r'\s+', ' ', price_text.strip())
     
     # Extract price using regex - handle multiple currencies
@@ -649,91 +666,19 @@ def clean_price(price_text):
     
     return price_text.strip() if price_text.strip() else "No price"
 
-def advanced_lazy_loading_scroll(driver, max_scrolls=15, scroll_pause=3):
+def advanced_lazy_loading_scroll(driver, max_scrolls=15, scroll_pause=3, target_count=None, query=None):
     """
     Advanced scrolling function specifically designed for H&M's lazy loading.
     Scrolls slowly and waits for images to load at each step.
     """
     print("Starting advanced lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_images_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        # time.sleep(scroll_pause)
-        
-        # Check how many images have loaded
-        images_with_src = driver.execute_script("""
-            return document.querySelectorAll('img[src]:not([src=""])').length;
-        """)
-        
-        if images_with_src > loaded_images_count:
-            loaded_images_count = images_with_src
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_images_count} images loaded")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            # Try a few more scrolls to ensure everything is loaded
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
-    
-    # Final scroll to bottom and back to top
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    # time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    # time.sleep(2)
-    
-    # Trigger any remaining lazy loads with a middle scroll
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    # time.sleep(2)
-    
-    final_images = driver.execute_script("""
-        return document.querySelectorAll('img[src]:not([src=""])').length;
-    """)
-    print(f"Advanced scrolling complete. Total images loaded: {final_images}")
-
-def force_lazy_image_loading(driver):
-    """
-    Force load lazy images by triggering their data-src to src conversion
-    """
-    try:
-        # Execute JavaScript to force load images with data-src
-        driver.execute_script("""
-            // Force load images with data-src attributes
-            const lazyImages = document.querySelectorAll('img[data-src]');
-            lazyImages.forEach(img => {
-                if (img.dataset.src && !img.src.includes(img.dataset.src)) {
-                    img.src = img.dataset.src;
-                }
-            });
-            
-            // Also try other common lazy loading patterns
-            const lazyImages2 = document.querySelectorAll('img[data-original]');
-            lazyImages2.forEach(img => {
-                if (img.dataset.original && !img.src.includes(img.dataset.original)) {
-                    img.src = img.dataset.original;
-                }
-            });
-            
-            // Force visibility check for intersection observer
-            const allImages = document.querySelectorAll('img');
-            allImages.forEach(img => {
-                img.scrollIntoView({ behavior: 'auto', block: 'center' });
-            });
-        """)
-        time.sleep(2)
-        print("Forced lazy image loading completed")
-    except Exception as e:
-        print(f"Error in forced lazy loading: {e}")
+    summary = scroll_page(
+        driver, card_selector='img[src]:not([src=""])', max_steps=max_scrolls,
+        step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('H&M'), label="H&M", site='H&M', query=query
+    )
+    print(f"Advanced scrolling complete. Total images loaded: {summary['cards']}")
 
 def extract_price_from_element(item):
     """
@@ -904,11 +849,11 @@ def debug_price_extraction(driver, item_index=0):
     except Exception as e:
         print(f"Error in debug function: {e}")
 
-def scrape_hnm(query):
+def scrape_hnm(query, max_results=25):
     """
     Enhanced H&M scraper with improved price detection and debugging
     """
-    driver = get_driver()
+    driver = checkout_driver('H&M')
     
     # H&M India search URL structure
     encoded_query = quote(query)
@@ -920,424 +865,430 @@ def scrape_hnm(query):
     try:
         driver.get(url)
         
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 20)
-        # time.sleep(5)
+        # Wait for the product grid instead of the full page load
+        wait_until_ready(driver, 'H&M')
         
         # Advanced lazy loading scroll
-        advanced_lazy_loading_scroll(driver, max_scrolls=20, scroll_pause=3)
-        
-        # Force load any remaining lazy images
-        force_lazy_image_loading(driver)
+        advanced_lazy_loading_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=max_results, query=query)
         
         # Additional wait to ensure all content is loaded
         # time.sleep(5)
         
         # Debug the first item to understand structure
-        print("\n=== DEBUGGING PRICE STRUCTURE ===")
-        debug_price_extraction(driver, item_index=0)
+        if DEBUG_STRUCTURE:
+            print("\n=== DEBUGGING PRICE STRUCTURE ===")
+            debug_price_extraction(driver, item_index=0)
         
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        data = parse_and_extract(driver.page_source, (extract_hnm_products, max_results))[0]
         
-        # Method 1: Try to extract data from __NEXT_DATA__ JSON
-        products_from_json = []
+    except Exception as e:
+        print(f"Error scraping H&M: {e}")
         try:
-            next_data_script = soup.find('script', {'id': '__NEXT_DATA__'})
-            if next_data_script:
-                json_data = json.loads(next_data_script.string)
+            driver.save_screenshot("hm_error.png")
+        except:
+            pass
+    
+    finally:
+        checkin_driver(driver)
+    
+    df = pd.DataFrame(data)
+    df['Source'] = 'H&M'
+    return df
+
+
+
+def extract_hnm_products(soup, max_results=25):
+    """Product data from a parsed H&M search page (__NEXT_DATA__ JSON first, then the product grid)"""
+    data = {"Title": [], "Price": [], "Image": [], "Link": []}
+    
+    # Method 1: Try to extract data from __NEXT_DATA__ JSON
+    products_from_json = []
+    try:
+        next_data_script = soup.find('script', {'id': '__NEXT_DATA__'})
+        if next_data_script:
+            json_data = json.loads(next_data_script.string)
                 
-                # Try different JSON paths where products might be stored
-                possible_paths = [
-                    ['props', 'pageProps', 'searchResults', 'products'],
-                    ['props', 'pageProps', 'products'],
-                    ['props', 'initialProps', 'searchResults', 'products'],
-                    ['props', 'pageProps', 'searchResults', 'results'],
-                    ['props', 'pageProps', 'plpResults', 'products'],
-                    ['props', 'pageProps', 'productListPage', 'products'],
-                    ['props', 'pageProps', 'category', 'products']
-                ]
+            # Try different JSON paths where products might be stored
+            possible_paths = [
+                ['props', 'pageProps', 'searchResults', 'products'],
+                ['props', 'pageProps', 'products'],
+                ['props', 'initialProps', 'searchResults', 'products'],
+                ['props', 'pageProps', 'searchResults', 'results'],
+                ['props', 'pageProps', 'plpResults', 'products'],
+                ['props', 'pageProps', 'productListPage', 'products'],
+                ['props', 'pageProps', 'category', 'products']
+            ]
                 
-                for path in possible_paths:
-                    try:
-                        temp_data = json_data
-                        for key in path:
-                            temp_data = temp_data[key]
-                        if temp_data and isinstance(temp_data, list) and len(temp_data) > 0:
-                            products_data = temp_data
-                            print(f"Found {len(products_data)} products in JSON path: {' -> '.join(path)}")
+            for path in possible_paths:
+                try:
+                    temp_data = json_data
+                    for key in path:
+                        temp_data = temp_data[key]
+                    if temp_data and isinstance(temp_data, list) and len(temp_data) > 0:
+                        products_data = temp_data
+                        print(f"Found {len(products_data)} products in JSON path: {' -> '.join(path)}")
                             
-                            for product in products_data:
-                                try:
-                                    title = product.get('title', product.get('name', product.get('productName', 'No title')))
+                        for product in products_data:
+                            try:
+                                title = product.get('title', product.get('name', product.get('productName', 'No title')))
                                     
-                                    # Enhanced price extraction from JSON with more fields
-                                    price = "No price"
-                                    price_fields = [
-                                        'price', 'priceValue', 'currentPrice', 'sellingPrice', 
-                                        'displayPrice', 'formattedPrice', 'listPrice', 'retailPrice',
-                                        'whitePrice', 'redPrice', 'originalPrice', 'salePrice'
-                                    ]
+                                # Enhanced price extraction from JSON with more fields
+                                price = "No price"
+                                price_fields = [
+                                    'price', 'priceValue', 'currentPrice', 'sellingPrice', 
+                                    'displayPrice', 'formattedPrice', 'listPrice', 'retailPrice',
+                                    'whitePrice', 'redPrice', 'originalPrice', 'salePrice'
+                                ]
                                     
-                                    for field in price_fields:
-                                        if field in product:
-                                            price_data = product[field]
-                                            if isinstance(price_data, dict):
-                                                # Try different keys within the price object
-                                                price_keys = ['value', 'current', 'price', 'amount', 'display', 'formatted']
-                                                for key in price_keys:
-                                                    if key in price_data and price_data[key]:
-                                                        price = clean_price(str(price_data[key]))
-                                                        if price != "No price":
-                                                            break
-                                                if price != "No price":
-                                                    break
-                                            elif isinstance(price_data, (str, int, float)):
-                                                price = clean_price(str(price_data))
-                                                if price != "No price":
-                                                    break
+                                for field in price_fields:
+                                    if field in product:
+                                        price_data = product[field]
+                                        if isinstance(price_data, dict):
+                                            # Try different keys within the price object
+                                            price_keys = ['value', 'current', 'price', 'amount', 'display', 'formatted']
+                                            for key in price_keys:
+                                                if key in price_data and price_data[key]:
+                                                    price = clean_price(str(price_data[key]))
+                                                    if price != "No price":
+                                                        break
+                                            if price != "No price":
+                                                break
+                                        elif isinstance(price_data, (str, int, float)):
+                                            price = clean_price(str(price_data))
+                                            if price != "No price":
+                                                break
                                     
-                                    # Enhanced image extraction from JSON
-                                    image = "No image"
-                                    image_fields = ['images', 'image', 'mainImage', 'defaultImage', 'thumbnail']
-                                    for field in image_fields:
-                                        if field in product:
-                                            img_data = product[field]
-                                            if isinstance(img_data, list) and img_data:
-                                                img_obj = img_data[0]
-                                                if isinstance(img_obj, dict):
-                                                    image = (img_obj.get('url') or 
-                                                           img_obj.get('src') or 
-                                                           img_obj.get('href'))
-                                                else:
-                                                    image = str(img_obj)
-                                                if image and image != "No image":
-                                                    break
-                                            elif isinstance(img_data, str):
-                                                image = img_data
+                                # Enhanced image extraction from JSON
+                                image = "No image"
+                                image_fields = ['images', 'image', 'mainImage', 'defaultImage', 'thumbnail']
+                                for field in image_fields:
+                                    if field in product:
+                                        img_data = product[field]
+                                        if isinstance(img_data, list) and img_data:
+                                            img_obj = img_data[0]
+                                            if isinstance(img_obj, dict):
+                                                image = (img_obj.get('url') or 
+                                                       img_obj.get('src') or 
+                                                       img_obj.get('href'))
+                                            else:
+                                                image = str(img_obj)
+                                            if image and image != "No image":
                                                 break
+                                        elif isinstance(img_data, str):
+                                            image = img_data
+                                            break
                                     
-                                    # Fix image URLs
-                                    if image and image != "No image" and not image.startswith('http'):
-                                        if image.startswith('//'):
-                                            image = 'https:' + image
-                                        elif image.startswith('/'):
-                                            image = 'https://www2.hm.com' + image
+                                # Fix image URLs
+                                if image and image != "No image" and not image.startswith('http'):
+                                    if image.startswith('//'):
+                                        image = 'https:' + image
+                                    elif image.startswith('/'):
+                                        image = 'https://www2.hm.com' + image
                                     
-                                    # Link extraction from JSON
-                                    link = "#"
-                                    link_fields = ['url', 'link', 'href', 'productUrl']
-                                    for field in link_fields:
-                                        if field in product and product[field]:
-                                            link = product[field]
-                                            break
+                                # Link extraction from JSON
+                                link = "#"
+                                link_fields = ['url', 'link', 'href', 'productUrl']
+                                for field in link_fields:
+                                    if field in product and product[field]:
+                                        link = product[field]
+                                        break
                                     
-                                    if link == "#" and ('articleNumber' in product or 'id' in product or 'productId' in product):
-                                        product_id = (product.get('articleNumber') or 
-                                                    product.get('id') or 
-                                                    product.get('productId'))
-                                        if product_id:
-                                            link = f"https://www2.hm.com/en_in/productpage.{product_id}.html"
+                                if link == "#" and ('articleNumber' in product or 'id' in product or 'productId' in product):
+                                    product_id = (product.get('articleNumber') or 
+                                                product.get('id') or 
+                                                product.get('productId'))
+                                    if product_id:
+                                        link = f"https://www2.hm.com/en_in/productpage.{product_id}.html"
                                     
-                                    # Fix relative URLs
-                                    if link and link != "#" and not link.startswith('http'):
-                                        if link.startswith('/'):
-                                            link = 'https://www2.hm.com' + link
-                                        else:
-                                            link = 'https://www2.hm.com/' + link
+                                # Fix relative URLs
+                                if link and link != "#" and not link.startswith('http'):
+                                    if link.startswith('/'):
+                                        link = 'https://www2.hm.com' + link
+                                    else:
+                                        link = 'https://www2.hm.com/' + link
                                     
-                                    products_from_json.append({
-                                        'title': title,
-                                        'price': price,
-                                        'image': image,
-                                        'link': link
-                                    })
+                                products_from_json.append({
+                                    'title': title,
+                                    'price': price,
+                                    'image': image,
+                                    'link': link
+                                })
                                     
-                                except Exception as e:
-                                    print(f"Error processing JSON product: {e}")
-                                    continue
-                            break
-                    except (KeyError, TypeError):
-                        continue
+                            except Exception as e:
+                                print(f"Error processing JSON product: {e}")
+                                continue
+                        break
+                except (KeyError, TypeError):
+                    continue
                         
-        except Exception as e:
-            print(f"Error extracting from JSON: {e}")
+    except Exception as e:
+        print(f"Error extracting from JSON: {e}")
         
-        # Method 2: Enhanced HTML parsing with improved price extraction
-        html_products = []
+    # Method 2: Enhanced HTML parsing with improved price extraction
+    html_products = []
         
-        print("\n=== STARTING HTML PARSING ===")
+    print("\n=== STARTING HTML PARSING ===")
         
-        # Enhanced H&M product selectors
-        product_selectors = [
-            'article.hm-product-item',
-            'div.product-item',
-            'li.product-item', 
-            'article[data-articlecode]',
-            'div[data-articlecode]',
-            'li[data-articlecode]',
-            'article.product-tile',
-            'div.product-tile',
-            'li.product-tile',
-            'article.plp-product-item',
-            'div.item-product',
-            'li.item-product',
-            'div.product-card',
-            'article.product-card',
-            'li[data-product-id]',
-            'div[data-product-id]',
-            'article[data-product-id]',
-            'div.js-product-tile',
-            'li.js-product-tile'
-        ]
+    # Enhanced H&M product selectors
+    product_selectors = [
+        'article.hm-product-item',
+        'div.product-item',
+        'li.product-item', 
+        'article[data-articlecode]',
+        'div[data-articlecode]',
+        'li[data-articlecode]',
+        'article.product-tile',
+        'div.product-tile',
+        'li.product-tile',
+        'article.plp-product-item',
+        'div.item-product',
+        'li.item-product',
+        'div.product-card',
+        'article.product-card',
+        'li[data-product-id]',
+        'div[data-product-id]',
+        'article[data-product-id]',
+        'div.js-product-tile',
+        'li.js-product-tile'
+    ]
         
-        items = []
-        for selector in product_selectors:
-            items = soup.select(selector)
-            if len(items) > 3:
-                print(f"H&M: Found {len(items)} items using selector: {selector}")
-                break
+    items = []
+    for selector in product_selectors:
+        items = soup.select(selector)
+        if len(items) > 3:
+            print(f"H&M: Found {len(items)} items using selector: {selector}")
+            break
         
-        # If no specific selectors work, try a more general approach
-        if not items:
-            print("Trying fallback selectors...")
-            potential_items = soup.find_all(['article', 'div', 'li'])
-            items = []
-            for item in potential_items:
-                if (item.find('img') and 
-                    (item.find('a') or item.find(['h1', 'h2', 'h3', 'h4'])) and
-                    (any(cls for cls in item.get('class', []) if 'product' in cls.lower()) or
-                     item.get('data-articlecode') or
-                     item.get('data-product-id'))):
-                    items.append(item)
-            print(f"Found {len(items)} items using fallback method")
+    # If no specific selectors work, try a more general approach
+    if not items:
+        print("Trying fallback selectors...")
+        potential_items = soup.find_all(['article', 'div', 'li'])
+        items = []
+        for item in potential_items:
+            if (item.find('img') and 
+                (item.find('a') or item.find(['h1', 'h2', 'h3', 'h4'])) and
+                (any(cls for cls in item.get('class', []) if 'product' in cls.lower()) or
+                 item.get('data-articlecode') or
+                 item.get('data-product-id'))):
+                items.append(item)
+        print(f"Found {len(items)} items using fallback method")
         
-        print(f"Processing {min(len(items), 25)} products...")
+    print(f"Processing {min(len(items), 25)} products...")
         
-        for idx, item in enumerate(items[:25]):
-            try:
-                # Enhanced title extraction (keeping existing logic)
-                title = "No title"
-                title_selectors = [
-                    'h3.item-heading a',
-                    'h3.item-heading',
-                    'h2.product-item-headline a',
-                    'h2.product-item-headline',
-                    'a.item-link',
-                    'h3 a[data-name]',
-                    'h3[data-name]',
-                    'a.link',
-                    '.item-details h3',
-                    '.product-title',
-                    'h3.pdp-product-name',
-                    '.item-heading-text',
-                    'h4.item-heading',
-                    'span.item-heading',
-                    'div.item-heading',
-                    'a[title]',
-                    'h2 a',
-                    'h3 a',
-                    'h4 a'
-                ]
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
+        try:
+            # Enhanced title extraction (keeping existing logic)
+            title = "No title"
+            title_selectors = [
+                'h3.item-heading a',
+                'h3.item-heading',
+                'h2.product-item-headline a',
+                'h2.product-item-headline',
+                'a.item-link',
+                'h3 a[data-name]',
+                'h3[data-name]',
+                'a.link',
+                '.item-details h3',
+                '.product-title',
+                'h3.pdp-product-name',
+                '.item-heading-text',
+                'h4.item-heading',
+                'span.item-heading',
+                'div.item-heading',
+                'a[title]',
+                'h2 a',
+                'h3 a',
+                'h4 a'
+            ]
+                
+            for t_sel in title_selectors:
+                try:
+                    title_elem = item.select_one(t_sel)
+                    if title_elem:
+                        title_text = (title_elem.get_text(strip=True) or 
+                                    title_elem.get('data-name', '') or
+                                    title_elem.get('title', '') or
+                                    title_elem.get('alt', ''))
+                        if title_text and len(title_text) > 3:
+                            title = title_text
+                            break
+                except:
+                    continue
                 
-                for t_sel in title_selectors:
+            # If still no title, try more aggressive extraction
+            if title == "No title":
+                for tag in ['a', 'h1', 'h2', 'h3', 'h4', 'span', 'div']:
                     try:
-                        title_elem = item.select_one(t_sel)
-                        if title_elem:
-                            title_text = (title_elem.get_text(strip=True) or 
-                                        title_elem.get('data-name', '') or
-                                        title_elem.get('title', '') or
-                                        title_elem.get('alt', ''))
-                            if title_text and len(title_text) > 3:
-                                title = title_text
+                        elem = item.find(tag)
+                        if elem:
+                            text = elem.get_text(strip=True)
+                            if (text and 10 <= len(text) <= 100 and 
+                                not any(skip in text.lower() for skip in 
+                                       ['price', '₹', '$', 'add to', 'size', 'color', 'sale', 'new'])):
+                                title = text
                                 break
                     except:
                         continue
                 
-                # If still no title, try more aggressive extraction
-                if title == "No title":
-                    for tag in ['a', 'h1', 'h2', 'h3', 'h4', 'span', 'div']:
-                        try:
-                            elem = item.find(tag)
-                            if elem:
-                                text = elem.get_text(strip=True)
-                                if (text and 10 <= len(text) <= 100 and 
-                                    not any(skip in text.lower() for skip in 
-                                           ['price', '₹', '$', 'add to', 'size', 'color', 'sale', 'new'])):
-                                    title = text
-                                    break
-                        except:
-                            continue
+            # IMPROVED PRICE EXTRACTION
+            print(f"\n--- Processing item {idx + 1}: {title[:30]}... ---")
+            price = extract_price_from_element(item)
                 
-                # IMPROVED PRICE EXTRACTION
-                print(f"\n--- Processing item {idx + 1}: {title[:30]}... ---")
-                price = extract_price_from_element(item)
+            # Enhanced image extraction (keeping existing logic)
+            image = "No image"
                 
-                # Enhanced image extraction (keeping existing logic)
-                image = "No image"
+            # Strategy 1: Look for images with actual src (loaded images)
+            try:
+                imgs = item.find_all('img')
+                for img in imgs:
+                    src = img.get('src', '')
+                    if (src and len(src) > 10 and 
+                        not any(skip in src.lower() for skip in ['placeholder', 'blank', 'loading']) and
+                        any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
+                        image = src
+                        break
+            except:
+                pass
                 
-                # Strategy 1: Look for images with actual src (loaded images)
+            # Strategy 2: Look for data-src attributes (lazy loaded)
+            if image == "No image":
                 try:
                     imgs = item.find_all('img')
                     for img in imgs:
-                        src = img.get('src', '')
-                        if (src and len(src) > 10 and 
-                            not any(skip in src.lower() for skip in ['placeholder', 'blank', 'loading']) and
-                            any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
-                            image = src
+                        data_src = (img.get('data-src') or 
+                                  img.get('data-original') or 
+                                  img.get('data-lazy-src'))
+                        if (data_src and len(data_src) > 10 and
+                            any(ext in data_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
+                            image = data_src
                             break
                 except:
                     pass
                 
-                # Strategy 2: Look for data-src attributes (lazy loaded)
-                if image == "No image":
-                    try:
-                        imgs = item.find_all('img')
-                        for img in imgs:
-                            data_src = (img.get('data-src') or 
-                                      img.get('data-original') or 
-                                      img.get('data-lazy-src'))
-                            if (data_src and len(data_src) > 10 and
-                                any(ext in data_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
-                                image = data_src
-                                break
-                    except:
-                        pass
+            # Strategy 3: Look in srcset
+            if image == "No image":
+                try:
+                    img_elem = item.find('img')
+                    if img_elem and img_elem.get('srcset'):
+                        srcset = img_elem.get('srcset')
+                        first_src = srcset.split(',')[0].strip().split()[0]
+                        if first_src and len(first_src) > 10:
+                            image = first_src
+                except:
+                    pass
                 
-                # Strategy 3: Look in srcset
-                if image == "No image":
-                    try:
-                        img_elem = item.find('img')
-                        if img_elem and img_elem.get('srcset'):
-                            srcset = img_elem.get('srcset')
-                            first_src = srcset.split(',')[0].strip().split()[0]
-                            if first_src and len(first_src) > 10:
-                                image = first_src
-                    except:
-                        pass
+            # Strategy 4: any other lazy-loading attribute (data-srcset, data-bg, background-image)
+            if image == "No image":
+                image = resolve_image_url(item) or "No image"
                 
-                # Fix relative image URLs
-                if image and image != "No image" and not image.startswith('http'):
-                    if image.startswith('//'):
-                        image = 'https:' + image
-                    elif image.startswith('/'):
-                        image = 'https://www2.hm.com' + image
-                    else:
-                        image = 'https://www2.hm.com/' + image
+            # Fix relative image URLs
+            if image and image != "No image" and not image.startswith('http'):
+                if image.startswith('//'):
+                    image = 'https:' + image
+                elif image.startswith('/'):
+                    image = 'https://www2.hm.com' + image
+                else:
+                    image = 'https://www2.hm.com/' + image
                 
-                # Enhanced link extraction (keeping existing logic)
-                link = "#"
-                link_selectors = [
-                    'a.item-link',
-                    'h3 a',
-                    'h2 a',
-                    'h4 a',
-                    'a[href*="productpage"]',
-                    'a[href*="/product/"]',
-                    'a[href*="/p/"]',
-                    'a[data-articlecode]',
-                    'a[href]'
-                ]
+            # Enhanced link extraction (keeping existing logic)
+            link = "#"
+            link_selectors = [
+                'a.item-link',
+                'h3 a',
+                'h2 a',
+                'h4 a',
+                'a[href*="productpage"]',
+                'a[href*="/product/"]',
+                'a[href*="/p/"]',
+                'a[data-articlecode]',
+                'a[href]'
+            ]
                 
-                for link_sel in link_selectors:
-                    try:
-                        link_elem = item.select_one(link_sel)
-                        if link_elem and link_elem.get('href'):
-                            href = link_elem['href']
-                            if href.startswith('/'):
-                                link = "https://www2.hm.com" + href
-                            elif href.startswith('http'):
-                                link = href
-                            else:
-                                link = "https://www2.hm.com/" + href
-                            break
-                    except:
-                        continue
+            for link_sel in link_selectors:
+                try:
+                    link_elem = item.select_one(link_sel)
+                    if link_elem and link_elem.get('href'):
+                        href = link_elem['href']
+                        if href.startswith('/'):
+                            link = "https://www2.hm.com" + href
+                        elif href.startswith('http'):
+                            link = href
+                        else:
+                            link = "https://www2.hm.com/" + href
+                        break
+                except:
+                    continue
                 
-                # Only add products with meaningful data
-                if (title != "No title" or price != "No price" or image != "No image"):
-                    html_products.append({
-                        'title': title,
-                        'price': price,
-                        'image': image,
-                        'link': link
-                    })
+            # Only add products with meaningful data
+            if (title != "No title" or price != "No price" or image != "No image"):
+                html_products.append({
+                    'title': title,
+                    'price': price,
+                    'image': image,
+                    'link': link
+                })
                     
-                    print(f"✓ Product {idx + 1}: Title={title[:40]}{'...' if len(title) > 40 else ''}, "
-                          f"Price={price}, Image={'✓' if image != 'No image' else '✗'}")
+                print(f"✓ Product {idx + 1}: Title={title[:40]}{'...' if len(title) > 40 else ''}, "
+                      f"Price={price}, Image={'✓' if image != 'No image' else '✗'}")
                 
-            except Exception as e:
-                print(f"Error processing HTML product {idx + 1}: {e}")
-                continue
-        
-        # Combine results, prioritizing JSON data if available and sufficient
-        if products_from_json and len(products_from_json) >= 10:
-            all_products = products_from_json
-            print(f"Using JSON data: {len(all_products)} products")
-        else:
-            all_products = html_products
-            print(f"Using HTML parsing: {len(all_products)} products")
+        except Exception as e:
+            print(f"Error processing HTML product {idx + 1}: {e}")
+            continue
         
-        # If we have both but neither is sufficient, combine them
-        if len(all_products) < 10 and products_from_json and html_products:
-            combined = products_from_json + html_products
-            seen_titles = set()
-            unique_products = []
-            for product in combined:
-                title_lower = product['title'].lower()[:30]
-                if title_lower not in seen_titles and product['title'] != "No title":
-                    seen_titles.add(title_lower)
-                    unique_products.append(product)
-            all_products = unique_products
-            print(f"Combined unique products: {len(all_products)}")
+    # Combine results, prioritizing JSON data if available and sufficient
+    if products_from_json and len(products_from_json) >= 10:
+        all_products = products_from_json
+        print(f"Using JSON data: {len(all_products)} products")
+    else:
+        all_products = html_products
+        print(f"Using HTML parsing: {len(all_products)} products")
         
-        # Populate the data dictionary
-        for product in all_products:
-            data["Title"].append(product['title'])
-            data["Price"].append(product['price'])
-            data["Image"].append(product['image'])
-            data["Link"].append(product['link'])
+    # If we have both but neither is sufficient, combine them
+    if len(all_products) < 10 and products_from_json and html_products:
+        combined = products_from_json + html_products
+        seen_titles = set()
+        unique_products = []
+        for product in combined:
+            title_lower = product['title'].lower()[:30]
+            if title_lower not in seen_titles and product['title'] != "No title":
+                seen_titles.add(title_lower)
+                unique_products.append(product)
+        all_products = unique_products
+        print(f"Combined unique products: {len(all_products)}")
         
-        # Print summary
-        images_found = len([img for img in data['Image'] if img != 'No image'])
-        prices_found = len([price for price in data['Price'] if price != 'No price'])
-        print(f"\n=== H&M SCRAPING SUMMARY ===")
-        print(f"Total products: {len(all_products)}")
-        print(f"Images found: {images_found}")
-        print(f"Prices found: {prices_found}")
-        print(f"Success rate - Images: {images_found/len(all_products)*100:.1f}%" if all_products else "0%")
-        print(f"Success rate - Prices: {prices_found/len(all_products)*100:.1f}%" if all_products else "0%")
+    # Populate the data dictionary
+    for product in all_products:
+        data["Title"].append(product['title'])
+        data["Price"].append(product['price'])
+        data["Image"].append(product['image'])
+        data["Link"].append(product['link'])
         
-    except Exception as e:
-        print(f"Error scraping H&M: {e}")
-        try:
-            driver.save_screenshot("hm_error.png")
-        except:
-            pass
-    
-    finally:
-        driver.quit()
+    # Print summary
+    images_found = len([img for img in data['Image'] if img != 'No image'])
+    prices_found = len([price for price in data['Price'] if price != 'No price'])
+    print(f"\n=== H&M SCRAPING SUMMARY ===")
+    print(f"Total products: {len(all_products)}")
+    print(f"Images found: {images_found}")
+    print(f"Prices found: {prices_found}")
+    print(f"Success rate - Images: {images_found/len(all_products)*100:.1f}%" if all_products else "0%")
+    print(f"Success rate - Prices: {prices_found/len(all_products)*100:.1f}%" if all_products else "0%")
     
-    df = pd.DataFrame(data)
-    df['Source'] = 'H&M'
-    return df
-
-
+    return data
 
 import json
-import time
 import pandas as pd
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 from selenium.webdriver.support.ui import WebDriverWait
-# Note: You need to have a get_driver() function defined elsewhere in your code.
-# from your_utility_module import get_driver, shopify_lazy_loading_scroll, extract_shopify_price, clean_price
 
-def scrape_levis(query):
+def scrape_levis(query, max_results=25):
     """
     Enhanced Levi's India scraper - levi.in is Shopify-based
     Different from H&M structure, uses Shopify's search system
     """
-    driver = get_driver()
+    driver = checkout_driver("Levi's")
     
     # Levi's India search URL structure (Shopify-based)
     encoded_query = quote(query)
@@ -1349,209 +1300,216 @@ def scrape_levis(query):
     try:
         driver.get(url)
         
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 15)
-        # time.sleep(3)
+        # Wait for the product grid instead of the full page load
+        wait_until_ready(driver, "Levi's")
         
         # Shopify lazy loading scroll (different approach than H&M)
-        shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2)
+        shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2, target_count=max_results, query=query)
         
         # Additional wait for Shopify AJAX
         # time.sleep(3)
         
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        data = parse_and_extract(driver.page_source, (extract_levis_products, max_results))[0]
         
-        # Method 1: Try to extract from Shopify JSON data
-        products_from_json = []
+    except Exception as e:
+        print(f"An error occurred in scrape_levis: {e}")
         try:
-            # Look for Shopify product data in various script tags
-            script_tags = soup.find_all('script', type='application/json')
-            for script in script_tags:
-                try:
-                    # Ensure script.string is not None before loading
-                    if script.string:
-                        json_data = json.loads(script.string)
-                        if 'products' in json_data and isinstance(json_data['products'], list):
-                            products_data = json_data['products']
-                            print(f"Found {len(products_data)} products in Shopify JSON")
+            driver.save_screenshot("levis_error.png")
+        except:
+            pass
+    
+    finally:
+        checkin_driver(driver)
+    
+    df = pd.DataFrame(data)
+    df['Source'] = "Levi's"
+    return df
+
+
+def extract_levis_products(soup, max_results=25):
+    """Product data from a parsed Levi's Shopify search page (embedded JSON first, then the product grid)"""
+    data = {"Title": [], "Price": [], "Image": [], "Link": []}
+    
+    # Method 1: Try to extract from Shopify JSON data
+    products_from_json = []
+    try:
+        # Look for Shopify product data in various script tags
+        script_tags = soup.find_all('script', type='application/json')
+        for script in script_tags:
+            try:
+                # Ensure script.string is not None before loading
+                if script.string:
+                    json_data = json.loads(script.string)
+                    if 'products' in json_data and isinstance(json_data['products'], list):
+                        products_data = json_data['products']
+                        print(f"Found {len(products_data)} products in Shopify JSON")
                             
-                            for product in products_data:
-                                try:
-                                    title = product.get('title', 'No title')
+                        for product in products_data:
+                            try:
+                                title = product.get('title', 'No title')
                                     
-                                    # Shopify price extraction from JSON
-                                    price = "No price"
-                                    if 'price' in product:
-                                        price_value = product['price']
+                                # Shopify price extraction from JSON
+                                price = "No price"
+                                if 'price' in product:
+                                    price_value = product['price']
+                                    if isinstance(price_value, (int, float)):
+                                        # Convert from paise to rupees
+                                        price = f"₹{price_value/100:.0f}"
+                                elif 'variants' in product and product.get('variants'):
+                                    variant = product['variants'][0]
+                                    if 'price' in variant:
+                                        price_value = variant['price']
+                                        if isinstance(price_value, str):
+                                            price_value = float(price_value.replace(',', ''))
                                         if isinstance(price_value, (int, float)):
-                                            # Convert from paise to rupees
+                                             # Convert from paise to rupees
                                             price = f"₹{price_value/100:.0f}"
-                                    elif 'variants' in product and product.get('variants'):
-                                        variant = product['variants'][0]
-                                        if 'price' in variant:
-                                            price_value = variant['price']
-                                            if isinstance(price_value, str):
-                                                price_value = float(price_value.replace(',', ''))
-                                            if isinstance(price_value, (int, float)):
-                                                 # Convert from paise to rupees
-                                                price = f"₹{price_value/100:.0f}"
-
-                                    # Shopify image extraction from JSON
-                                    image = "No image"
-                                    if product.get('featured_image'):
-                                        image = product['featured_image']
-                                        if not image.startswith('http'):
-                                            image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
-                                    elif product.get('images'):
-                                        image = product['images'][0]
-                                        if not image.startswith('http'):
-                                            image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
+
+                                # Shopify image extraction from JSON
+                                image = "No image"
+                                if product.get('featured_image'):
+                                    image = product['featured_image']
+                                    if not image.startswith('http'):
+                                        image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
+                                elif product.get('images'):
+                                    image = product['images'][0]
+                                    if not image.startswith('http'):
+                                        image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
                                     
-                                    # Shopify URL/handle from JSON
-                                    link = "#"
-                                    if 'handle' in product:
-                                        link = f"https://levi.in/products/{product['handle']}"
-                                    elif 'url' in product:
-                                        link = f"https://levi.in{product['url']}"
+                                # Shopify URL/handle from JSON
+                                link = "#"
+                                if 'handle' in product:
+                                    link = f"https://levi.in/products/{product['handle']}"
+                                elif 'url' in product:
+                                    link = f"https://levi.in{product['url']}"
                                     
-                                    products_from_json.append({
-                                        'title': title, 'price': price, 'image': image, 'link': link
-                                    })
+                                products_from_json.append({
+                                    'title': title, 'price': price, 'image': image, 'link': link
+                                })
                                     
-                                except Exception as e:
-                                    print(f"Error processing Shopify JSON product: {e}")
-                                    continue
-                            # Once we find a valid product list in JSON, we can stop
-                            if products_from_json:
-                                break 
-                except json.JSONDecodeError:
-                    continue # Ignore scripts that are not valid JSON
-                except Exception as e:
-                    print(f"Error parsing script tag: {e}")
-                    continue
+                            except Exception as e:
+                                print(f"Error processing Shopify JSON product: {e}")
+                                continue
+                        # Once we find a valid product list in JSON, we can stop
+                        if products_from_json:
+                            break 
+            except json.JSONDecodeError:
+                continue # Ignore scripts that are not valid JSON
+            except Exception as e:
+                print(f"Error parsing script tag: {e}")
+                continue
                     
-        except Exception as e:
-            print(f"Error extracting from Shopify JSON: {e}")
+    except Exception as e:
+        print(f"Error extracting from Shopify JSON: {e}")
 
-        # Method 2: HTML parsing with Shopify-specific selectors
-        html_products = []
+    # Method 2: HTML parsing with Shopify-specific selectors
+    html_products = []
         
-        print("\n=== STARTING SHOPIFY HTML PARSING ===")
+    print("\n=== STARTING SHOPIFY HTML PARSING ===")
         
-        product_selectors = [
-            '.product-item', '.product-card', 'article.product-item', 'div.product-item',
-            'li.product-item', '.grid-item', '.grid-product', 'article.grid-item',
-            'div.grid-item', '.product', '.product-block', '.product-tile', 'article.product',
-            'div.product', '.collection-item', '.search-item', 'article.collection-item',
-            '[data-product-id]', '[data-product-handle]', '.js-product-item'
-        ]
+    product_selectors = [
+        '.product-item', '.product-card', 'article.product-item', 'div.product-item',
+        'li.product-item', '.grid-item', '.grid-product', 'article.grid-item',
+        'div.grid-item', '.product', '.product-block', '.product-tile', 'article.product',
+        'div.product', '.collection-item', '.search-item', 'article.collection-item',
+        '[data-product-id]', '[data-product-handle]', '.js-product-item'
+    ]
+        
+    items = []
+    for selector in product_selectors:
+        items = soup.select(selector)
+        if len(items) > 3:
+            print(f"Levi's: Found {len(items)} items using selector: {selector}")
+            break
         
+    if not items:
+        print("Trying Shopify fallback selectors...")
+        potential_items = soup.find_all(['div', 'article', 'li'])
         items = []
-        for selector in product_selectors:
-            items = soup.select(selector)
-            if len(items) > 3:
-                print(f"Levi's: Found {len(items)} items using selector: {selector}")
-                break
+        for item in potential_items:
+            if (item.find('img') and 
+                item.find('a') and
+                (any(cls for cls in item.get('class', []) if 'product' in cls.lower()) or
+                 item.get('data-product-id') or item.get('data-product-handle') or
+                 (item.find(['h2', 'h3', 'h4']) and
+                 (item.find(class_=lambda x: x and 'price' in x.lower()) or
+                  item.find(text=lambda x: x and '₹' in str(x)))))):
+                items.append(item)
+        print(f"Found {len(items)} items using Shopify fallback method")
+        
+    print(f"Processing {min(len(items), 25)} products...")
         
-        if not items:
-            print("Trying Shopify fallback selectors...")
-            potential_items = soup.find_all(['div', 'article', 'li'])
-            items = []
-            for item in potential_items:
-                if (item.find('img') and 
-                    item.find('a') and
-                    (any(cls for cls in item.get('class', []) if 'product' in cls.lower()) or
-                     item.get('data-product-id') or item.get('data-product-handle') or
-                     (item.find(['h2', 'h3', 'h4']) and
-                     (item.find(class_=lambda x: x and 'price' in x.lower()) or
-                      item.find(text=lambda x: x and '₹' in str(x)))))):
-                    items.append(item)
-            print(f"Found {len(items)} items using Shopify fallback method")
-        
-        print(f"Processing {min(len(items), 25)} products...")
-        
-        for idx, item in enumerate(items[:25]):
-            try:
-                # Use the new title extraction function
-                title = extract_levis_title(item, idx + 1)
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
+        try:
+            # Use the new title extraction function
+            title = extract_levis_title(item, idx + 1)
                 
-                print(f"\n--- Processing Levi's item {idx + 1}: {title[:30]}... ---")
+            print(f"\n--- Processing Levi's item {idx + 1}: {title[:30]}... ---")
                 
-                price = extract_shopify_price(item)
+            price = extract_shopify_price(item)
                 
-                image = "No image"
-                # Logic to find image (from your original code)
-                all_imgs = item.find_all('img')
-                for img in all_imgs:
-                    src = img.get('data-src') or img.get('src')
-                    if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
-                        image = src.split('?')[0] # Clean up URL params
-                        if not image.startswith('http'):
-                            image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
-                        break
+            image = "No image"
+            # Logic to find image (from your original code)
+            all_imgs = item.find_all('img')
+            for img in all_imgs:
+                src = img.get('data-src') or img.get('src')
+                if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
+                    image = src.split('?')[0] # Clean up URL params
+                    if not image.startswith('http'):
+                        image = 'https:' + image if image.startswith('//') else 'https://levi.in' + image
+                    break
                         
-                link = "#"
-                # Logic to find link (from your original code)
-                link_elem = item.find('a', href=lambda href: href and "/products/" in href)
-                if link_elem:
-                    href = link_elem['href']
-                    if href.startswith('/'):
-                        link = "https://levi.in" + href
-                    elif href.startswith('http'):
-                        link = href
+            link = "#"
+            # Logic to find link (from your original code)
+            link_elem = item.find('a', href=lambda href: href and "/products/" in href)
+            if link_elem:
+                href = link_elem['href']
+                if href.startswith('/'):
+                    link = "https://levi.in" + href
+                elif href.startswith('http'):
+                    link = href
                 
-                if title != "No title" or price != "No price":
-                    html_products.append({'title': title, 'price': price, 'image': image, 'link': link})
-                    print(f"✓ Product {idx + 1}: Title={title[:40]}{'...' if len(title) > 40 else ''}, "
-                          f"Price={price}, Image={'✓' if image != 'No image' else '✗'}")
+            if title != "No title" or price != "No price":
+                html_products.append({'title': title, 'price': price, 'image': image, 'link': link})
+                print(f"✓ Product {idx + 1}: Title={title[:40]}{'...' if len(title) > 40 else ''}, "
+                      f"Price={price}, Image={'✓' if image != 'No image' else '✗'}")
             
-            except Exception as e:
-                print(f"Error processing Levi's HTML product {idx + 1}: {e}")
-                continue
-        
-        # Combine results
-        if products_from_json and len(products_from_json) >= 5:
-            all_products = products_from_json
-            print(f"\nUsing Shopify JSON data: {len(all_products)} products")
-        else:
-            all_products = html_products
-            print(f"\nUsing HTML parsing: {len(all_products)} products")
+        except Exception as e:
+            print(f"Error processing Levi's HTML product {idx + 1}: {e}")
+            continue
         
-        # Populate the data dictionary
-        for product in all_products:
-            data["Title"].append(product['title'])
-            data["Price"].append(product['price'])
-            data["Image"].append(product['image'])
-            data["Link"].append(product['link'])
+    # Combine results
+    if products_from_json and len(products_from_json) >= 5:
+        all_products = products_from_json
+        print(f"\nUsing Shopify JSON data: {len(all_products)} products")
+    else:
+        all_products = html_products
+        print(f"\nUsing HTML parsing: {len(all_products)} products")
         
-        # Print summary
-        if all_products:
-            images_found = len([img for img in data['Image'] if img != 'No image'])
-            prices_found = len([price for price in data['Price'] if price != 'No price'])
-            titles_found = len([title for title in data['Title'] if title != 'No title'])
-            print(f"\n=== LEVI'S SCRAPING SUMMARY ===")
-            print(f"Total products: {len(all_products)}")
-            print(f"Titles found: {titles_found}")
-            print(f"Images found: {images_found}")
-            print(f"Prices found: {prices_found}")
-            print(f"Success rate - Titles: {titles_found/len(all_products)*100:.1f}%")
-            print(f"Success rate - Images: {images_found/len(all_products)*100:.1f}%")
-            print(f"Success rate - Prices: {prices_found/len(all_products)*100:.1f}%")
+    # Populate the data dictionary
+    for product in all_products:
+        data["Title"].append(product['title'])
+        data["Price"].append(product['price'])
+        data["Image"].append(product['image'])
+        data["Link"].append(product['link'])
         
-    except Exception as e:
-        print(f"An error occurred in scrape_levis: {e}")
-        try:
-            driver.save_screenshot("levis_error.png")
-        except:
-            pass
-    
-    finally:
-        driver.quit()
+    # Print summary
+    if all_products:
+        images_found = len([img for img in data['Image'] if img != 'No image'])
+        prices_found = len([price for price in data['Price'] if price != 'No price'])
+        titles_found = len([title for title in data['Title'] if title != 'No title'])
+        print(f"\n=== LEVI'S SCRAPING SUMMARY ===")
+        print(f"Total products: {len(all_products)}")
+        print(f"Titles found: {titles_found}")
+        print(f"Images found: {images_found}")
+        print(f"Prices found: {prices_found}")
+        print(f"Success rate - Titles: {titles_found/len(all_products)*100:.1f}%")
+        print(f"Success rate - Images: {images_found/len(all_products)*100:.1f}%")
+        print(f"Success rate - Prices: {prices_found/len(all_products)*100:.1f}%")
     
-    df = pd.DataFrame(data)
-    df['Source'] = "Levi's"
-    return df
-
+    return data
 
 def extract_levis_title(item, item_index):
     """
@@ -1582,36 +1540,18 @@ def extract_levis_title(item, item_index):
     print(f"Could not find title for item {item_index}, generating placeholder.")
     return f"Levi's Product {item_index + 1}"
 
-def shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2):
+def shopify_lazy_loading_scroll(driver, max_scrolls=10, scroll_pause=2, target_count=None, query=None):
     """
     Shopify-specific scrolling function
     Shopify sites often load content differently than other platforms
     """
     print("Starting Shopify lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    
-    for i in range(max_scrolls):
-        # Scroll down gradually
-        scroll_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-        
-        # Wait for Shopify AJAX requests
-        # time.sleep(scroll_pause)
-        
-        # Check if new content loaded
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height and i > max_scrolls - 3:
-            print("No new content loading, finishing scroll...")
-            break
-        else:
-            last_height = new_height
-        
-        print(f"Shopify scroll {i+1}/{max_scrolls}")
-    
-    # Final scroll to ensure all content is loaded
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    # time.sleep(scroll_pause)
+    scroll_page(
+        driver, max_steps=max_scrolls, step_timeout=scroll_pause, patience=3,
+        final_passes=('bottom',), target_count=target_count,
+        target_selector=site_card_selector("Levi's"), label="Shopify", site="Levi's", query=query
+    )
     
     print("Shopify scrolling complete")
 
@@ -1741,12 +1681,10 @@ def debug_levis_structure(driver, item_index=0):
 
 
 
-def scrape_lifestyle(query):
+def scrape_lifestyle(query, max_results=25):
     """
     Enhanced Lifestyle scraper with comprehensive product extraction
     """
-    driver = get_driver()
-    
     # Lifestyle India search URL structure
     encoded_query = quote(query)
     url = f"https://www.lifestylestores.com/in/en/search?q={encoded_query}"
@@ -1754,33 +1692,44 @@ def scrape_lifestyle(query):
     
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
     
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Lifestyle', url, (extract_lifestyle_json_data,), (extract_lifestyle_html_data, max_results))
+    driver = None if http_results is not None else checkout_driver('Lifestyle')
+    
     try:
-        driver.get(url)
-        
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 20)
-        # time.sleep(5)
-        
-        # Advanced lazy loading scroll for Lifestyle
-        advanced_lazy_loading_scroll_lifestyle(driver, max_scrolls=20, scroll_pause=3)
-        
-        # Force load any remaining lazy images
-        force_lazy_image_loading_lifestyle(driver)
-        
-        # Additional wait to ensure all content is loaded
-        # time.sleep(5)
-        
-        # Debug the first item to understand structure
-        print("\n=== DEBUGGING LIFESTYLE PRICE STRUCTURE ===")
-        debug_price_extraction_lifestyle(driver, item_index=0)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Method 1: Try to extract data from JSON/script tags
-        products_from_json = extract_lifestyle_json_data(soup)
-        
-        # Method 2: Enhanced HTML parsing
-        html_products = extract_lifestyle_html_data(soup)
+        if http_results is not None:
+            products_from_json, html_products = http_results
+        else:
+            start_capture(driver, 'Lifestyle')
+            driver.get(url)
+            
+            # Wait for the product grid instead of the full page load
+            wait_until_ready(driver, 'Lifestyle')
+            
+            # Advanced lazy loading scroll for Lifestyle
+            advanced_lazy_loading_scroll_lifestyle(driver, max_scrolls=20, scroll_pause=3, target_count=max_results, query=query)
+            
+            # Products the grid fetched from the site's API while loading and scrolling
+            captured = captured_products(driver, 'Lifestyle', lifestyle_product_from_json, max_results)
+            if captured:
+                # They are the JSON data, so the selection below treats them as both sources
+                products_from_json = html_products = captured
+            else:
+                # Additional wait to ensure all content is loaded
+                # time.sleep(5)
+                
+                # Debug the first item to understand structure
+                if DEBUG_STRUCTURE:
+                    print("\n=== DEBUGGING LIFESTYLE PRICE STRUCTURE ===")
+                    debug_price_extraction_lifestyle(driver, item_index=0)
+                
+                # Parse the page in the parse process pool:
+                # Method 1 extracts from JSON/script tags, Method 2 is enhanced HTML parsing
+                products_from_json, html_products = parse_and_extract(
+                    driver.page_source,
+                    (extract_lifestyle_json_data,),
+                    (extract_lifestyle_html_data, max_results)
+                )
         
         # Combine results intelligently
         all_products = combine_lifestyle_results(products_from_json, html_products)
@@ -1803,88 +1752,25 @@ def scrape_lifestyle(query):
             pass
     
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'Lifestyle'
     return df
 
-def advanced_lazy_loading_scroll_lifestyle(driver, max_scrolls=15, scroll_pause=3):
+def advanced_lazy_loading_scroll_lifestyle(driver, max_scrolls=15, scroll_pause=3, target_count=None, query=None):
     """
     Advanced scrolling function specifically designed for Lifestyle's lazy loading.
     """
     print("Starting Lifestyle lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_images_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        # time.sleep(scroll_pause)
-        
-        # Check how many images have loaded
-        images_with_src = driver.execute_script("""
-            return document.querySelectorAll('img[src]:not([src=""])').length;
-        """)
-        
-        if images_with_src > loaded_images_count:
-            loaded_images_count = images_with_src
-            print(f"Lifestyle Scroll {i+1}/{max_scrolls}: {loaded_images_count} images loaded")
-        
-        # Check if page height changed
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height and i > max_scrolls - 5:
-            print("Lifestyle page height stabilized, finishing scroll...")
-            break
-        else:
-            last_height = new_height
-    
-    # Final scroll patterns
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    # time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    # time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    # time.sleep(2)
-    
-    final_images = driver.execute_script("""
-        return document.querySelectorAll('img[src]:not([src=""])').length;
-    """)
-    print(f"Lifestyle scrolling complete. Total images loaded: {final_images}")
-
-def force_lazy_image_loading_lifestyle(driver):
-    """
-    Force load lazy images for Lifestyle website
-    """
-    try:
-        driver.execute_script("""
-            // Common lazy loading patterns for Lifestyle
-            const lazyImages = document.querySelectorAll('img[data-src], img[data-original], img[data-lazy-src]');
-            lazyImages.forEach(img => {
-                const src = img.dataset.src || img.dataset.original || img.dataset.lazySrc;
-                if (src && !img.src.includes(src)) {
-                    img.src = src;
-                }
-            });
-            
-            // Force visibility for intersection observer
-            const allImages = document.querySelectorAll('img');
-            allImages.forEach(img => {
-                img.scrollIntoView({ behavior: 'auto', block: 'center' });
-            });
-            
-            // Trigger any remaining lazy loading mechanisms
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-        """)
-        # time.sleep(2)
-        print("Lifestyle forced lazy image loading completed")
-    except Exception as e:
-        print(f"Error in Lifestyle forced lazy loading: {e}")
+    summary = scroll_page(
+        driver, card_selector='img[src]:not([src=""])', max_steps=max_scrolls,
+        step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('Lifestyle'), label="Lifestyle", site='Lifestyle', query=query
+    )
+    print(f"Lifestyle scrolling complete. Total images loaded: {summary['cards']}")
 
 def extract_lifestyle_price_from_element(item):
     """
@@ -2105,80 +1991,7 @@ def extract_lifestyle_json_data(soup):
                                     
                                     for product in temp_data:
                                         try:
-                                            title = (product.get('title') or 
-                                                   product.get('name') or 
-                                                   product.get('productName') or 
-                                                   product.get('displayName') or 'No title')
-                                            
-                                            # Price extraction from JSON
-                                            price = "No price"
-                                            price_fields = [
-                                                'price', 'priceValue', 'currentPrice', 'sellingPrice',
-                                                'displayPrice', 'formattedPrice', 'listPrice', 'retailPrice',
-                                                'salePrice', 'regularPrice', 'offerPrice', 'finalPrice'
-                                            ]
-                                            
-                                            for field in price_fields:
-                                                if field in product:
-                                                    price_data = product[field]
-                                                    if isinstance(price_data, dict):
-                                                        price_keys = ['value', 'amount', 'price', 'current', 'display']
-                                                        for key in price_keys:
-                                                            if key in price_data and price_data[key]:
-                                                                price = clean_price(str(price_data[key]))
-                                                                if price != "No price":
-                                                                    break
-                                                    elif isinstance(price_data, (str, int, float)):
-                                                        price = clean_price(str(price_data))
-                                                    
-                                                    if price != "No price":
-                                                        break
-                                            
-                                            # Image extraction from JSON
-                                            image = "No image"
-                                            image_fields = ['images', 'image', 'mainImage', 'defaultImage', 'thumbnail', 'imageUrl']
-                                            for field in image_fields:
-                                                if field in product:
-                                                    img_data = product[field]
-                                                    if isinstance(img_data, list) and img_data:
-                                                        img_obj = img_data[0]
-                                                        if isinstance(img_obj, dict):
-                                                            image = (img_obj.get('url') or img_obj.get('src'))
-                                                        else:
-                                                            image = str(img_obj)
-                                                    elif isinstance(img_data, str):
-                                                        image = img_data
-                                                    
-                                                    if image and image != "No image":
-                                                        break
-                                            
-                                            # Fix relative URLs
-                                            if image and image != "No image" and not image.startswith('http'):
-                                                if image.startswith('//'):
-                                                    image = 'https:' + image
-                                                elif image.startswith('/'):
-                                                    image = 'https://www.lifestylestores.com' + image
-                                            
-                                            # Link extraction from JSON
-                                            link = "#"
-                                            link_fields = ['url', 'link', 'href', 'productUrl', 'detailUrl']
-                                            for field in link_fields:
-                                                if field in product and product[field]:
-                                                    link = product[field]
-                                                    break
-                                            
-                                            # Fix relative URLs
-                                            if link and link != "#" and not link.startswith('http'):
-                                                if link.startswith('/'):
-                                                    link = 'https://www.lifestylestores.com' + link
-                                            
-                                            products_from_json.append({
-                                                'title': title,
-                                                'price': price,
-                                                'image': image,
-                                                'link': link
-                                            })
-                                            
+                                            products_from_json.append(lifestyle_product_from_json(product))
                                         except Exception as e:
                                             continue
                                     
@@ -2197,7 +2010,83 @@ def extract_lifestyle_json_data(soup):
     
     return products_from_json
 
-def extract_lifestyle_html_data(soup):
+def lifestyle_product_from_json(product):
+    """One Lifestyle product record from a JSON product object"""
+    title = (product.get('title') or 
+           product.get('name') or 
+           product.get('productName') or 
+           product.get('displayName') or 'No title')
+    
+    # Price extraction from JSON
+    price = "No price"
+    price_fields = [
+        'price', 'priceValue', 'currentPrice', 'sellingPrice',
+        'displayPrice', 'formattedPrice', 'listPrice', 'retailPrice',
+        'salePrice', 'regularPrice', 'offerPrice', 'finalPrice'
+    ]
+    
+    for field in price_fields:
+        if field in product:
+            price_data = product[field]
+            if isinstance(price_data, dict):
+                price_keys = ['value', 'amount', 'price', 'current', 'display']
+                for key in price_keys:
+                    if key in price_data and price_data[key]:
+                        price = clean_price(str(price_data[key]))
+                        if price != "No price":
+                            break
+            elif isinstance(price_data, (str, int, float)):
+                price = clean_price(str(price_data))
+    
+            if price != "No price":
+                break
+    
+    # Image extraction from JSON
+    image = "No image"
+    image_fields = ['images', 'image', 'mainImage', 'defaultImage', 'thumbnail', 'imageUrl']
+    for field in image_fields:
+        if field in product:
+            img_data = product[field]
+            if isinstance(img_data, list) and img_data:
+                img_obj = img_data[0]
+                if isinstance(img_obj, dict):
+                    image = (img_obj.get('url') or img_obj.get('src'))
+                else:
+                    image = str(img_obj)
+            elif isinstance(img_data, str):
+                image = img_data
+    
+            if image and image != "No image":
+                break
+    
+    # Fix relative URLs
+    if image and image != "No image" and not image.startswith('http'):
+        if image.startswith('//'):
+            image = 'https:' + image
+        elif image.startswith('/'):
+            image = 'https://www.lifestylestores.com' + image
+    
+    # Link extraction from JSON
+    link = "#"
+    link_fields = ['url', 'link', 'href', 'productUrl', 'detailUrl']
+    for field in link_fields:
+        if field in product and product[field]:
+            link = product[field]
+            break
+    
+    # Fix relative URLs
+    if link and link != "#" and not link.startswith('http'):
+        if link.startswith('/'):
+            link = 'https://www.lifestylestores.com' + link
+    
+    return {
+        'title': title,
+        'price': price,
+        'image': image,
+        'link': link
+    }
+
+def extract_lifestyle_html_data(soup, max_results=25):
     """
     Extract product data from HTML for Lifestyle website
     """
@@ -2248,9 +2137,11 @@ def extract_lifestyle_html_data(soup):
                 items.append(item)
         print(f"Lifestyle: Found {len(items)} items using fallback method")
     
-    print(f"Processing {min(len(items), 25)} Lifestyle products...")
+    print(f"Processing {min(len(items), max_results)} Lifestyle products...")
     
-    for idx, item in enumerate(items[:25]):
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
         try:
             # Title extraction
             title = extract_lifestyle_title(item)
@@ -2357,6 +2248,10 @@ def extract_lifestyle_image(item):
         except:
             pass
     
+    # Any other lazy-loading attribute (srcset, data-bg, background-image)
+    if image == "No image":
+        image = resolve_image_url(item) or "No image"
+    
     # Fix relative URLs
     if image and image != "No image" and not image.startswith('http'):
         if image.startswith('//'):
@@ -2440,7 +2335,6 @@ def print_lifestyle_summary(data, all_products):
 
 import re
 import json
-import time
 import pandas as pd
 from urllib.parse import quote
 from bs4 import BeautifulSoup
@@ -2499,83 +2393,18 @@ def clean_nykaa_price(price_text):
     
     return price_text.strip() if price_text.strip() else "No price"
 
-def advanced_nykaa_scroll(driver, max_scrolls=20, scroll_pause=3):
+def advanced_nykaa_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=None, query=None):
     """
     Advanced scrolling function for Nykaa's dynamic loading.
     """
     print("Starting Nykaa lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down progressively
-        scroll_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-        
-        # Wait for content to load
-        # time.sleep(scroll_pause)
-        
-        # Check how many products have loaded
-        products_loaded = driver.execute_script("""
-            return document.querySelectorAll('[data-testid="product-card"], .product-item, .nykaa-product, .css-xrzmfa').length;
-        """)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} products loaded")
-        
-        # Check if page height changed
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
-    
-    # Final comprehensive scroll
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    # time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    # time.sleep(2)
-    
-    final_products = driver.execute_script("""
-        return document.querySelectorAll('[data-testid="product-card"], .product-item, .nykaa-product, .css-xrzmfa').length;
-    """)
-    print(f"Nykaa scrolling complete. Total products loaded: {final_products}")
-
-def force_nykaa_image_loading(driver):
-    """Force load lazy images in Nykaa"""
-    try:
-        driver.execute_script("""
-            // Force load images with data-src attributes
-            const lazyImages = document.querySelectorAll('img[data-src]');
-            lazyImages.forEach(img => {
-                if (img.dataset.src && !img.src.includes(img.dataset.src)) {
-                    img.src = img.dataset.src;
-                }
-            });
-            
-            // Handle Nykaa's specific lazy loading patterns
-            const nykaaImages = document.querySelectorAll('img[data-original], img[data-lazy]');
-            nykaaImages.forEach(img => {
-                const src = img.dataset.original || img.dataset.lazy;
-                if (src && !img.src.includes(src)) {
-                    img.src = src;
-                }
-            });
-            
-            // Trigger intersection observer by scrolling images into view
-            const allImages = document.querySelectorAll('img');
-            allImages.forEach(img => {
-                img.scrollIntoView({ behavior: 'auto', block: 'center' });
-            });
-        """)
-        # time.sleep(3)
-        print("Forced Nykaa image loading completed")
-    except Exception as e:
-        print(f"Error in forced lazy loading: {e}")
+    summary = scroll_page(
+        driver, card_selector='[data-testid="product-card"], .product-item, .nykaa-product, .css-xrzmfa',
+        max_steps=max_scrolls, step_timeout=scroll_pause, final_passes=('bottom', 'top'),
+        target_count=target_count, label="Nykaa", site='Nykaa', query=query
+    )
+    print(f"Nykaa scrolling complete. Total products loaded: {summary['cards']}")
 
 def extract_nykaa_price_from_element(item):
     """Enhanced price extraction for Nykaa products"""
@@ -2777,336 +2606,58 @@ def debug_nykaa_structure(driver, item_index=0):
             if text:
                 print(f"{i+1}. Tag: {elem.name}, Classes: {classes}, Text: '{text}'")
         
-    except Exception as e:
-        print(f"Error in Nykaa debug function: {e}")
-
-def scrape_nykaa(query):
-    """
-    Comprehensive Nykaa scraper with enhanced extraction capabilities
-    """
-    # Import the get_driver function (assuming it's defined elsewhere)
-    # from your_driver_module import get_driver
-    driver = get_driver()  # You'll need to ensure this function is available
-    
-    # Nykaa search URL structure
-    encoded_query = quote(query)
-    url = f"https://www.nykaa.com/search/result/?q={encoded_query}"
-    print(f"Scraping Nykaa URL: {url}")
-    
-    data = {"Title": [], "Price": [], "Rating": [], "Image": [], "Link": [], "Brand": []}
-    
-    try:
-        driver.get(url)
-        
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 20)
-        # time.sleep(5)
-        
-        # Try to wait for products to load
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 
-                '[data-testid="product-card"], .product-item, .nykaa-product, .css-xrzmfa')))
-        except:
-            print("Products not found with primary selectors, continuing...")
-        
-        # Advanced scrolling for Nykaa
-        advanced_nykaa_scroll(driver, max_scrolls=25, scroll_pause=4)
-        
-        # Force load images
-        force_nykaa_image_loading(driver)
-        
-        # Additional wait
-        # time.sleep(5)
-        
-        # Debug structure
-        print("\n=== DEBUGGING NYKAA STRUCTURE ===")
-        debug_nykaa_structure(driver, item_index=0)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Method 1: Try to extract from JSON data
-        products_from_json = []
-        try:
-            # Look for JSON data in script tags
-            script_tags = soup.find_all('script', type='application/json')
-            for script in script_tags:
-                try:
-                    json_data = json.loads(script.string)
-                    # Navigate through possible JSON structures for products
-                    if isinstance(json_data, dict):
-                        # Common paths where product data might be stored
-                        possible_paths = [
-                            ['props', 'pageProps', 'searchResults', 'products'],
-                            ['props', 'pageProps', 'products'],
-                            ['props', 'initialState', 'products'],
-                            ['products'],
-                            ['searchResults', 'products'],
-                            ['data', 'products'],
-                            ['response', 'products']
-                        ]
-                        
-                        for path in possible_paths:
-                            try:
-                                temp_data = json_data
-                                for key in path:
-                                    temp_data = temp_data[key]
-                                if temp_data and isinstance(temp_data, list):
-                                    print(f"Found {len(temp_data)} products in JSON")
-                                    
-                                    for product in temp_data:
-                                        if isinstance(product, dict):
-                                            title = (product.get('name') or 
-                                                   product.get('title') or 
-                                                   product.get('productName') or 'No title')
-                                            
-                                            # Price extraction from JSON
-                                            price = "No price"
-                                            price_fields = ['price', 'mrp', 'sellingPrice', 'offerPrice', 
-                                                          'displayPrice', 'currentPrice', 'finalPrice']
-                                            for field in price_fields:
-                                                if field in product and product[field]:
-                                                    price = clean_nykaa_price(str(product[field]))
-                                                    if price != "No price":
-                                                        break
-                                            
-                                            # Brand extraction
-                                            brand = (product.get('brand') or 
-                                                   product.get('brandName') or 
-                                                   product.get('manufacturer') or 'No brand')
-                                            
-                                            # Rating extraction
-                                            rating = (product.get('rating') or 
-                                                    product.get('averageRating') or 
-                                                    product.get('starRating') or 'No rating')
-                                            
-                                            # Image extraction
-                                            image = "No image"
-                                            if 'images' in product and product['images']:
-                                                if isinstance(product['images'], list):
-                                                    image = product['images'][0]
-                                                    if isinstance(image, dict):
-                                                        image = image.get('url', image.get('src', 'No image'))
-                                            elif 'image' in product:
-                                                image = product['image']
-                                            
-                                            # Link extraction
-                                            link = product.get('url', product.get('link', '#'))
-                                            if link and not link.startswith('http'):
-                                                link = 'https://www.nykaa.com' + link
-                                            
-                                            products_from_json.append({
-                                                'title': title,
-                                                'price': price,
-                                                'rating': str(rating),
-                                                'image': image,
-                                                'link': link,
-                                                'brand': brand
-                                            })
-                                    break
-                            except (KeyError, TypeError):
-                                continue
-                except json.JSONDecodeError:
-                    continue
-        except Exception as e:
-            print(f"Error extracting from JSON: {e}")
-        
-        # Method 2: HTML parsing with enhanced selectors
-        html_products = []
-        
-        print("\n=== STARTING NYKAA HTML PARSING ===")
-        
-        # Enhanced Nykaa product selectors
-        product_selectors = [
-            'a.css-qlopj4', # This is the anchor tag that wraps the entire product card.
-            'div.product-list-box', # This is often the main container
-            '[data-testid="product-card"]',  # Primary Nykaa selector
-            '.product-item',
-            '.nykaa-product',
-            '.css-xrzmfa',  # This was grabbing only the title, moved down
-            '.product-card',
-            '.product-tile',
-            'div[data-id]',
-            '[data-qa="product"]',
-            '.css-1qf0ydp',  # Another common class
-            'article.product',
-            'div.product',
-            'li.product',
-            '.search-product-item',
-            '.plp-product',
-            '.product-listing-item'
-        ]
-        
-        items = []
-        for selector in product_selectors:
-            items = soup.select(selector)
-            if len(items) > 5:  # Need a reasonable number of products
-                print(f"Nykaa: Found {len(items)} items using selector: {selector}")
-                break
-        
-        # Fallback method if specific selectors don't work
-        if not items:
-            print("Trying Nykaa fallback selectors...")
-            # Look for divs/articles that contain images and links (typical product structure)
-            potential_items = soup.find_all(['div', 'article', 'li'])
-            items = []
-            for item in potential_items:
-                if (item.find('img') and 
-                    item.find('a') and
-                    (any('product' in str(cls).lower() for cls in item.get('class', [])) or
-                     item.get('data-id') or
-                     item.get('data-testid'))):
-                    items.append(item)
-            print(f"Nykaa fallback: Found {len(items)} potential items")
-        
-        print(f"Processing {min(len(items), 30)} Nykaa products...")
-        
-        for idx, item in enumerate(items[:30]):
-            try:
-                # Title extraction
-                title = "No title"
-                title_selectors = [
-                    '[data-testid="product-title"]',
-                    '.product-title',
-                    '.product-name',
-                    'h3 a',
-                    'h2 a',
-                    'h4 a',
-                    '.css-1gc4x7i',  # Common Nykaa title class
-                    'a[title]',
-                    '.product-item-title',
-                    '.item-title',
-                    'a.product-link'
-                ]
-                
-                for t_sel in title_selectors:
-                    try:
-                        title_elem = item.select_one(t_sel)
-                        if title_elem:
-                            title_text = (title_elem.get_text(strip=True) or 
-                                        title_elem.get('title', '') or
-                                        title_elem.get('alt', ''))
-                            if title_text and len(title_text) > 3:
-                                title = title_text
-                                break
-                    except:
-                        continue
-                
-                # Fallback: If no child selector worked, the item itself might be the title element.
-                if title == "No title":
-                    try:
-                        item_text = item.get_text(strip=True)
-                        if item_text and len(item_text) > 5:
-                            title = item_text
-                    except:
-                        pass
-
-                # Clean the final extracted title
-                title = clean_nykaa_title(title)
-                
-                # Brand extraction
-                brand = "No brand"
-                brand_selectors = [
-                    '[data-testid="product-brand"]',
-                    '.brand-name',
-                    '.product-brand',
-                    '.brand',
-                    '.css-1uodvt6'  # Common Nykaa brand class
-                ]
-                
-                for b_sel in brand_selectors:
-                    try:
-                        brand_elem = item.select_one(b_sel)
-                        if brand_elem:
-                            brand_text = brand_elem.get_text(strip=True)
-                            if brand_text and len(brand_text) > 1:
-                                brand = brand_text
-                                break
-                    except:
-                        continue
-                
-                # Price extraction using our enhanced function
-                print(f"\n--- Processing Nykaa item {idx + 1}: {title[:30]}... ---")
-                price = extract_nykaa_price_from_element(item)
-                
-                # Rating extraction
-                rating = extract_nykaa_rating(item)
-                
-                # Image extraction
-                image = "No image"
-                
-                # Look for loaded images first
-                try:
-                    imgs = item.find_all('img')
-                    for img in imgs:
-                        src = img.get('src', '')
-                        if (src and len(src) > 10 and 
-                            'nykaa' in src.lower() and
-                            any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
-                            image = src
-                            break
-                except:
-                    pass
-                
-                # Look for data-src (lazy loaded images)
-                if image == "No image":
-                    try:
-                        imgs = item.find_all('img')
-                        for img in imgs:
-                            data_src = (img.get('data-src') or 
-                                      img.get('data-original') or 
-                                      img.get('data-lazy'))
-                            if (data_src and len(data_src) > 10 and
-                                any(ext in data_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
-                                image = data_src
-                                break
-                    except:
-                        pass
-                
-                # Fix image URLs
-                if image and image != "No image" and not image.startswith('http'):
-                    if image.startswith('//'):
-                        image = 'https:' + image
-                    elif image.startswith('/'):
-                        image = 'https://www.nykaa.com' + image
-                
-                # Link extraction
-                link = "#"
-                # Since the main item is now an anchor tag, we get its href directly.
-                try:
-                    if item.name == 'a' and item.get('href'):
-                        link = item['href']
-                    else:
-                        # Fallback to searching for a link inside the item
-                        link_elem = item.select_one('a[href]')
-                        if link_elem and link_elem.get('href'):
-                            link = link_elem['href']
-                except:
-                    pass
+    except Exception as e:
+        print(f"Error in Nykaa debug function: {e}")
 
-                # Make sure the link is absolute
-                if link and link != "#" and not link.startswith('http'):
-                    if link.startswith('/'):
-                        link = "https://www.nykaa.com" + link
-                    else:
-                        link = "https://www.nykaa.com/" + link
+def scrape_nykaa(query, max_results=30):
+    """
+    Comprehensive Nykaa scraper with enhanced extraction capabilities
+    """
+    # Nykaa search URL structure
+    encoded_query = quote(query)
+    url = f"https://www.nykaa.com/search/result/?q={encoded_query}"
+    print(f"Scraping Nykaa URL: {url}")
+    
+    data = {"Title": [], "Price": [], "Rating": [], "Image": [], "Link": [], "Brand": []}
+    
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Nykaa', url, (extract_nykaa_json_data,), (extract_nykaa_html_products, max_results))
+    driver = None if http_results is not None else checkout_driver('Nykaa')
+    
+    try:
+        if http_results is not None:
+            products_from_json, html_products = http_results
+        else:
+            start_capture(driver, 'Nykaa')
+            driver.get(url)
+            
+            # Wait for the product grid instead of the full page load
+            wait_until_ready(driver, 'Nykaa')
+            
+            # Advanced scrolling for Nykaa
+            advanced_nykaa_scroll(driver, max_scrolls=25, scroll_pause=4, target_count=max_results, query=query)
+            
+            # Products the grid fetched from the site's API while loading and scrolling
+            captured = captured_products(driver, 'Nykaa', nykaa_product_from_json, max_results)
+            if captured:
+                # They are the JSON data, so the selection below treats them as both sources
+                products_from_json = html_products = captured
+            else:
+                # Additional wait
+                # time.sleep(5)
                 
-                # Only add products with meaningful data
-                if (title != "No title" or price != "No price" or image != "No image"):
-                    html_products.append({
-                        'title': title,
-                        'price': price,
-                        'rating': rating,
-                        'image': image,
-                        'link': link,
-                        'brand': brand
-                    })
-                    
-                    print(f"✓ Nykaa Product {idx + 1}: {title[:40]}{'...' if len(title) > 40 else ''}, "
-                          f"Price={price}, Brand={brand}, Rating={rating}")
+                # Debug structure
+                if DEBUG_STRUCTURE:
+                    print("\n=== DEBUGGING NYKAA STRUCTURE ===")
+                    debug_nykaa_structure(driver, item_index=0)
                 
-            except Exception as e:
-                print(f"Error processing Nykaa product {idx + 1}: {e}")
-                continue
+                # Parse the page in the parse process pool:
+                # Method 1 extracts from JSON data, Method 2 parses the HTML
+                products_from_json, html_products = parse_and_extract(
+                    driver.page_source,
+                    (extract_nykaa_json_data,),
+                    (extract_nykaa_html_products, max_results)
+                )
         
         # Combine results
         if products_from_json and len(products_from_json) >= 10:
@@ -3148,18 +2699,317 @@ def scrape_nykaa(query):
             pass
     
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'Nykaa'
     return df
 
-def scrape_ajio(query):
+def extract_nykaa_json_data(soup):
+    """Extract Nykaa products from the JSON embedded in script tags"""
+    products_from_json = []
+    try:
+        # Look for JSON data in script tags
+        script_tags = soup.find_all('script', type='application/json')
+        for script in script_tags:
+            try:
+                json_data = json.loads(script.string)
+                # Navigate through possible JSON structures for products
+                if isinstance(json_data, dict):
+                    # Common paths where product data might be stored
+                    possible_paths = [
+                        ['props', 'pageProps', 'searchResults', 'products'],
+                        ['props', 'pageProps', 'products'],
+                        ['props', 'initialState', 'products'],
+                        ['products'],
+                        ['searchResults', 'products'],
+                        ['data', 'products'],
+                        ['response', 'products']
+                    ]
+                    
+                    for path in possible_paths:
+                        try:
+                            temp_data = json_data
+                            for key in path:
+                                temp_data = temp_data[key]
+                            if temp_data and isinstance(temp_data, list):
+                                print(f"Found {len(temp_data)} products in JSON")
+                                
+                                for product in temp_data:
+                                    if isinstance(product, dict):
+                                        products_from_json.append(nykaa_product_from_json(product))
+                                break
+                        except (KeyError, TypeError):
+                            continue
+            except json.JSONDecodeError:
+                continue
+    except Exception as e:
+        print(f"Error extracting from JSON: {e}")
+    
+    return products_from_json
+
+def nykaa_product_from_json(product):
+    """One Nykaa product record from a JSON product object"""
+    title = (product.get('name') or 
+           product.get('title') or 
+           product.get('productName') or 'No title')
+    
+    # Price extraction from JSON
+    price = "No price"
+    price_fields = ['price', 'mrp', 'sellingPrice', 'offerPrice', 
+                  'displayPrice', 'currentPrice', 'finalPrice']
+    for field in price_fields:
+        if field in product and product[field]:
+            price = clean_nykaa_price(str(product[field]))
+            if price != "No price":
+                break
+    
+    # Brand extraction
+    brand = (product.get('brand') or 
+           product.get('brandName') or 
+           product.get('manufacturer') or 'No brand')
+    
+    # Rating extraction
+    rating = (product.get('rating') or 
+            product.get('averageRating') or 
+            product.get('starRating') or 'No rating')
+    
+    # Image extraction
+    image = "No image"
+    if 'images' in product and product['images']:
+        if isinstance(product['images'], list):
+            image = product['images'][0]
+            if isinstance(image, dict):
+                image = image.get('url', image.get('src', 'No image'))
+    elif 'image' in product:
+        image = product['image']
+    
+    # Link extraction
+    link = product.get('url', product.get('link', '#'))
+    if link and not link.startswith('http'):
+        link = 'https://www.nykaa.com' + link
+    
+    return {
+        'title': title,
+        'price': price,
+        'rating': str(rating),
+        'image': image,
+        'link': link,
+        'brand': brand
+    }
+
+def extract_nykaa_html_products(soup, max_results=30):
+    """Extract Nykaa products from the product cards in the HTML"""
+    html_products = []
+    
+    print("\n=== STARTING NYKAA HTML PARSING ===")
+    
+    # Enhanced Nykaa product selectors
+    product_selectors = [
+        'a.css-qlopj4', # This is the anchor tag that wraps the entire product card.
+        'div.product-list-box', # This is often the main container
+        '[data-testid="product-card"]',  # Primary Nykaa selector
+        '.product-item',
+        '.nykaa-product',
+        '.css-xrzmfa',  # This was grabbing only the title, moved down
+        '.product-card',
+        '.product-tile',
+        'div[data-id]',
+        '[data-qa="product"]',
+        '.css-1qf0ydp',  # Another common class
+        'article.product',
+        'div.product',
+        'li.product',
+        '.search-product-item',
+        '.plp-product',
+        '.product-listing-item'
+    ]
+    
+    items = []
+    for selector in product_selectors:
+        items = soup.select(selector)
+        if len(items) > 5:  # Need a reasonable number of products
+            print(f"Nykaa: Found {len(items)} items using selector: {selector}")
+            break
+    
+    # Fallback method if specific selectors don't work
+    if not items:
+        print("Trying Nykaa fallback selectors...")
+        # Look for divs/articles that contain images and links (typical product structure)
+        potential_items = soup.find_all(['div', 'article', 'li'])
+        items = []
+        for item in potential_items:
+            if (item.find('img') and 
+                item.find('a') and
+                (any('product' in str(cls).lower() for cls in item.get('class', [])) or
+                 item.get('data-id') or
+                 item.get('data-testid'))):
+                items.append(item)
+        print(f"Nykaa fallback: Found {len(items)} potential items")
+    
+    print(f"Processing {min(len(items), 30)} Nykaa products...")
+    
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
+        try:
+            # Title extraction
+            title = "No title"
+            title_selectors = [
+                '[data-testid="product-title"]',
+                '.product-title',
+                '.product-name',
+                'h3 a',
+                'h2 a',
+                'h4 a',
+                '.css-1gc4x7i',  # Common Nykaa title class
+                'a[title]',
+                '.product-item-title',
+                '.item-title',
+                'a.product-link'
+            ]
+            
+            for t_sel in title_selectors:
+                try:
+                    title_elem = item.select_one(t_sel)
+                    if title_elem:
+                        title_text = (title_elem.get_text(strip=True) or 
+                                    title_elem.get('title', '') or
+                                    title_elem.get('alt', ''))
+                        if title_text and len(title_text) > 3:
+                            title = title_text
+                            break
+                except:
+                    continue
+            
+            # Fallback: If no child selector worked, the item itself might be the title element.
+            if title == "No title":
+                try:
+                    item_text = item.get_text(strip=True)
+                    if item_text and len(item_text) > 5:
+                        title = item_text
+                except:
+                    pass
+
+            # Clean the final extracted title
+            title = clean_nykaa_title(title)
+            
+            # Brand extraction
+            brand = "No brand"
+            brand_selectors = [
+                '[data-testid="product-brand"]',
+                '.brand-name',
+                '.product-brand',
+                '.brand',
+                '.css-1uodvt6'  # Common Nykaa brand class
+            ]
+            
+            for b_sel in brand_selectors:
+                try:
+                    brand_elem = item.select_one(b_sel)
+                    if brand_elem:
+                        brand_text = brand_elem.get_text(strip=True)
+                        if brand_text and len(brand_text) > 1:
+                            brand = brand_text
+                            break
+                except:
+                    continue
+            
+            # Price extraction using our enhanced function
+            print(f"\n--- Processing Nykaa item {idx + 1}: {title[:30]}... ---")
+            price = extract_nykaa_price_from_element(item)
+            
+            # Rating extraction
+            rating = extract_nykaa_rating(item)
+            
+            # Image extraction
+            image = "No image"
+            
+            # Look for loaded images first
+            try:
+                imgs = item.find_all('img')
+                for img in imgs:
+                    src = img.get('src', '')
+                    if (src and len(src) > 10 and 
+                        'nykaa' in src.lower() and
+                        any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
+                        image = src
+                        break
+            except:
+                pass
+            
+            # Look for data-src (lazy loaded images)
+            if image == "No image":
+                try:
+                    imgs = item.find_all('img')
+                    for img in imgs:
+                        data_src = (img.get('data-src') or 
+                                  img.get('data-original') or 
+                                  img.get('data-lazy'))
+                        if (data_src and len(data_src) > 10 and
+                            any(ext in data_src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp'])):
+                            image = data_src
+                            break
+                except:
+                    pass
+            
+            # Any other lazy-loading attribute (srcset, data-bg, background-image)
+            if image == "No image":
+                image = resolve_image_url(item) or "No image"
+            
+            # Fix image URLs
+            if image and image != "No image" and not image.startswith('http'):
+                if image.startswith('//'):
+                    image = 'https:' + image
+                elif image.startswith('/'):
+                    image = 'https://www.nykaa.com' + image
+            
+            # Link extraction
+            link = "#"
+            # Since the main item is now an anchor tag, we get its href directly.
+            try:
+                if item.name == 'a' and item.get('href'):
+                    link = item['href']
+                else:
+                    # Fallback to searching for a link inside the item
+                    link_elem = item.select_one('a[href]')
+                    if link_elem and link_elem.get('href'):
+                        link = link_elem['href']
+            except:
+                pass
+
+            # Make sure the link is absolute
+            if link and link != "#" and not link.startswith('http'):
+                if link.startswith('/'):
+                    link = "https://www.nykaa.com" + link
+                else:
+                    link = "https://www.nykaa.com/" + link
+            
+            # Only add products with meaningful data
+            if (title != "No title" or price != "No price" or image != "No image"):
+                html_products.append({
+                    'title': title,
+                    'price': price,
+                    'rating': rating,
+                    'image': image,
+                    'link': link,
+                    'brand': brand
+                })
+                
+                print(f"✓ Nykaa Product {idx + 1}: {title[:40]}{'...' if len(title) > 40 else ''}, "
+                      f"Price={price}, Brand={brand}, Rating={rating}")
+            
+        except Exception as e:
+            print(f"Error processing Nykaa product {idx + 1}: {e}")
+            continue
+    
+    return html_products
+
+def scrape_ajio(query, max_results=25):
     """
     Enhanced AJIO scraper with improved product detection and data extraction
     """
-    driver = get_driver()
-    
     # AJIO search URL structure
     encoded_query = quote(query)
     url = f"https://www.ajio.com/search/?text={encoded_query}"
@@ -3167,33 +3017,45 @@ def scrape_ajio(query):
     
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
     
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Ajio', url, (extract_ajio_json_data,), (extract_ajio_html_products, max_results))
+    driver = None if http_results is not None else checkout_driver('Ajio')
+    
     try:
-        driver.get(url)
-        
-        # Wait for initial page load
-        wait = WebDriverWait(driver, 20)
-        time.sleep(5)
-        
-        # Enhanced lazy loading scroll for AJIO
-        enhanced_ajio_scroll(driver, max_scrolls=15, scroll_pause=3)
-        
-        # Force load any remaining lazy images
-        force_ajio_lazy_loading(driver)
-        
-        # Additional wait to ensure all content is loaded
-        time.sleep(5)
-        
-        # Debug the first few items to understand structure
-        print("\n=== DEBUGGING AJIO STRUCTURE ===")
-        debug_ajio_structure(driver)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Method 1: Try to extract data from JSON (similar to H&M approach)
-        products_from_json = extract_ajio_json_data(soup)
-        
-        # Method 2: Enhanced HTML parsing with improved product detection
-        html_products = extract_ajio_html_products(soup)
+        if http_results is not None:
+            products_from_json, html_products = http_results
+        else:
+            start_capture(driver, 'Ajio')
+            driver.get(url)
+            
+            # Wait for the product grid instead of the full page load
+            wait_until_ready(driver, 'Ajio')
+            
+            # Enhanced lazy loading scroll for AJIO
+            enhanced_ajio_scroll(driver, max_scrolls=15, scroll_pause=3, target_count=max_results, query=query)
+            
+            # Products the grid fetched from the site's API while loading and scrolling
+            captured = captured_products(driver, 'Ajio', ajio_product_from_json, max_results)
+            if captured:
+                # They are the JSON data, so the selection below treats them as both sources
+                products_from_json = html_products = captured
+            else:
+                # Wait until the product count stops changing instead of a fixed 5 s
+                wait_for_site_settled(driver, 'Ajio', timeout=5)
+                
+                # Debug the first few items to understand structure
+                if DEBUG_STRUCTURE:
+                    print("\n=== DEBUGGING AJIO STRUCTURE ===")
+                    debug_ajio_structure(driver)
+                
+                # Parse the page in the parse process pool:
+                # Method 1 extracts from JSON (similar to H&M approach), Method 2 is
+                # enhanced HTML parsing with improved product detection
+                products_from_json, html_products = parse_and_extract(
+                    driver.page_source,
+                    (extract_ajio_json_data,),
+                    (extract_ajio_html_products, max_results)
+                )
         
         # Combine results intelligently
         if products_from_json and len(products_from_json) >= 10:
@@ -3244,87 +3106,27 @@ def scrape_ajio(query):
             pass
     
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
     
     df = pd.DataFrame(data)
     df['Source'] = 'AJIO'
     return df
 
-def enhanced_ajio_scroll(driver, max_scrolls=15, scroll_pause=3):
+def enhanced_ajio_scroll(driver, max_scrolls=15, scroll_pause=3, target_count=None, query=None):
     """
     Enhanced scrolling function specifically designed for AJIO's lazy loading.
     """
     print("Starting enhanced AJIO lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        time.sleep(scroll_pause)
-        
-        # Check how many product cards have loaded
-        products_loaded = driver.execute_script("""
-            return document.querySelectorAll('[data-testid], .product, .item, [class*="product"], [class*="item"]').length;
-        """)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} product elements detected")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
-    
-    # Final scroll patterns to ensure everything loads
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(2)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(2)
+    scroll_page(
+        driver, card_selector='[data-testid], .product, .item, [class*="product"], [class*="item"]',
+        max_steps=max_scrolls, step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('Ajio'), label="AJIO", site='Ajio', query=query
+    )
     
     print("Enhanced AJIO scrolling complete")
 
-def force_ajio_lazy_loading(driver):
-    """
-    Force load lazy images and content specific to AJIO
-    """
-    try:
-        driver.execute_script("""
-            // Force load images with data-src attributes
-            const lazyImages = document.querySelectorAll('img[data-src], img[data-original], img[data-lazy-src]');
-            lazyImages.forEach(img => {
-                const dataSrc = img.dataset.src || img.dataset.original || img.dataset.lazySrc;
-                if (dataSrc && !img.src.includes(dataSrc)) {
-                    img.src = dataSrc;
-                }
-            });
-            
-            // Trigger intersection observer manually
-            const allImages = document.querySelectorAll('img');
-            allImages.forEach(img => {
-                img.scrollIntoView({ behavior: 'auto', block: 'center' });
-            });
-            
-            // Force any lazy loading mechanisms
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-        """)
-        time.sleep(2)
-        print("Forced AJIO lazy loading completed")
-    except Exception as e:
-        print(f"Error in AJIO forced lazy loading: {e}")
-
 def debug_ajio_structure(driver):
     """
     Debug function to inspect AJIO's HTML structure
@@ -3427,29 +3229,9 @@ def extract_ajio_json_data(soup):
                                 
                                 for product in temp_data:
                                     try:
-                                        # Extract title
-                                        title = (product.get('name') or 
-                                               product.get('title') or 
-                                               product.get('productName') or
-                                               product.get('displayName') or 'No title')
-                                        
-                                        # Extract price
-                                        price = extract_ajio_price_from_json(product)
-                                        
-                                        # Extract image
-                                        image = extract_ajio_image_from_json(product)
-                                        
-                                        # Extract link
-                                        link = extract_ajio_link_from_json(product)
-                                        
-                                        if title != "No title" or price != "No price":
-                                            products_from_json.append({
-                                                'title': title,
-                                                'price': price,
-                                                'image': image,
-                                                'link': link
-                                            })
-                                            
+                                        record = ajio_product_from_json(product)
+                                        if record:
+                                            products_from_json.append(record)
                                     except Exception as e:
                                         continue
                                         
@@ -3467,6 +3249,32 @@ def extract_ajio_json_data(soup):
     
     return products_from_json
 
+def ajio_product_from_json(product):
+    """One AJIO product record from a JSON product object, or None if it has neither title nor price"""
+    # Extract title
+    title = (product.get('name') or 
+           product.get('title') or 
+           product.get('productName') or
+           product.get('displayName') or 'No title')
+    
+    # Extract price
+    price = extract_ajio_price_from_json(product)
+    
+    # Extract image
+    image = extract_ajio_image_from_json(product)
+    
+    # Extract link
+    link = extract_ajio_link_from_json(product)
+    
+    if title == "No title" and price == "No price":
+        return None
+    return {
+        'title': title,
+        'price': price,
+        'image': image,
+        'link': link
+    }
+
 def extract_ajio_price_from_json(product):
     """Extract price from AJIO JSON product data"""
     price = "No price"
@@ -3556,7 +3364,7 @@ def extract_ajio_link_from_json(product):
     
     return link
 
-def extract_ajio_html_products(soup):
+def extract_ajio_html_products(soup, max_results=25):
     """
     Enhanced HTML parsing for AJIO products with better selectors
     """
@@ -3652,12 +3460,14 @@ def extract_ajio_html_products(soup):
                 ]):
                     items.append(elem)
         
-        items = items[:25]  # Limit to reasonable number
+        items = items[:max_results]  # Limit to reasonable number
         print(f"Found {len(items)} items using fallback method")
     
-    print(f"Processing {min(len(items), 25)} AJIO products...")
+    print(f"Processing {min(len(items), max_results)} AJIO products...")
     
-    for idx, item in enumerate(items[:25]):
+    for idx, item in enumerate(items[:max_results]):
+        if deadline_reached('extract'):
+            break
         try:
             # Extract title with AJIO-specific selectors
             title = extract_ajio_title(item)
@@ -3859,6 +3669,10 @@ def extract_ajio_image(item):
                     image = data_src
                     break
         
+        # Any other lazy-loading attribute (srcset, data-bg, background-image)
+        if image == "No image":
+            image = resolve_image_url(img_container) or "No image"
+        
         # Fix relative URLs
         if image and image != "No image" and not image.startswith('http'):
             if image.startswith('//'):
@@ -0,0 +1,223 @@
+import time
+from selenium.common.exceptions import WebDriverException
+from waits import GRID_QUIET_MS, NETWORK_IDLE_MS, SITE_READINESS, is_network_idle
+from scroll_profiles import plan_budget, record_run
+from deadlines import EXTRACT_RESERVE, current_deadline, mark_partial
+from lazy_images import LAZY_IMAGE_ATTRS, IMAGE_ELEMENT_SELECTOR, PLACEHOLDER_HINTS
+
+
+# One scroll step, run inside the page by execute_async_script: scroll to
+# `where` (a y offset, 'bottom', 'top', 'middle', or null to stay put), then
+# wait until `minCount` cards exist or the DOM has been quiet for settleMs
+# (MutationObserver), capped at timeoutMs. Resolves with the page's state so
+# scroll_page() can decide on the next step between calls.
+_STEP_SCRIPT = """
+    const [cfg, where, minCount, timeoutMs] = arguments;
+    const done = arguments[arguments.length - 1];
+
+    if (!window.__gridWatch) {
+        const watch = window.__gridWatch = {lastChange: performance.now()};
+        new MutationObserver(() => { watch.lastChange = performance.now(); })
+            .observe(document.documentElement, {childList: true, subtree: true, attributeFilter: ['src', 'srcset']});
+    }
+    const grid = window.__gridWatch;
+
+    const height = () => document.body ? document.body.scrollHeight : 0;
+    const count = () => cfg.selector ? document.querySelectorAll(cfg.selector).length : 0;
+    const atBottom = () => window.scrollY + window.innerHeight >= height() - 50;
+
+    // A card is ready once it (or an image inside it) carries a real URL in
+    // any of the attributes the extractors read (lazy_images.LAZY_IMAGE_ATTRS)
+    const hasImageUrl = el => {
+        const candidates = el.matches('img, source') ? [el] : el.querySelectorAll(cfg.imageSelector);
+        for (const candidate of candidates) {
+            for (const attr of cfg.imageAttrs) {
+                const value = candidate.getAttribute(attr);
+                if (value && !value.startsWith('data:')
+                        && !cfg.placeholderHints.some(hint => value.toLowerCase().includes(hint))) {
+                    return true;
+                }
+            }
+        }
+        return false;
+    };
+    // Site selector lists match nested elements of one product (a grid item
+    // and the card inside it, Vue/Bootstrap attributes on several divs), and
+    // sometimes the grid itself, so ready matches are counted once per
+    // product link rather than once per element
+    const linkSelector = 'a[href]:not([href^="#"]):not([href^="javascript"])';
+    const productKey = el => {
+        const link = el.matches(linkSelector) ? el : (el.closest(linkSelector) || el.querySelector(linkSelector));
+        return link ? link.href : el;
+    };
+    const readyCards = () => {
+        if (!(cfg.targetCount > 0 && cfg.targetSelector)) return 0;
+        const products = new Set();
+        for (const el of document.querySelectorAll(cfg.targetSelector)) {
+            if (hasImageUrl(el)) products.add(productKey(el));
+        }
+        return products.size;
+    };
+
+    if (where === 'bottom') window.scrollTo(0, height());
+    else if (where === 'top') window.scrollTo(0, 0);
+    else if (where === 'middle') window.scrollTo(0, height() / 2);
+    else if (where !== null) window.scrollTo(0, where);
+
+    const start = performance.now();
+    (function check() {
+        const now = performance.now();
+        if ((minCount > 0 && count() >= minCount)
+                || now - Math.max(grid.lastChange, start) >= cfg.settleMs
+                || now - start >= timeoutMs) {
+            done({cards: count(), height: height(), ready_cards: readyCards(), at_bottom: atBottom()});
+        } else {
+            setTimeout(check, 50);
+        }
+    })();
+"""
+
+
+def _scroll_step(driver, config, where, min_count, timeout):
+    """Run one _STEP_SCRIPT call, waiting at most `timeout` seconds in the page"""
+    return driver.execute_async_script(_STEP_SCRIPT, config, where, min_count, max(0, int(timeout * 1000)))
+
+
+def scroll_page(driver, card_selector=None, max_steps=15, step_timeout=3, mode='incremental',
+                stop='height', patience=5, settle_ms=GRID_QUIET_MS, idle_ms=NETWORK_IDLE_MS,
+                final_passes=('bottom', 'top', 'middle'), target_count=None, target_selector=None,
+                label="Page", site=None, query=None):
+    """
+    Scroll a lazy-loading page, one bounded WebDriver round trip per step.
+
+    mode:  'incremental' scrolls in max_steps equal slices of the page height,
+           'bottom' jumps to the bottom on every step.
+    stop:  'height' stops when the page height stops growing near the end of
+           the budget (the last `patience` steps); 'cards' stops after
+           `patience` steps without a new `card_selector` match.
+           Either way the loop also stops once it is at the bottom with no
+           XHR/fetch in flight for `idle_ms` (waits.is_network_idle).
+    Each step waits at most `step_timeout` seconds, less if a new card renders
+    or the DOM stays quiet for `settle_ms`. In tabs mode the shared browser
+    is only held for one step at a time, so other windows' scrapes interleave.
+    target_count: the number of results the caller will keep. Scrolling stops
+           as soon as that many products (`target_selector` matches,
+           default `card_selector`, counted once per product link) have a
+           resolved image URL.
+    site/query: when given, max_steps and step_timeout are only the defaults;
+           the budget is tightened from earlier runs of the same site and
+           query class (see scroll_profiles) and this run is recorded.
+
+    Inside a deadline_scope() the scroll ends EXTRACT_RESERVE seconds before
+    the job's deadline (stop_reason 'deadline') and the job is flagged partial.
+
+    Returns a summary dict: cards, ready_cards, steps, heights, elapsed_ms,
+    productive_steps, productive_ms, stop_reason.
+    """
+    if site:
+        max_steps, step_timeout = plan_budget(site, query, max_steps, step_timeout)
+
+    config = {
+        'selector': card_selector,
+        'settleMs': settle_ms,
+        'targetCount': target_count or 0,
+        'targetSelector': target_selector or card_selector,
+        'imageAttrs': list(LAZY_IMAGE_ATTRS),
+        'imageSelector': IMAGE_ELEMENT_SELECTOR,
+        'placeholderHints': list(PLACEHOLDER_HINTS),
+    }
+    summary = {'cards': 0, 'ready_cards': 0, 'steps': 0, 'heights': [], 'elapsed_ms': 0,
+               'productive_steps': 0, 'productive_ms': 0, 'stop_reason': 'error'}
+
+    started = time.monotonic()
+    ends_at = None
+    deadline = current_deadline()
+    if deadline is not None:
+        scroll_time = deadline.remaining() - EXTRACT_RESERVE
+        if scroll_time <= 0:
+            print(f"{label} scroll skipped: out of time")
+            mark_partial('scroll')
+            summary['stop_reason'] = 'deadline'
+            return summary
+        ends_at = started + scroll_time
+
+    def time_up():
+        return ends_at is not None and time.monotonic() >= ends_at
+
+    def step(where, min_count, timeout=step_timeout):
+        if ends_at is not None:
+            timeout = min(timeout, ends_at - time.monotonic())
+        state = _scroll_step(driver, config, where, min_count, timeout)
+        summary['cards'] = state['cards']
+        summary['ready_cards'] = state['ready_cards']
+        return state
+
+    def target_reached(state):
+        return bool(target_count) and state['ready_cards'] >= target_count
+
+    try:
+        # Worst case one step runs into its timeout
+        driver.set_script_timeout(step_timeout + 10)
+        state = step(None, 0, timeout=0)
+        last_height = state['height']
+        best = state['cards']
+        unchanged = 0
+        reason = 'target' if target_reached(state) else 'max_steps'
+
+        for i in range(max_steps):
+            if reason == 'target':
+                break
+            if time_up():
+                reason = 'deadline'
+                break
+            state = step('bottom' if mode == 'bottom' else (i + 1) * last_height / max_steps,
+                         best + 1 if card_selector else 0)
+            summary['steps'] = i + 1
+            h, c = state['height'], state['cards']
+            summary['heights'].append(h)
+            grew = c > best if stop == 'cards' else h != last_height
+            if c > best or h != last_height:
+                summary['productive_steps'] = i + 1
+                summary['productive_ms'] = int((time.monotonic() - started) * 1000)
+            best = max(best, c)
+            last_height = h
+            unchanged = 0 if grew else unchanged + 1
+
+            if target_reached(state):
+                reason = 'target'
+                break
+            if not grew:
+                stable = unchanged >= patience if stop == 'cards' else i > max_steps - patience
+                if stable:
+                    reason = 'stable'
+                    break
+                if state['at_bottom'] and is_network_idle(driver, idle_ms):
+                    reason = 'network_idle'
+                    break
+
+        # The final passes only exist to trigger stragglers; skip them once
+        # enough cards are ready or the job is out of time
+        if reason not in ('target', 'deadline'):
+            for where in final_passes:
+                if time_up():
+                    break
+                step(where, 0)
+        summary['stop_reason'] = reason
+    except WebDriverException as e:
+        print(f"{label} scroll failed: {e}")
+    except (KeyError, TypeError) as e:
+        print(f"{label} scroll failed in page: {e}")
+
+    summary['elapsed_ms'] = int((time.monotonic() - started) * 1000)
+    print(f"{label} scroll: {summary['cards']} cards after {summary['steps']} steps "
+          f"({summary['stop_reason']}, {summary['elapsed_ms']} ms)")
+    if summary['stop_reason'] == 'deadline':
+        mark_partial('scroll')
+    if site:
+        record_run(site, query, summary)
+    return summary
+
+
+def site_card_selector(site):
+    """Product-card selector for `site` (the one its readiness wait uses)"""
+    return SITE_READINESS[site][0]
@@ -0,0 +1,105 @@
+import json
+import math
+import os
+import threading
+
+
+# Where learned scroll budgets are kept between runs.
+PROFILE_PATH = os.environ.get(
+    "SCRAPER_SCROLL_PROFILES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scroll_profiles.json")
+)
+
+# Runs recorded per site/query class before the learned budget is trusted.
+MIN_RUNS = 3
+
+# Every Nth run uses the full hard-coded budget again, so a site that starts
+# loading more (or slower) isn't stuck with a budget that is too tight.
+EXPLORE_EVERY = 10
+
+# Learned budget = slowest recent productive run * SAFETY_MARGIN, plus one step.
+SAFETY_MARGIN = 1.25
+
+# How many recent runs are kept per site/query class.
+HISTORY_SIZE = 20
+
+_profiles = None
+_lock = threading.Lock()
+
+
+def query_class(query):
+    """
+    Coarse bucket for a search query: its last word, which is usually the
+    product type ("blue jeans" -> "jeans", "oversized t shirt" -> "shirt").
+    """
+    words = (query or "").lower().split()
+    return words[-1] if words else "*"
+
+
+def _load():
+    global _profiles
+    if _profiles is None:
+        try:
+            with open(PROFILE_PATH) as f:
+                _profiles = json.load(f)
+        except (OSError, ValueError):
+            _profiles = {}
+    return _profiles
+
+
+def _save():
+    tmp_path = PROFILE_PATH + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(_profiles, f, indent=2)
+        os.replace(tmp_path, PROFILE_PATH)
+    except OSError as e:
+        print(f"Could not save scroll profiles: {e}")
+
+
+def _key(site, query):
+    return f"{site}|{query_class(query)}"
+
+
+def plan_budget(site, query, max_steps, step_timeout):
+    """
+    Return (max_steps, step_timeout) for the next scroll of `site`.
+    Falls back to the caller's hard-coded budget until MIN_RUNS runs are
+    recorded, and on every EXPLORE_EVERY-th run.
+    """
+    with _lock:
+        profile = _load().get(_key(site, query))
+        if not profile or len(profile["history"]) < MIN_RUNS:
+            return max_steps, step_timeout
+        if profile["runs"] % EXPLORE_EVERY == 0:
+            print(f"{site}: exploring with the full scroll budget")
+            return max_steps, step_timeout
+        history = list(profile["history"])
+
+    needed_steps = max(steps for steps, _ in history)
+    planned_steps = min(max_steps, max(2, math.ceil(needed_steps * SAFETY_MARGIN) + 1))
+
+    # Per-step wait: the slowest observed time per productive step, with margin
+    per_step = max((ms / steps for steps, ms in history if steps), default=step_timeout * 1000)
+    planned_timeout = min(step_timeout, max(1, math.ceil(per_step * SAFETY_MARGIN / 1000)))
+
+    print(f"{site}: learned scroll budget {planned_steps} steps x {planned_timeout}s "
+          f"(default {max_steps} x {step_timeout}s)")
+    return planned_steps, planned_timeout
+
+
+def record_run(site, query, summary):
+    """
+    Remember how many steps (and how long) actually produced new cards in a
+    scroll_page() run.
+    """
+    # Failed and deadline-truncated runs say nothing about what the site needs
+    if summary.get("stop_reason") in ("error", "deadline"):
+        return
+    with _lock:
+        profiles = _load()
+        profile = profiles.setdefault(_key(site, query), {"runs": 0, "history": []})
+        profile["runs"] += 1
+        profile["history"].append([summary.get("productive_steps", 0), summary.get("productive_ms", 0)])
+        profile["history"] = profile["history"][-HISTORY_SIZE:]
+        _save()
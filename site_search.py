@@ -0,0 +1,75 @@
+import time
+
+from scrapers import (
+    scrape_amazon,
+    scrape_myntra,
+    scrape_nykaa,
+    scrape_flipkart,
+    scrape_zara,
+    scrape_hnm,
+    scrape_levis,
+    scrape_lifestyle,
+    scrape_ajio,
+)
+from savana import scrape_westside, scrape_urbanic
+from libass import scrape_libas
+from montecarlo import scrape_monte_carlo
+from souledstore import scrape_souled_store
+from deadlines import SITE_TIME_BUDGET, deadline_scope
+
+
+# Site name -> scraper(query) returning a DataFrame with a Source column
+SCRAPER_FUNCTIONS = {
+    "Amazon": scrape_amazon,
+    "Myntra": scrape_myntra,
+    "Nykaa": scrape_nykaa,
+    "Flipkart": scrape_flipkart,
+    "Zara": scrape_zara,
+    "H&M": scrape_hnm,
+    "Levi's": scrape_levis,
+    "Lifestyle": scrape_lifestyle,
+    "Ajio": scrape_ajio,
+    "Urbanic": scrape_urbanic,
+    "Westside": scrape_westside,
+    "Libas": scrape_libas,
+    "Monte Carlo": scrape_monte_carlo,
+    "Souled Store": scrape_souled_store
+}
+
+# Site name -> domain its scraper loads, for per-domain concurrency limits
+SITE_DOMAINS = {
+    "Amazon": "amazon.in",
+    "Myntra": "myntra.com",
+    "Nykaa": "nykaa.com",
+    "Flipkart": "flipkart.com",
+    "Zara": "zara.com",
+    "H&M": "hm.com",
+    "Levi's": "levi.in",
+    "Lifestyle": "lifestylestores.com",
+    "Ajio": "ajio.com",
+    "Urbanic": "urbanic.com",
+    "Westside": "westside.com",
+    "Libas": "libas.in",
+    "Monte Carlo": "montecarlo.in",
+    "Souled Store": "thesouledstore.com"
+}
+
+
+def run_site(site, query, budget=SITE_TIME_BUDGET):
+    """
+    Run one site's scraper under a time budget. Returns
+    {'site', 'query', 'df', 'error', 'elapsed', 'partial'}: `df` is None when the
+    scraper raised, `partial` is True when it ran out of time and returned
+    only what it had extracted by then.
+    """
+    started = time.time()
+    result = {'site': site, 'query': query, 'df': None, 'error': None, 'elapsed': 0, 'partial': False}
+    with deadline_scope(budget, label=site) as deadline:
+        try:
+            result['df'] = SCRAPER_FUNCTIONS[site](query)
+        except Exception as e:
+            print(f"Error scraping {site}: {e}")
+            result['error'] = str(e)
+        result['partial'] = bool(deadline and deadline.partial)
+    result['elapsed'] = time.time() - started
+    return result
@@ -1,70 +1,55 @@
 import pandas as pd
-import time
 import re
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import quote
 import json
+from driver_pool import checkout_driver, checkin_driver
+from scroll_engine import scroll_page, site_card_selector
+from deadlines import deadline_reached
+from parse_pool import DEBUG_STRUCTURE, parse_and_extract
+from fetch_strategy import try_http
+from waits import wait_until_ready, wait_for_site_settled
+from lazy_images import resolve_image_url
 
 
-def get_driver():
-    """
-    Set up and return a WebDriver instance
-    """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
-    return driver
-
-
-def scrape_souled_store(query):
+def scrape_souled_store(query, max_results=60):
     """
     The Souled Store scraper that scrapes one page of results with lazy loading support.
     """
-    driver = get_driver()
     encoded_query = quote(query)
     url = f"https://www.thesouledstore.com/search?q={encoded_query}"
     
     all_products = []
 
+    # Cheap path first: the search page over plain HTTP, when it carries the products
+    http_results = try_http('Souled Store', url, (extract_souled_store_html_products, max_results))
+    driver = None if http_results is not None else checkout_driver('Souled Store')
+    
     try:
         print(f"\n--- Scraping The Souled Store: {url} ---")
         
-        driver.get(url)
-        wait = WebDriverWait(driver, 30)
-        
-        # Wait for the main product container to load
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-v-bd99a1be].row, .productCard, .col-lg-3')))
-            time.sleep(5)
-            print("Initial page loaded successfully")
-        except:
-            print("No products found or page failed to load.")
-            return pd.DataFrame({"Title": [], "Price": [], "Image": [], "Link": [], "Source": []})
-
-        # Enhanced scrolling for lazy loading
-        enhanced_souled_store_scroll(driver, max_scrolls=20, scroll_pause=3)
-        force_souled_store_lazy_loading(driver)
-        time.sleep(8)
-
-        print(f"\n=== DEBUGGING SOULED STORE STRUCTURE ===")
-        debug_souled_store_structure(driver)
-        
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        html_products = extract_souled_store_html_products(soup)
+        if http_results is not None:
+            html_products = http_results[0]
+        else:
+            driver.get(url)
+            
+            # Wait for the main product container to load
+            if not wait_until_ready(driver, 'Souled Store', timeout=30):
+                print("No products found or page failed to load.")
+                return pd.DataFrame({"Title": [], "Price": [], "Image": [], "Link": [], "Source": []})
+
+            # Enhanced scrolling for lazy loading
+            enhanced_souled_store_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=max_results, query=query)
+            wait_for_site_settled(driver, 'Souled Store', timeout=8)
+
+            if DEBUG_STRUCTURE:
+                print(f"\n=== DEBUGGING SOULED STORE STRUCTURE ===")
+                debug_souled_store_structure(driver)
+            
+            html_products = parse_and_extract(driver.page_source, (extract_souled_store_html_products, max_results))[0]
         print(f"Found {len(html_products)} products from HTML parsing")
         all_products.extend(html_products)
 
@@ -75,7 +60,8 @@ def scrape_souled_store(query):
         except:
             pass
     finally:
-        driver.quit()
+        if driver is not None:
+            checkin_driver(driver)
 
     # Create DataFrame from all collected products
     data = {"Title": [], "Price": [], "Image": [], "Link": []}
@@ -114,173 +100,28 @@ def scrape_souled_store(query):
     return df
 
 
-def enhanced_souled_store_scroll(driver, max_scrolls=20, scroll_pause=3):
+def enhanced_souled_store_scroll(driver, max_scrolls=20, scroll_pause=3, target_count=None, query=None):
     """
     Enhanced scrolling function specifically designed for The Souled Store's lazy loading.
     """
     print("Starting enhanced Souled Store lazy loading scroll...")
     
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    loaded_products_count = 0
-    
-    for i in range(max_scrolls):
-        # Scroll down in smaller increments to trigger lazy loading
-        current_position = (i + 1) * (last_height / max_scrolls)
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        
-        # Wait for content to load
-        time.sleep(scroll_pause)
-        
-        # Check for Souled Store specific product containers
-        js_script = """
-            return document.querySelectorAll(
-                '[data-v-bd99a1be].col-lg-3, .productCard, ' +
-                '[data-v-2d5b3c05][data-v-bd99a1be].productCard, .animate-card'
-            ).length;
-        """
-        products_loaded = driver.execute_script(js_script)
-        
-        if products_loaded > loaded_products_count:
-            loaded_products_count = products_loaded
-            print(f"Scroll {i+1}/{max_scrolls}: {loaded_products_count} product elements detected")
-        
-        # Check if page height changed (more content loaded)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            if i > max_scrolls - 5:
-                print("Page height stabilized, finishing scroll...")
-                break
-        else:
-            last_height = new_height
+    # Check for Souled Store specific product containers
+    product_selector = (
+        '[data-v-bd99a1be].col-lg-3, .productCard, ' +
+        '[data-v-2d5b3c05][data-v-bd99a1be].productCard, .animate-card'
+    )
     
-    # Final scroll patterns to ensure everything loads
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(scroll_pause)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(3)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-    time.sleep(3)
+    scroll_page(
+        driver, card_selector=product_selector, max_steps=max_scrolls,
+        step_timeout=scroll_pause, target_count=target_count,
+        target_selector=site_card_selector('Souled Store'), label="Souled Store",
+        site='Souled Store', query=query
+    )
     
     print("Enhanced Souled Store scrolling complete")
 
 
-def force_souled_store_lazy_loading(driver):
-    """
-    Force load lazy images and content specific to The Souled Store
-    """
-    try:
-        print("Forcing Souled Store lazy loading...")
-        
-        # Strategy 1: Handle standard lazy loading patterns
-        js_strategy_1 = """
-            console.log('Starting Souled Store image lazy loading...');
-            const lazyImages = document.querySelectorAll(
-                'img[data-src], img[data-original], img[data-lazy-src], ' +
-                'img[data-srcset], img[loading="lazy"], img[class*="lazy"], ' +
-                'img[class*="lazyload"], .customFade img, .imgBlock img'
-            );
-            console.log('Found', lazyImages.length, 'lazy images');
-            lazyImages.forEach((img, index) => {
-                const dataSrc = img.dataset.src || img.dataset.original || 
-                               img.dataset.lazySrc || img.dataset.srcset;
-                if (dataSrc && !img.src.includes(dataSrc)) {
-                    console.log('Loading Souled Store image', index, ':', dataSrc);
-                    img.src = dataSrc;
-                    img.removeAttribute('loading');
-                }
-            });
-            return lazyImages.length;
-        """
-        driver.execute_script(js_strategy_1)
-        time.sleep(4)
-        
-        # Strategy 2: Trigger scroll and visibility events specifically for product cards
-        js_strategy_2 = """
-            console.log('Triggering Souled Store scroll and resize events...');
-            const productCards = document.querySelectorAll('.productCard, [data-v-2d5b3c05].productCard');
-            productCards.forEach((card, index) => {
-                try {
-                    card.scrollIntoView({ behavior: 'auto', block: 'center' });
-                    const images = card.querySelectorAll('img');
-                    images.forEach(img => {
-                        img.dispatchEvent(new Event('load'));
-                        img.dispatchEvent(new Event('appear'));
-                        img.dispatchEvent(new Event('inview'));
-                        img.dispatchEvent(new Event('scroll'));
-                        img.classList.add('customFade-active');
-                    });
-                } catch(e) {
-                    console.log('Error with Souled Store product card', index, ':', e);
-                }
-            });
-            window.dispatchEvent(new Event('scroll'));
-            window.dispatchEvent(new Event('resize'));
-            window.dispatchEvent(new Event('load'));
-            return productCards.length;
-        """
-        driver.execute_script(js_strategy_2)
-        time.sleep(4)
-        
-        # Strategy 3: Handle Souled Store specific image containers and Vue.js lazy loading
-        js_strategy_3 = """
-            console.log('Handling Souled Store Vue.js lazy loading...');
-            const imageBlocks = document.querySelectorAll(
-                '.imgBlock img, .customFade img, [data-v-2d5b3c05] img'
-            );
-            imageBlocks.forEach((img, index) => {
-                const possibleSrcs = [
-                    img.dataset.src, img.dataset.original, img.dataset.lazySrc, 
-                    img.dataset.srcset, img.getAttribute('src')
-                ];
-                for (let src of possibleSrcs) {
-                    if (src && src.includes('http') && !img.src.includes(src)) {
-                        console.log('Loading Souled Store block image', index, ':', src);
-                        img.src = src;
-                        break;
-                    }
-                }
-                // Remove lazy loading classes and add active classes
-                img.classList.remove('lazyload', 'lazy');
-                img.classList.add('customFade-active', 'gm-loaded');
-                img.parentElement?.classList.add('loaded');
-            });
-            return imageBlocks.length;
-        """
-        driver.execute_script(js_strategy_3)
-        time.sleep(4)
-        
-        # Strategy 4: Force Vue.js component updates
-        js_strategy_4 = """
-            console.log('Forcing Vue.js component updates...');
-            // Trigger intersection observer callbacks
-            if (window.IntersectionObserver) {
-                const images = document.querySelectorAll('img');
-                images.forEach(img => {
-                    if (img.getBoundingClientRect().top < window.innerHeight) {
-                        const event = new Event('intersect');
-                        img.dispatchEvent(event);
-                    }
-                });
-            }
-            
-            // Force Vue reactivity updates
-            const vueElements = document.querySelectorAll('[data-v-2d5b3c05], [data-v-bd99a1be]');
-            vueElements.forEach(el => {
-                el.dispatchEvent(new Event('update'));
-                el.dispatchEvent(new Event('mounted'));
-            });
-            
-            return vueElements.length;
-        """
-        driver.execute_script(js_strategy_4)
-        time.sleep(3)
-        
-        print("Souled Store lazy loading strategies completed")
-        
-    except Exception as e:
-        print(f"Error in Souled Store forced lazy loading: {e}")
-
-
 def debug_souled_store_structure(driver):
     """
     Debug function to inspect The Souled Store's HTML structure
@@ -343,7 +184,7 @@ def debug_souled_store_structure(driver):
         print(f"Error in Souled Store debug function: {e}")
 
 
-def extract_souled_store_html_products(soup):
+def extract_souled_store_html_products(soup, max_results=60):
     """
     HTML parsing for The Souled Store products based on the specified structure
     """
@@ -366,7 +207,9 @@ def extract_souled_store_html_products(soup):
     product_cols = main_row.select('[data-v-bd99a1be].col-lg-3, .col-lg-3, .animate-card')
     print(f"Found {len(product_cols)} product columns")
     
-    for idx, col in enumerate(product_cols[:60]):  # Limit to avoid too many products
+    for idx, col in enumerate(product_cols[:max_results]):  # Limit to avoid too many products
+        if deadline_reached('extract'):
+            break
         try:
             # Find the product card within the column
             product_card = col.select_one('[data-v-2d5b3c05][data-v-bd99a1be].productCard, .productCard')
@@ -531,26 +374,12 @@ def extract_souled_store_image(product_card):
             img_elem = product_card.select_one('img')
         
         if img_elem:
-            # Check primary src first
-            src = img_elem.get('src', '')
-            
-            # Skip logo and placeholder images
-            if src and not any(skip in src.lower() for skip in [
-                'logo', 'placeholder', 'blank', 'loading', 'spinner', 'default'
-            ]):
-                if len(src) > 15:
-                    return format_souled_store_image_url(src)
+            # Real URL from src or the lazy-loading attributes
+            src = resolve_image_url(img_elem)
             
-            # Check data attributes for lazy loading
-            for attr in ['data-src', 'data-original', 'data-lazy-src', 'srcset', 'data-srcset']:
-                data_src = img_elem.get(attr)
-                if data_src:
-                    # For srcset, take the first URL
-                    if 'srcset' in attr:
-                        data_src = data_src.split(' ')[0]
-                    
-                    if len(data_src) > 15:
-                        return format_souled_store_image_url(data_src)
+            # Skip logo and default images
+            if src and len(src) > 15 and not any(skip in src.lower() for skip in ['logo', 'default']):
+                return format_souled_store_image_url(src)
         
     except Exception as e:
         print(f"Error extracting Souled Store image: {e}")
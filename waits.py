@@ -0,0 +1,321 @@
+import json
+import os
+import re
+import threading
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from deadlines import EXTRACT_RESERVE, time_left
+
+
+# Per-site readiness predicate: the product-card selector each scraper already
+# relies on, and how many cards must be in the DOM before extraction can start.
+SITE_READINESS = {
+    'Amazon': ("div[data-component-type='s-search-result']", 4),
+    'Flipkart': ("div[data-id]", 4),
+    'Myntra': ("li.product-base", 4),
+    'Bewakoof': ('a[data-testid="product-card-link"]', 4),
+    'Zara': ("li.product-grid-product, div.product-grid-product, li.product-item, div.product-item, li.layout-product", 4),
+    'H&M': ("article.hm-product-item, article[data-articlecode], div[data-articlecode], li.product-item", 4),
+    "Levi's": (".product-item, .product-card, [data-product-id], [data-product-handle]", 4),
+    'Lifestyle': (".product-item, .product-card, .product-tile, [data-product-id], [data-product-code]", 4),
+    'Nykaa': ('[data-testid="product-card"], .product-item, .nykaa-product, .css-xrzmfa, a.css-qlopj4, div.product-list-box', 4),
+    'Ajio': ('.rilrtl-products-list__item, [data-testid*="product"], .product-tile, .item-card', 4),
+    'Urbanic': ('a[class*="index-module_verticalCard"], a[class*="verticalCard"]', 4),
+    'Westside': ("article.card-wrapper, .card-wrapper, li.grid__item, [data-product-handle]", 4),
+    'Libas': ('div[data-v-74577c89], .product-card, .st-product', 1),
+    'Monte Carlo': ('.product-list__inner .product-item, .product-item', 1),
+    'Souled Store': ('[data-v-bd99a1be].row, .productCard, .col-lg-3', 1),
+}
+
+DEFAULT_READY_TIMEOUT = 20
+
+_COUNT_SCRIPT = """
+    return [document.querySelectorAll(arguments[0]).length, document.readyState];
+"""
+
+
+def wait_for_min_count(driver, selector, min_count=1, timeout=DEFAULT_READY_TIMEOUT, poll=0.25):
+    """
+    Wait until at least `min_count` elements match `selector`.
+    A fully loaded page with fewer (but some) matches also counts as ready,
+    so short result lists don't wait for the whole timeout.
+    Returns True when ready, False on timeout.
+    """
+    def grid_ready(d):
+        count, ready_state = d.execute_script(_COUNT_SCRIPT, selector)
+        return count >= min_count or (ready_state == 'complete' and count > 0)
+
+    # Scripts can fail while the document is still being replaced (e.g. with
+    # the "none" page-load strategy used for shared-browser tabs); keep polling
+    try:
+        WebDriverWait(driver, time_left(timeout, EXTRACT_RESERVE), poll_frequency=poll,
+                      ignored_exceptions=[WebDriverException]).until(grid_ready)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_until_ready(driver, site, timeout=DEFAULT_READY_TIMEOUT):
+    """
+    Block until `site`'s product grid exists, instead of waiting for the full
+    load event. Meant to be called right after driver.get() with the eager
+    page-load strategy.
+    """
+    if site not in SITE_READINESS:
+        return True
+
+    selector, min_count = SITE_READINESS[site]
+    ready = wait_for_min_count(driver, selector, min_count=min_count, timeout=timeout)
+    if ready:
+        print(f"{site}: product grid ready")
+    else:
+        print(f"{site}: product grid not ready after {timeout}s, continuing anyway...")
+    return ready
+
+
+# One round trip: [matching elements, page height, total DOM nodes]
+_SNAPSHOT_SCRIPT = """
+    const selector = arguments[0];
+    return [
+        selector ? document.querySelectorAll(selector).length : 0,
+        document.body ? document.body.scrollHeight : 0,
+        document.getElementsByTagName('*').length
+    ];
+"""
+
+
+def page_snapshot(driver, selector=None):
+    """Return (count of `selector` matches, scrollHeight, DOM node count)"""
+    return tuple(driver.execute_script(_SNAPSHOT_SCRIPT, selector))
+
+
+def wait_for_count_stable(driver, selector, stable_ms=1000, timeout=10, poll=0.2):
+    """
+    Wait until the number of `selector` matches has stopped changing for
+    `stable_ms` milliseconds (or `timeout` seconds pass). Returns the count.
+    """
+    deadline = time.monotonic() + time_left(timeout, EXTRACT_RESERVE)
+    last_count = None
+    stable_since = time.monotonic()
+    while True:
+        try:
+            count = page_snapshot(driver, selector)[0]
+        except WebDriverException:
+            count = last_count
+        now = time.monotonic()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif (now - stable_since) * 1000 >= stable_ms:
+            return count
+        if now >= deadline:
+            return count
+        time.sleep(poll)
+
+
+def wait_for_site_settled(driver, site, stable_ms=1000, timeout=10):
+    """wait_for_count_stable() on `site`'s product-card selector"""
+    selector = SITE_READINESS[site][0]
+    return wait_for_count_stable(driver, selector, stable_ms=stable_ms, timeout=timeout)
+
+
+# How long the product grid must go without DOM mutations to count as
+# settled (the MutationObserver in scroll_engine's step script)
+GRID_QUIET_MS = 600
+
+# Record Chrome's performance log (CDP Network events), so the scroll loop can
+# tell when a storefront has stopped fetching and API responses can be captured.
+NETWORK_LOG = os.environ.get("SCRAPER_NETWORK_LOG", "1") != "0"
+
+# Resource types whose requests count as "the storefront is still fetching".
+NETWORK_IDLE_TYPES = ('XHR', 'Fetch')
+
+# How long no XHR/fetch may be in flight before the network counts as idle.
+NETWORK_IDLE_MS = 500
+
+
+class NetworkTracker:
+    """
+    Follows in-flight XHR/fetch requests from Chrome's performance log
+    (enabled in driver_pool.build_chrome_options). Events are kept per window
+    ("webview"), so windows of a shared TabPool browser don't see each
+    other's traffic even though they drain the same log. It also collects the
+    request ids of responses matching a capture pattern (see capture()), since
+    the log can only be drained once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._last_activity = {}
+        self._capture_patterns = {}
+        self._captured = {}
+        self.enabled = NETWORK_LOG
+        # Until the log has produced anything we can't tell idle from "not logging"
+        self.seen_traffic = False
+
+    def poll(self, driver):
+        """Drain the performance log and update in-flight requests"""
+        # Without the log every get_log() raises, and PooledChrome counts
+        # each of those toward recycling an otherwise healthy driver
+        if not NETWORK_LOG or not self.enabled:
+            return
+        with self._lock:
+            try:
+                entries = driver.get_log('performance')
+            except Exception:
+                # Performance logging isn't enabled for this driver
+                self.enabled = False
+                return
+
+            now = time.monotonic()
+            if entries:
+                self.seen_traffic = True
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])
+                except (KeyError, ValueError):
+                    continue
+                webview = message.get('webview')
+                method = message['message'].get('method')
+                params = message['message'].get('params', {})
+                inflight = self._inflight.setdefault(webview, {})
+
+                if method == 'Network.requestWillBeSent' and params.get('type') in NETWORK_IDLE_TYPES:
+                    inflight[params['requestId']] = now
+                    self._last_activity[webview] = now
+                elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                    if inflight.pop(params.get('requestId'), None) is not None:
+                        self._last_activity[webview] = now
+
+                if method == 'Network.responseReceived':
+                    self._match_capture(webview, params)
+                elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                    for captured in self._captured.values():
+                        if params.get('requestId') in captured:
+                            captured[params['requestId']]['done'] = method == 'Network.loadingFinished'
+
+    def _match_capture(self, webview, params):
+        # Caller holds self._lock. A capture started for every window (None)
+        # matches responses of any webview.
+        key = webview if webview in self._capture_patterns else None
+        pattern = self._capture_patterns.get(key)
+        response = params.get('response', {})
+        if pattern is not None and pattern.search(response.get('url', '')) and 'json' in response.get('mimeType', ''):
+            self._captured.setdefault(key, {})[params['requestId']] = {'url': response['url'], 'done': None}
+
+    def capture(self, pattern, webview=None):
+        """
+        Start collecting responses in `webview` (every window if None) whose
+        URL matches the regex `pattern` and whose body is JSON; None stops.
+        """
+        with self._lock:
+            self._captured.pop(webview, None)
+            if pattern is None:
+                self._capture_patterns.pop(webview, None)
+            else:
+                self._capture_patterns[webview] = re.compile(pattern)
+
+    def take_captured(self, webview=None):
+        """(request id, url) of captured responses that finished loading, each returned once"""
+        with self._lock:
+            captured = self._captured.get(webview, {})
+            finished = [(request_id, entry['url']) for request_id, entry in captured.items() if entry['done']]
+            for request_id in [request_id for request_id, entry in captured.items() if entry['done'] is not None]:
+                del captured[request_id]
+            return finished
+
+    def in_flight(self, webview=None, stale_after=15):
+        """
+        XHR/fetch requests still open in `webview` (every window if None).
+        Requests open longer than `stale_after` seconds (long-polling, beacons
+        cut off by navigation) are ignored.
+        """
+        cutoff = time.monotonic() - stale_after
+        with self._lock:
+            windows = self._inflight.values() if webview is None else [self._inflight.get(webview, {})]
+            return sum(1 for inflight in windows for started in inflight.values() if started >= cutoff)
+
+    def idle_for_ms(self, webview=None):
+        """Milliseconds since an XHR/fetch last started or finished"""
+        with self._lock:
+            if webview is None:
+                last = max(self._last_activity.values(), default=None)
+            else:
+                last = self._last_activity.get(webview)
+        if last is None:
+            return float('inf')
+        return (time.monotonic() - last) * 1000
+
+    def reset(self, webview=None):
+        """Forget tracked requests, e.g. when a driver goes back to the pool"""
+        with self._lock:
+            if webview is None:
+                self._inflight.clear()
+                self._last_activity.clear()
+                self._capture_patterns.clear()
+                self._captured.clear()
+            else:
+                self._inflight.pop(webview, None)
+                self._last_activity.pop(webview, None)
+                self._capture_patterns.pop(webview, None)
+                self._captured.pop(webview, None)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_network_tracker(driver):
+    """The NetworkTracker for `driver`, created on first use"""
+    with _trackers_lock:
+        tracker = _trackers.get(id(driver))
+        if tracker is None:
+            tracker = _trackers[id(driver)] = NetworkTracker()
+        return tracker
+
+
+def forget_network_tracker(driver):
+    """Drop `driver`'s tracker once the driver is quit"""
+    with _trackers_lock:
+        _trackers.pop(id(driver), None)
+
+
+def _current_webview(driver):
+    # Windows of a shared TabPool browser are told apart by their handle
+    # (which is the webview id in the log); a pooled driver has only one window
+    bound_window = getattr(driver, 'bound_window', None)
+    return bound_window() if bound_window else None
+
+
+def is_network_idle(driver, idle_ms=NETWORK_IDLE_MS):
+    """
+    True if no XHR/fetch has been in flight for `idle_ms`. Non-blocking.
+    False when performance logging isn't available, so callers fall back to
+    their own stopping rule.
+    """
+    tracker = get_network_tracker(driver)
+    tracker.poll(driver)
+    if not tracker.enabled or not tracker.seen_traffic:
+        return False
+    webview = _current_webview(driver)
+    return tracker.in_flight(webview) == 0 and tracker.idle_for_ms(webview) >= idle_ms
+
+
+def start_response_capture(driver, pattern):
+    """
+    Collect the JSON responses whose URL matches `pattern` in the calling
+    thread's window from now on (None stops). False without performance logging.
+    """
+    tracker = get_network_tracker(driver)
+    tracker.poll(driver)
+    tracker.capture(pattern, _current_webview(driver))
+    return tracker.enabled
+
+
+def take_captured_responses(driver):
+    """(request id, url) of the captured responses that finished loading since the last call"""
+    tracker = get_network_tracker(driver)
+    tracker.poll(driver)
+    return tracker.take_captured(_current_webview(driver))